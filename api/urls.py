@@ -1,16 +1,27 @@
-from django.urls import include, path
+from django.urls import path, re_path
+from rest_framework_simplejwt import views as jwt_views
 
 from api.spectacular.urls import urlpatterns as doc_urls
+from api.views import metrics_view
+from users.api.views.users import TokenCreateAPIView
 from users.urls import drf_urlpatterns as user_urls
 from blog.urls import drf_urlpatterns as blog_urls
 from rating.urls import drf_urlpatterns as rating_urls
 from subscription.urls import drf_urlpatterns as subscriptions_urls
+from common.urls import drf_urlpatterns as common_urls
 
 app_name = 'api'
-urlpatterns = [path(r'auth/', include('djoser.urls.jwt')),]
+# The JWT routes of `djoser.urls.jwt`, with a rate limited token creation view
+urlpatterns = [
+    re_path(r'^auth/jwt/create/?', TokenCreateAPIView.as_view(), name='jwt-create'),
+    re_path(r'^auth/jwt/refresh/?', jwt_views.TokenRefreshView.as_view(), name='jwt-refresh'),
+    re_path(r'^auth/jwt/verify/?', jwt_views.TokenVerifyView.as_view(), name='jwt-verify'),
+]
 
+urlpatterns += [path('metrics/', metrics_view, name='metrics')]
 urlpatterns += doc_urls
 urlpatterns += user_urls
 urlpatterns += blog_urls
 urlpatterns += rating_urls
 urlpatterns += subscriptions_urls
+urlpatterns += common_urls
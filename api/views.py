@@ -0,0 +1,25 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from common import metrics
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Prometheus metrics of all the workers (see `common.metrics`).
+
+    With `settings.METRICS_TOKEN` set, the scraper has to send it as a bearer token.
+    Without a token the endpoint is only available in DEBUG mode.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            raise Http404
+    elif not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401, headers={'WWW-Authenticate': 'Bearer'})
+    return HttpResponse(generate_latest(metrics.get_registry()), content_type=CONTENT_TYPE_LATEST)
@@ -1,8 +1,12 @@
 from django.contrib import admin
+from django.db.models import OuterRef
 from django.urls import reverse
 from django.utils.html import format_html
 
+from common.db.querytags import query_origin
+from common.expressions import SubqueryCount
 from common.mixins.admin import ExtendedModelAdmin
+from subscription.models import Favorite
 from rating.models import CommentRating, PostRating
 from .models import Author, Post, Comment, Category
 
@@ -12,14 +16,20 @@ class AuthorAdmin(ExtendedModelAdmin):
     list_display = ['id', 'user', 'posts_total']
 
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user').prefetch_related('posts')
+        return super().get_queryset(request).select_related('user').annotate(
+            posts_count=SubqueryCount(Post.objects.filter(author=OuterRef('pk')))
+        )
 
     def get_object_queryset(self, request):
         return super().get_queryset(request).select_related('user')
 
     def posts_total(self, obj):
+        if hasattr(obj, 'posts_count'):
+            return obj.posts_count
         return obj.posts.count()
 
+    posts_total.admin_order_field = 'posts_count'
+
 
 @admin.register(Category)
 class CategoryAdmin(ExtendedModelAdmin):
@@ -27,14 +37,20 @@ class CategoryAdmin(ExtendedModelAdmin):
     search_fields = ['title', ]
 
     def get_queryset(self, request):
-        return super().get_queryset(request).prefetch_related('posts')
+        return super().get_queryset(request).annotate(
+            posts_count=SubqueryCount(Post.objects.filter(category=OuterRef('pk')))
+        )
 
     def get_object_queryset(self, request):
         return super().get_queryset(request)
 
     def posts_total(self, obj):
+        if hasattr(obj, 'posts_count'):
+            return obj.posts_count
         return obj.posts.count()
 
+    posts_total.admin_order_field = 'posts_count'
+
 
 class PostRatingInline(admin.TabularInline):
     readonly_fields = ['owner']
@@ -49,17 +65,19 @@ class PostAdmin(ExtendedModelAdmin):
     readonly_fields = ['author', 'created_at', 'updated_at', ]
     autocomplete_fields = ['category', ]
     search_fields = ['title', ]
+    keyset_pagination = True
 
+    @query_origin
     def get_queryset(self, request):
         rating_subq = Post.objects.get_rating_subquery()
         return super().get_queryset(request).select_related(
             'author__user',
             'category',
-        ).prefetch_related(
-            'favorites',
-            'comments'
         ).annotate(
-            rating=rating_subq)
+            rating=rating_subq,
+            favorites_total=SubqueryCount(Favorite.objects.filter(post=OuterRef('pk'))),
+            comments_total=SubqueryCount(Comment.objects.filter(post=OuterRef('pk'))),
+        )
 
     def get_object_queryset(self, request):
         return super().get_queryset(request).select_related(
@@ -71,10 +89,10 @@ class PostAdmin(ExtendedModelAdmin):
         return obj.rating
 
     def fav_count(self, obj):
-        return obj.fav_count
+        return obj.favorites_total
 
     def comments_count(self, obj):
-        return obj.comments_count
+        return obj.comments_total
 
 
 class CommentRatingInline(admin.TabularInline):
@@ -88,6 +106,9 @@ class CommentAdmin(ExtendedModelAdmin):
     list_display = ['id', 'short_text', 'author', 'post_link', 'rating', 'created_at']
     readonly_fields = ['author', 'post', 'reply_to', 'created_at', 'updated_at', ]
     inlines = [CommentRatingInline]
+    keyset_pagination = True
+    # `short_text` is built from Comment.__str__
+    list_only_extra = ('text',)
 
     def get_queryset(self, request):
         rating_subq = Comment.objects.get_rating_subquery()
@@ -1,4 +1,6 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+from blog import constants as const
 
 
 class PostPagination(PageNumberPagination):
@@ -13,3 +15,13 @@ class CommentPagination(PageNumberPagination):
     page_size = 5
     page_size_query_param = 'comments_page_size'
     max_page_size = 100
+
+
+class HotPostCursorPagination(CursorPagination):
+    """
+    Keyset pagination of posts in the `hot` ordering: the next page continues after the
+    hot score of the last post instead of skipping OFFSET rows (`blog_post_hot_score_idx`).
+    """
+    ordering = const.HOT_ORDER_BY
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,26 @@
+from rest_framework import serializers
+
+from blog import leaderboards
+
+
+class LeaderboardQuerySerializer(serializers.Serializer):
+    days = serializers.IntegerField(min_value=1, max_value=365, default=leaderboards.LEADERBOARD_DAYS)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=leaderboards.LEADERBOARD_LIMIT)
+
+
+class TopAuthorSerializer(serializers.Serializer):
+    author_id = serializers.IntegerField()
+    user_id = serializers.IntegerField()
+    username = serializers.CharField()
+    rating = serializers.IntegerField()
+    comments_count = serializers.IntegerField()
+    posts_count = serializers.IntegerField()
+
+
+class ActiveCategorySerializer(serializers.Serializer):
+    category_id = serializers.IntegerField()
+    title = serializers.CharField()
+    posts_count = serializers.IntegerField()
+    comments_count = serializers.IntegerField()
+    rating = serializers.IntegerField()
+    activity = serializers.IntegerField()
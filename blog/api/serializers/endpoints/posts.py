@@ -1,6 +1,8 @@
+from operator import attrgetter
 from typing import Optional, List
 
 from django.core.exceptions import ObjectDoesNotExist
+from django.utils.functional import cached_property
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
@@ -14,6 +16,51 @@ class PostSerializer(common_s.TruncateTextSerializer, mixins.PostSerializerExten
     ...
 
 
+class PostFastListSerializer(PostSerializer):
+    """
+    Read-only `PostSerializer` for lists of `Post.objects.get_posts_list()` (and the querysets built on it).
+
+    The output is the same, but it is read from the annotated and selected values directly,
+    and the URLs are formatted from templates reversed once per list.
+    """
+
+    @cached_property
+    def with_user_annotations(self):
+        request = self.context.get('request')
+        return bool(request and request.user.is_authenticated)
+
+    @cached_property
+    def row_getters(self):
+        """
+        (name, getter) of the readable fields, the ones left out of a sparse fieldset are not read.
+        """
+        request, format = self.context['request'], self.context.get('format')
+        post_url = common_s.URLTemplate('blog:post-detail', request, format)
+        profile_url = common_s.URLTemplate('users:profile', request, format)
+        to_datetime = serializers.DateTimeField().to_representation
+        user_annotations = self.with_user_annotations
+        getters = {
+            'id': attrgetter('pk'),
+            'created_at': lambda post: to_datetime(post.created_at),
+            'updated_at': lambda post: to_datetime(post.updated_at),
+            'title': attrgetter('title'),
+            'url': lambda post: post_url(post.pk),
+            'author': lambda post: str(post.author),
+            'author_profile': lambda post: profile_url(post.author.user_id),
+            'category': attrgetter('category.title'),
+            'text': lambda post: post.text[:100],
+            'rating': attrgetter('rating'),
+            'fav_count': attrgetter('fav_count'),
+            'comments_count': attrgetter('comments_count'),
+            'my_favorite': attrgetter('user_favorite') if user_annotations else lambda post: None,
+            'my_vote': attrgetter('user_vote') if user_annotations else lambda post: None,
+        }
+        return [(field.field_name, getters[field.field_name]) for field in self._readable_fields]
+
+    def to_representation(self, instance):
+        return {name: getter(instance) for name, getter in self.row_getters}
+
+
 class PostRetrieveWithCommentsSerializer(mixins.PostSerializerExtendedMixin):
     comments = serializers.SerializerMethodField()
 
@@ -3,11 +3,12 @@ from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from blog.models import Post, Category, Comment
+from common.mixins.serializers import SparseFieldsMixin
 
 User = get_user_model()
 
 
-class PostSerializerMixin(serializers.HyperlinkedModelSerializer):
+class PostSerializerMixin(SparseFieldsMixin, serializers.HyperlinkedModelSerializer):
     author = serializers.StringRelatedField()
     author_profile = serializers.HyperlinkedRelatedField(
         source='author.user',
@@ -68,7 +69,7 @@ class PostSerializerExtendedMixin(PostSerializerMixin):
         return None
 
 
-class CommentsSerializerMixin(serializers.ModelSerializer):
+class CommentsSerializerMixin(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.StringRelatedField()
     post_title = serializers.StringRelatedField(source='post')
     post_url = serializers.HyperlinkedRelatedField(
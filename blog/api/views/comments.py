@@ -7,22 +7,26 @@ from rest_framework.permissions import SAFE_METHODS, AllowAny
 
 from blog.api.serializers.endpoints import comments as comment_s
 from blog.filters import IsCommentsExist, CommentFilterSet
+from blog.mixins.views import PostConditionalGetMixin
 from blog.models import Comment
 from blog.pagination import CursorCreatedAtPagination
 from blog.permissions import IsCommentAuthorPermission
-from common.mixins.views import ExtendedView
+from common.mixins.views import ExtendedView, SparseFieldsViewMixin, sparse_fields_parameters
 
 
 @extend_schema_view(
     list=extend_schema(
         description="The list action returns all comments of a specific post.",
         summary='List of all comments for a specific post',
-        tags=['Comment']
+        tags=['Comment'],
+        responses=comment_s.CommentListSerializer,
+        parameters=sparse_fields_parameters,
     ),
     retrieve=extend_schema(
         description="The retrieve action returns a single comment identified by `comment_id`.",
         summary='Retrieve a comment from a post',
-        tags=['Comment']
+        tags=['Comment'],
+        parameters=sparse_fields_parameters,
     ),
     create=extend_schema(
         description="The create action expects the `name` field, creates a new comment in the post, and returns it.",
@@ -45,7 +49,7 @@ from common.mixins.views import ExtendedView
         tags=['Comment']
     ),
 )
-class CommentViewSet(ExtendedView, viewsets.ModelViewSet):
+class CommentViewSet(PostConditionalGetMixin, SparseFieldsViewMixin, ExtendedView, viewsets.ModelViewSet):
     # CursorPagination works well in combination with OrderingFilter
     # When trying to do sorting in CommentFilterSet (as it's done in PostFilterSet for PostViewSet) - it breaks
 
@@ -55,6 +59,7 @@ class CommentViewSet(ExtendedView, viewsets.ModelViewSet):
     permission_classes = (
         IsCommentAuthorPermission,
     )
+    throttle_scope = 'comments'
     filter_backends = (
         IsCommentsExist,
         OrderingFilter,
@@ -66,9 +71,10 @@ class CommentViewSet(ExtendedView, viewsets.ModelViewSet):
 
     pagination_class = CursorCreatedAtPagination
     lookup_url_kwarg = 'comment_id'
+    validators_url_kwarg = 'post_id'
 
     multi_serializer_class = {
-        'list': comment_s.CommentListSerializer,
+        'list': comment_s.CommentFastListSerializer,
         'retrieve': comment_s.CommentRetrieveSerializer,
         'create': comment_s.CommentCreateSerializer,
         'partial_update': comment_s.CommentUpdateSerializer,
@@ -83,7 +89,8 @@ class CommentViewSet(ExtendedView, viewsets.ModelViewSet):
     def get_queryset(self):
         queryset = Comment.objects.get_comments(
             related_args=('post', 'author',),
-            request_user=self.request.user
+            request_user=self.request.user,
+            fields=self.get_query_fields(),
         ).annotate(
             is_my_comment=Q(author=self.request.user)
         ).filter(
@@ -92,16 +99,24 @@ class CommentViewSet(ExtendedView, viewsets.ModelViewSet):
 
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        return self.conditional_get(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(super().retrieve, request, *args, **kwargs)
+
 
 @extend_schema_view(
     get=extend_schema(
         description="Returns all comments made by a specific user, identified by their `user_id`.",
         summary='All comments by a user',
-        tags=['Comment']
+        tags=['Comment'],
+        responses=comment_s.CommentListSerializer,
+        parameters=sparse_fields_parameters,
     ),
 )
-class CommentListByUserAPIView(generics.ListAPIView):
-    serializer_class = comment_s.CommentListSerializer
+class CommentListByUserAPIView(SparseFieldsViewMixin, generics.ListAPIView):
+    serializer_class = comment_s.CommentFastListSerializer
     queryset = Comment.objects.all()
     filter_backends = (
         IsCommentsExist,
@@ -116,7 +131,8 @@ class CommentListByUserAPIView(generics.ListAPIView):
         user_id = self.kwargs.get('user_id')
         queryset = Comment.objects.get_comments(
             related_args=('post', 'author',),
-            request_user=self.request.user
+            request_user=self.request.user,
+            fields=self.get_query_fields(),
         ).filter(
             author_id=user_id
         )
@@ -0,0 +1,55 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from blog import leaderboards
+from blog.api.serializers.endpoints import leaderboards as leaderboards_s
+
+
+class LeaderboardAPIView(APIView):
+    """
+    Base view of the leaderboards: sums the daily rollups over the last `days` days
+    with the `leaderboard(days, limit)` function of `blog.leaderboards`.
+    """
+    permission_classes = (AllowAny,)
+    serializer_class = None
+    leaderboard = None
+
+    def get(self, request, *args, **kwargs):
+        query = leaderboards_s.LeaderboardQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        rows = self.leaderboard(**query.validated_data)
+        return Response(self.serializer_class(rows, many=True).data)
+
+
+class TopAuthorsAPIView(LeaderboardAPIView):
+    serializer_class = leaderboards_s.TopAuthorSerializer
+    leaderboard = staticmethod(leaderboards.get_top_authors)
+
+    @extend_schema(
+        description="Returns the authors with the highest net rating received on their posts and comments "
+                    "over the last `days` days (today included).",
+        summary='Top authors',
+        tags=['Leaderboard'],
+        parameters=[leaderboards_s.LeaderboardQuerySerializer],
+        responses=leaderboards_s.TopAuthorSerializer(many=True),
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class ActiveCategoriesAPIView(LeaderboardAPIView):
+    serializer_class = leaderboards_s.ActiveCategorySerializer
+    leaderboard = staticmethod(leaderboards.get_active_categories)
+
+    @extend_schema(
+        description="Returns the categories with the most new posts and comments over the last `days` days "
+                    "(today included).",
+        summary='Most active categories',
+        tags=['Leaderboard'],
+        parameters=[leaderboards_s.LeaderboardQuerySerializer],
+        responses=leaderboards_s.ActiveCategorySerializer(many=True),
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
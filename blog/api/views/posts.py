@@ -4,15 +4,16 @@ from rest_framework import generics, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import SAFE_METHODS, AllowAny
 
-from blog.api.paginators import CommentPagination
+from blog import constants as const
+from blog.api.paginators import CommentPagination, HotPostCursorPagination
 from blog.api.serializers.endpoints import posts as posts_s
 from blog.api.serializers.endpoints.comments import CommentListSerializer
 from blog.filters import PostFilterSet
-from blog.mixins.views import PostDetailQuerySetMixin
+from blog.mixins.views import PostConditionalGetMixin, PostDetailQuerySetMixin
 from blog.models import Post
 from blog.pagination import paginate_and_serialize_objects
 from blog.permissions import IsPostAuthorPermission, IsBloggerPermission
-from common.mixins.views import ExtendedView
+from common.mixins.views import ExtendedView, SparseFieldsViewMixin, sparse_fields_parameters
 
 
 @extend_schema_view(
@@ -22,7 +23,7 @@ from common.mixins.views import ExtendedView
         tags=['Post']
     ),
 )
-class PostWCommentsRetrieveAPIView(PostDetailQuerySetMixin, generics.RetrieveAPIView):
+class PostWCommentsRetrieveAPIView(PostConditionalGetMixin, PostDetailQuerySetMixin, generics.RetrieveAPIView):
     queryset = Post.objects.all().select_related('author__user')
     serializer_class = posts_s.PostRetrieveWithCommentsSerializer
     filter_backends = (
@@ -57,7 +58,9 @@ class PostWCommentsRetrieveAPIView(PostDetailQuerySetMixin, generics.RetrieveAPI
     list=extend_schema(
         description="The list action returns all available posts.",
         summary='List of posts',
-        tags=['Post']
+        tags=['Post'],
+        responses=posts_s.PostSerializer,
+        parameters=sparse_fields_parameters,
     ),
     create=extend_schema(
         description="The create action expects the `name` field, creates a new post, and returns it.",
@@ -67,7 +70,8 @@ class PostWCommentsRetrieveAPIView(PostDetailQuerySetMixin, generics.RetrieveAPI
     retrieve=extend_schema(
         description="The retrieve action returns a single post identified by `id`.",
         summary='Post details',
-        tags=['Post']
+        tags=['Post'],
+        parameters=sparse_fields_parameters,
     ),
     partial_update=extend_schema(
         description="The partial update action modifies specific fields of a post identified by `id`.",
@@ -87,10 +91,12 @@ class PostWCommentsRetrieveAPIView(PostDetailQuerySetMixin, generics.RetrieveAPI
     posts_by_author=extend_schema(
         description="Returns all posts authored by a specific user, identified by their `author_id`.",
         summary='All posts by an author',
-        tags=['Post']
+        tags=['Post'],
+        responses=posts_s.PostSerializer,
+        parameters=sparse_fields_parameters,
     ),
 )
-class PostViewSet(ExtendedView, viewsets.ModelViewSet):
+class PostViewSet(PostConditionalGetMixin, SparseFieldsViewMixin, ExtendedView, viewsets.ModelViewSet):
     queryset = Post.objects.all()
     serializer_class = posts_s.PostSerializer
 
@@ -104,7 +110,8 @@ class PostViewSet(ExtendedView, viewsets.ModelViewSet):
     filterset_class = PostFilterSet
 
     multi_serializer_class = {
-        'list': posts_s.PostSerializer,
+        'list': posts_s.PostFastListSerializer,
+        'posts_by_author': posts_s.PostFastListSerializer,
         'create': posts_s.PostCreateSerializer,
     }
 
@@ -113,13 +120,25 @@ class PostViewSet(ExtendedView, viewsets.ModelViewSet):
             return (AllowAny(),)
         return super().get_permissions()
 
+    @property
+    def paginator(self):
+        """
+        The `hot` ordering is paged with a cursor, the other orderings with limit/offset.
+        """
+        if not hasattr(self, '_paginator') and self.request.query_params.get('ordering') == const.HOT_ORDERING:
+            self._paginator = HotPostCursorPagination()
+        return super().paginator
+
     def get_queryset(self):
-        queryset = Post.objects.get_posts_list(user=self.request.user)
+        queryset = Post.objects.get_posts_list(user=self.request.user, fields=self.get_query_fields())
         if self.action == 'posts_by_author':
             user_id = self.kwargs.get('user_id')
             queryset = queryset.filter(author__user_id=user_id)
         return queryset
 
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(super().retrieve, request, *args, **kwargs)
+
     @action(methods=['get'], detail=False, url_path=r'by_author/(?P<user_id>\d+)', url_name='author-posts')
     def posts_by_author(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
@@ -0,0 +1,165 @@
+"""
+Rendering of the comment tree of the post page.
+
+The tree is walked once, iteratively, as a flat sequence of comments and closing markup, instead of
+a recursive template include per comment. The part of a comment that is the same for every viewer
+(author, dates, sanitized text) is rendered from `comment_body.html` and cached per comment;
+the viewer-specific bits (edit and delete buttons, the vote of the viewer, the rating, the links back
+to the current page) are added around the cached fragment for each request.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template, render_to_string
+from django.utils import timezone, translation
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from blog import constants as const
+from common.mixins.serializers import URLTemplate
+
+BODY_TEMPLATE = 'blog/includes/comment_body.html'
+CONTROLS_MARKER = mark_safe('<!-- controls -->')
+# Replies shown before the "Expand entire thread" button, see `CommentTreeMixin.comment_replies_limit`
+REPLIES_SHOWN = 3
+SHOW_REPLIES_BUTTON = (
+    '<button class="show-replies btn btn-link" onclick="toggleComments(this)">Show replies</button>'
+)
+EXPAND_THREAD_BUTTON = (
+    '<button class="show-replies btn btn-link" onclick="showAllReplies(this)">Expand entire thread</button>'
+)
+
+
+def get_fragment_key(comment):
+    """
+    Cache key of the shared part of a comment. It changes with the comment (`updated_at`), with the name
+    and the photo of its author (and when the photo is processed) and with the language and the time zone
+    the dates are shown in.
+    """
+    profile = comment.author.profile
+    version = ':'.join((
+        comment.updated_at.isoformat(),
+        comment.author.username,
+        profile.photo.name,
+        str(bool(profile.photo_sizes)),
+        translation.get_language() or '',
+        timezone.get_current_timezone_name(),
+    ))
+    digest = hashlib.md5(version.encode(), usedforsecurity=False).hexdigest()
+    return f'{const.COMMENT_FRAGMENT_CACHE_PREFIX}{comment.pk}:{digest}'
+
+
+def iter_tree(root_comments):
+    """
+    The comment tree as a flat sequence of comments and the markup around their replies,
+    in document order.
+    """
+    stack = [item for comment in reversed(root_comments) for item in ('</ul>', comment, '<ul>')]
+    while stack:
+        item = stack.pop()
+        yield item
+        if isinstance(item, str):
+            continue
+
+        replies = getattr(item, 'replies_list', None)
+        closing = ['</div>']
+        if replies:
+            closing.append('</ul></div>')
+            more = getattr(item, 'replies_more', None) or ()
+            if item.replies_count > REPLIES_SHOWN:
+                closing.extend(('</div>', *reversed(more), '<div class="comment-thread">', EXPAND_THREAD_BUTTON))
+            closing.extend(reversed(replies))
+            closing.append(SHOW_REPLIES_BUTTON + '<div class="comment-replies"><ul>')
+        stack.extend(closing)
+
+
+class CommentTreeRenderer:
+    """
+    Renders root comments (with their `replies_list` / `replies_more` built by `CommentTreeMixin`)
+    for the viewer of `request`, `page_number` is the comment page the vote links return to.
+    """
+
+    def __init__(self, request, post_id, page_number=''):
+        self.request = request
+        self.user = request.user
+        self.page_number = page_number
+        self.edit_url = URLTemplate('blog:edit-comment', None, pk_kwarg='comment_pk', post_pk=post_id)
+        self.delete_url = URLTemplate('blog:delete-comment', None, pk_kwarg='comment_pk', post_pk=post_id)
+        self.reply_url = URLTemplate('blog:reply-comment', None, pk_kwarg='comment_pk', post_pk=post_id)
+        self.like_url = URLTemplate(
+            'rating:comment-rating', None, pk_kwarg='comm_pk', post_pk=post_id, vote_type='LIKE',
+        )
+        self.dislike_url = URLTemplate(
+            'rating:comment-rating', None, pk_kwarg='comm_pk', post_pk=post_id, vote_type='DISLIKE',
+        )
+        self.ratings = {}
+
+    def get_bodies(self, comments):
+        """
+        The shared fragments of `comments` ({pk: (before the controls, after the controls)}),
+        from the cache or rendered and cached with a single `set_many`.
+        """
+        keys = {comment.pk: get_fragment_key(comment) for comment in comments}
+        cached = cache.get_many(keys.values())
+        bodies, missing = {}, {}
+        template = None
+        for comment in comments:
+            key = keys[comment.pk]
+            if key in cached:
+                bodies[comment.pk] = cached[key]
+                continue
+            template = template or get_template(BODY_TEMPLATE)
+            html = template.render({'comment': comment, 'controls_marker': CONTROLS_MARKER})
+            before, _, after = html.partition(CONTROLS_MARKER)
+            bodies[comment.pk] = missing[key] = (before, after)
+        if missing:
+            cache.set_many(missing, settings.COMMENT_FRAGMENT_CACHE_TIMEOUT)
+        return bodies
+
+    def render_rating(self, rating):
+        if rating not in self.ratings:
+            self.ratings[rating] = render_to_string('includes/rating_color.html', {'rating': rating})
+        return self.ratings[rating]
+
+    def render_controls(self, comment):
+        if not (self.user.is_staff or comment.author_id == self.user.pk):
+            return ''
+        return format_html(
+            '<a class="btn btn-xs btn-warning text-white" href="{}">Edit</a>\n'
+            '<a class="btn btn-xs btn-danger text-white" href="{}">Delete</a>',
+            self.edit_url(comment.pk), self.delete_url(comment.pk),
+        )
+
+    def render_actions(self, comment):
+        user_vote = getattr(comment, 'user_vote', None)
+        back = f'?next={self.request.path}?page={self.page_number}#comment_{comment.pk}'
+        return format_html(
+            '<div class="container-center"><div class="comment-actions">'
+            '<a data-vote="1" href="{}{}"><svg class="bi pe-none" width="14" height="14" style="color:{}">'
+            '<use href="#upvote"></use></svg></a>'
+            '<span data-rating="comment-{}">{}</span>'
+            '<a data-vote="-1" href="{}{}"><svg class="bi pe-none me-2" width="14" height="14" style="color:{}">'
+            '<use href="#downvote"></use></svg></a>'
+            '<a href="{}">Reply</a>'
+            '</div></div>',
+            self.like_url(comment.pk), back, 'lightgreen' if user_vote == 1 else 'gray',
+            comment.pk, mark_safe(self.render_rating(comment.rating)),
+            self.dislike_url(comment.pk), back, 'lightcoral' if user_vote == -1 else 'gray',
+            self.reply_url(comment.pk),
+        )
+
+    def render(self, root_comments):
+        items = list(iter_tree(root_comments))
+        bodies = self.get_bodies([item for item in items if not isinstance(item, str)])
+        parts = []
+        for item in items:
+            if isinstance(item, str):
+                parts.append(item)
+                continue
+            before, after = bodies[item.pk]
+            parts.extend((
+                format_html('<div class="comment-block" data-comment-id="{}"><div class="comment-body"><br>', item.pk),
+                before, self.render_controls(item), after, self.render_actions(item), '</div>',
+            ))
+        return mark_safe(''.join(parts))
@@ -1 +1,12 @@
 CATEGORY_CACHE_KEY = 'categories_choices'
+# Shared HTML of a comment, see blog.comment_tree
+COMMENT_FRAGMENT_CACHE_PREFIX = 'comment_fragment:'
+
+# "Hot" ranking (see blog.ranking)
+HOT_ORDERING = 'hot'
+HOT_ORDER_BY = ('-hot_score', '-id')
+HOT_COMMENT_WEIGHT = 2
+HOT_FAVORITE_WEIGHT = 3
+# A post needs 10x the points of a post published HOT_DECAY_SECONDS earlier to rank the same
+HOT_DECAY_SECONDS = 45000
+HOT_REFRESH_BATCH_SIZE = 1000
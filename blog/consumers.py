@@ -0,0 +1,26 @@
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from blog.events import post_group_name
+
+
+class PostEventsConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Pushes comment and rating events of a post to the browsers that have the post open.
+
+    The channel is read-only: events are produced by the model signals (`blog.events`),
+    anything sent by the client is ignored.
+    """
+
+    async def connect(self):
+        self.group_name = post_group_name(self.scope['url_route']['kwargs']['post_pk'])
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        pass
+
+    async def post_event(self, message):
+        await self.send_json(message['event'])
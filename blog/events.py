@@ -0,0 +1,30 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+COMMENT_CREATED = 'comment.created'
+COMMENT_EDITED = 'comment.edited'
+COMMENT_DELETED = 'comment.deleted'
+POST_RATING = 'post.rating'
+COMMENT_RATING = 'comment.rating'
+
+
+def post_group_name(post_id):
+    return f'post_{post_id}'
+
+
+def broadcast_post_event(post_id, event_type, **data):
+    """
+    Send an event to the clients watching a post (see `blog.consumers.PostEventsConsumer`).
+
+    The event is sent after the current transaction commits, so clients never hear about
+    rows they cannot read yet, and rolled back changes are not broadcast at all.
+    """
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+
+    message = {'type': 'post.event', 'event': {'type': event_type, 'post': post_id, **data}}
+    transaction.on_commit(
+        lambda: async_to_sync(channel_layer.group_send)(post_group_name(post_id), message)
+    )
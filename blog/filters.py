@@ -8,19 +8,32 @@ from blog.models import Comment
 from blog.models import Post, Category
 
 
+class PostOrderingFilter(django_filters.OrderingFilter):
+    """
+    OrderingFilter with the `hot` ordering: by the stored hot score, highest first,
+    with the primary key as a tie-breaker so the results can be paged with a keyset.
+    """
+
+    def filter(self, qs, value):
+        if value and const.HOT_ORDERING in value:
+            return qs.order_by(*const.HOT_ORDER_BY)
+        return super().filter(qs, value)
+
+
 class PostFilterSet(django_filters.FilterSet):
     class Meta:
         model = Post
         fields = ('category', 'ordering')
 
     ordering_choices = (
+        (const.HOT_ORDERING, 'Hot'),
         ('rating', 'Low rated'),
         ('-rating', 'Top rated'),
         ('created_at', 'Older'),
         ('-created_at', 'Newer'),
     )
 
-    ordering = django_filters.OrderingFilter(
+    ordering = PostOrderingFilter(
         fields=('rating', 'created_at'),
         choices=ordering_choices,
         field_labels={'rating': 'Rating', 'created_at': 'Created'},
@@ -32,20 +45,39 @@ class PostFilterSet(django_filters.FilterSet):
         choices=[]
     )
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, category_choices=None, **kwargs):
         """
         Initializes the PostFilterSet instance and dynamically sets the category choices.
+
+        Async views pass `category_choices` obtained with `aget_category_choices`,
+        so the filterset itself does not touch the cache or the database.
         """
         super().__init__(*args, **kwargs)
 
+        if category_choices is None:
+            category_choices = self.get_category_choices()
+
+        self.filters['category'].extra['choices'] = category_choices
+
+    @staticmethod
+    def get_category_choices():
         cached_choices = cache.get(const.CATEGORY_CACHE_KEY)
         if cached_choices is None:
             cached_choices = [
                 (category.title, category.title) for category in Category.objects.all()
             ]
             cache.set(const.CATEGORY_CACHE_KEY, cached_choices)
+        return cached_choices
 
-        self.filters['category'].extra['choices'] = cached_choices
+    @staticmethod
+    async def aget_category_choices():
+        cached_choices = await cache.aget(const.CATEGORY_CACHE_KEY)
+        if cached_choices is None:
+            cached_choices = [
+                (category.title, category.title) async for category in Category.objects.all()
+            ]
+            await cache.aset(const.CATEGORY_CACHE_KEY, cached_choices)
+        return cached_choices
 
 
 class IsCommentsExist(BaseFilterBackend):
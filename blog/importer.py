@@ -0,0 +1,319 @@
+import gzip
+import json
+import re
+import time
+from collections import Counter
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from blog import leaderboards
+from blog.models import Author, Category, Comment, Post
+from blog.signals import update_category_cache
+from common.models.ckeditor import CKEditorPostImages
+from rating.models import CommentRating, PostRating, Vote
+from users.models import Profile
+
+User = get_user_model()
+
+# Same pattern as the CKEditor image signals (common.signals.ckeditor)
+IMAGE_SRC_RE = re.compile('<img.*src=\"([^\"]+)')
+
+
+def read_records(path):
+    """
+    Yield import records from a file.
+
+    NDJSON files (`.ndjson`, optionally `.gz`) are read line by line; JSON files hold an array
+    of records and are loaded at once.
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as file:
+        if path.removesuffix('.gz').endswith('.json'):
+            yield from json.load(file)
+            return
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class BlogImporter:
+    """
+    Import users, posts, comments and votes of a legacy blog with `bulk_create`.
+
+    Records are dicts with a `type` key and the ids of the legacy blog, which are mapped to the
+    new primary keys as the rows are created:
+
+        {"type": "user", "id": 1, "username": "...", "email": "...", "author": true, "bio": "..."}
+        {"type": "post", "id": 1, "author": <user id>, "category": "<title>", "title": "...", "text": "...",
+         "created_at": "...", "updated_at": "..."}
+        {"type": "comment", "id": 1, "post": <post id>, "user": <user id>, "reply_to": <comment id or null>,
+         "text": "...", "created_at": "...", "updated_at": "..."}
+        {"type": "post_vote", "post": <post id>, "user": <user id>, "vote": 1}
+        {"type": "comment_vote", "comment": <comment id>, "user": <user id>, "vote": -1}
+
+    Records are consumed in chunks of consecutive records of the same type, so referenced rows must
+    come earlier in the stream, except for `reply_to`, which may point to a later comment.
+
+    `Model.save()` hooks and signals are bypassed. What they maintain is restored with set-based
+    post-steps: users' profiles and Bloggers membership, the leaderboard rollups, CKEditor image
+    associations and the category cache. The rollups count an imported vote on the day its post
+    or comment was created, since votes have no timestamps. Imported posts are created with
+    a stale hot score, which the periodic refresh computes.
+    """
+
+    def __init__(self, chunk_size=1000):
+        self.chunk_size = chunk_size
+        self.handlers = {
+            'user': self.import_users,
+            'post': self.import_posts,
+            'comment': self.import_comments,
+            'post_vote': self.import_post_votes,
+            'comment_vote': self.import_comment_votes,
+        }
+        # Legacy id -> new primary key
+        self.users = {}
+        self.authors = {}
+        self.posts = {}
+        self.comments = {}
+        self.categories = {}
+        # New comment pk -> legacy id of a parent that has not been imported yet
+        self.pending_replies = {}
+        self.new_categories = False
+        self.counts = Counter()
+        self.elapsed = 0
+
+    def run(self, records):
+        started = time.monotonic()
+
+        for record_type, chunk in self.group_records(records):
+            handler = self.handlers.get(record_type)
+            if handler is None:
+                self.counts['skipped'] += len(chunk)
+                continue
+            with transaction.atomic():
+                handler(chunk)
+
+        self.counts['skipped'] += len(self.pending_replies)
+        with transaction.atomic():
+            self.link_images()
+        if self.new_categories:
+            update_category_cache(sender=Category)
+
+        self.elapsed = time.monotonic() - started
+        return self.counts
+
+    @property
+    def rows(self):
+        return sum(count for name, count in self.counts.items() if name != 'skipped')
+
+    def group_records(self, records):
+        """
+        Split the stream into chunks of consecutive records of the same type.
+        """
+        record_type, chunk = None, []
+        for record in records:
+            if chunk and (record.get('type') != record_type or len(chunk) >= self.chunk_size):
+                yield record_type, chunk
+                chunk = []
+            record_type = record.get('type')
+            chunk.append(record)
+        if chunk:
+            yield record_type, chunk
+
+    @staticmethod
+    def restore_dates(objects, records):
+        """
+        Put back the legacy timestamps, `bulk_create` overwrites them with `auto_now(_add)`.
+        """
+        to_update = []
+        for obj, record in zip(objects, records):
+            if record.get('created_at'):
+                obj.created_at = parse_datetime(record['created_at'])
+                obj.updated_at = parse_datetime(record.get('updated_at') or record['created_at'])
+                to_update.append(obj)
+        if to_update:
+            type(to_update[0]).objects.bulk_update(to_update, ['created_at', 'updated_at'])
+
+    def import_users(self, records):
+        existing = dict(
+            User.objects.filter(username__in=[record['username'] for record in records]).values_list('username', 'pk')
+        )
+        new_records = [record for record in records if record['username'] not in existing]
+        created = User.objects.bulk_create([
+            User(
+                username=record['username'],
+                email=record['email'],
+                first_name=record.get('first_name', ''),
+                last_name=record.get('last_name', ''),
+                password=make_password(None),
+            ) for record in new_records
+        ])
+        Profile.objects.bulk_create([Profile(user=user) for user in created])
+        existing.update((user.username, user.pk) for user in created)
+        self.users.update((record['id'], existing[record['username']]) for record in records)
+        self.counts['user'] += len(created)
+
+        author_records = {self.users[record['id']]: record for record in records if record.get('author')}
+        if not author_records:
+            return
+        authors = dict(Author.objects.filter(user_id__in=author_records).values_list('user_id', 'pk'))
+        created_authors = Author.objects.bulk_create([
+            Author(user_id=user_id, bio=record.get('bio') or 'Empty')
+            for user_id, record in author_records.items() if user_id not in authors
+        ])
+        authors.update((author.user_id, author.pk) for author in created_authors)
+        self.authors.update((record['id'], authors[user_id]) for user_id, record in author_records.items())
+        self.counts['author'] += len(created_authors)
+
+        bloggers, _ = Group.objects.get_or_create(name='Bloggers')
+        User.groups.through.objects.bulk_create(
+            [User.groups.through(user_id=user_id, group_id=bloggers.pk) for user_id in author_records],
+            ignore_conflicts=True,
+        )
+
+    def get_category_ids(self, titles):
+        missing = set(titles) - self.categories.keys()
+        if missing:
+            self.categories.update(Category.objects.filter(title__in=missing).values_list('title', 'pk'))
+            to_create = missing - self.categories.keys()
+            if to_create:
+                Category.objects.bulk_create([Category(title=title) for title in to_create], ignore_conflicts=True)
+                self.categories.update(Category.objects.filter(title__in=to_create).values_list('title', 'pk'))
+                self.new_categories = True
+        return self.categories
+
+    def import_posts(self, records):
+        valid = [record for record in records if record['author'] in self.authors]
+        self.counts['skipped'] += len(records) - len(valid)
+        categories = self.get_category_ids(record['category'] for record in valid)
+        created = Post.objects.bulk_create([
+            Post(
+                author_id=self.authors[record['author']],
+                category_id=categories[record['category']],
+                title=record['title'],
+                text=record['text'],
+            ) for record in valid
+        ])
+        self.restore_dates(created, valid)
+        leaderboards.record_imported(
+            Post.objects, 'author_id', 'category_id', 'posts', dict.fromkeys((post.pk for post in created), 1),
+        )
+        self.posts.update((record['id'], post.pk) for record, post in zip(valid, created))
+        self.counts['post'] += len(created)
+
+    def import_comments(self, records):
+        valid = [record for record in records if record['post'] in self.posts and record['user'] in self.users]
+        self.counts['skipped'] += len(records) - len(valid)
+        created = Comment.objects.bulk_create([
+            Comment(
+                post_id=self.posts[record['post']],
+                author_id=self.users[record['user']],
+                reply_to_id=self.comments.get(record.get('reply_to')),
+                text=record['text'],
+            ) for record in valid
+        ])
+        self.restore_dates(created, valid)
+        leaderboards.record_imported(
+            Comment.objects, 'post__author_id', 'post__category_id', 'comments',
+            dict.fromkeys((comment.pk for comment in created), 1),
+        )
+        self.comments.update((record['id'], comment.pk) for record, comment in zip(valid, created))
+        self.counts['comment'] += len(created)
+
+        for record, comment in zip(valid, created):
+            if record.get('reply_to') and comment.reply_to_id is None:
+                self.pending_replies[comment.pk] = record['reply_to']
+        self.link_pending_replies()
+
+    def link_pending_replies(self):
+        resolved = [
+            Comment(pk=pk, reply_to_id=self.comments[parent])
+            for pk, parent in self.pending_replies.items() if parent in self.comments
+        ]
+        if resolved:
+            Comment.objects.bulk_update(resolved, ['reply_to'])
+            for comment in resolved:
+                del self.pending_replies[comment.pk]
+
+    def import_votes(self, rating_model, objects, object_key, records):
+        """
+        Insert the valid votes that are not stored yet and return them. Of several votes
+        of a user for the same object the first one is kept, as the unique constraint would.
+        """
+        votes = {}
+        for record in records:
+            valid = (
+                record[object_key] in objects and record['user'] in self.users
+                and record['vote'] in Vote.VoteType.values
+            )
+            if valid:
+                votes.setdefault((objects[record[object_key]], self.users[record['user']]), record['vote'])
+        self.counts['skipped'] += len(records) - len(votes)
+        stored = set(rating_model.objects.filter(
+            obj__in={obj_id for obj_id, _ in votes}, owner__in={owner_id for _, owner_id in votes},
+        ).values_list('obj_id', 'owner_id'))
+        self.counts['skipped'] += len(stored & votes.keys())
+        created = rating_model.objects.bulk_create([
+            rating_model(obj_id=obj_id, owner_id=owner_id, vote=vote)
+            for (obj_id, owner_id), vote in votes.items() if (obj_id, owner_id) not in stored
+        ], ignore_conflicts=True)
+        return created
+
+    @staticmethod
+    def sum_votes(votes):
+        """
+        Net vote by voted object of `votes`.
+        """
+        amounts = Counter()
+        for vote in votes:
+            amounts[vote.obj_id] += vote.vote
+        return amounts
+
+    def import_post_votes(self, records):
+        votes = self.import_votes(PostRating, self.posts, 'post', records)
+        leaderboards.record_imported(Post.objects, 'author_id', 'category_id', 'votes', self.sum_votes(votes))
+        self.counts['post_vote'] += len(votes)
+
+    def import_comment_votes(self, records):
+        votes = self.import_votes(CommentRating, self.comments, 'comment', records)
+        # A comment vote counts for the comment author, if they are a blogger
+        leaderboards.record_imported(
+            Comment.objects, 'author__author', 'post__category_id', 'votes', self.sum_votes(votes),
+        )
+        self.counts['comment_vote'] += len(votes)
+
+    def link_images(self):
+        """
+        Associate the imported posts with the CKEditor images they show, like the post_save image signal does.
+        Images uploaded to MEDIA_ROOT that are not tracked yet are registered, so they are cleaned up
+        together with their posts.
+        """
+        through = CKEditorPostImages.posts.through
+        for pks in chunked(self.posts.values(), self.chunk_size):
+            post_images = [
+                (pk, uri) for pk, text in Post.objects.filter(pk__in=pks).values_list('pk', 'text')
+                for uri in set(IMAGE_SRC_RE.findall(text))
+            ]
+            uris = {uri for _, uri in post_images}
+            images = dict(CKEditorPostImages.objects.filter(uri__in=uris).values_list('uri', 'pk'))
+            untracked = [uri for uri in uris - images.keys() if uri.startswith(settings.MEDIA_URL)]
+            created = CKEditorPostImages.objects.bulk_create([CKEditorPostImages(uri=uri) for uri in untracked])
+            images.update((image.uri, image.pk) for image in created)
+
+            through.objects.bulk_create([
+                through(post_id=pk, ckeditorpostimages_id=images[uri])
+                for pk, uri in post_images if uri in images
+            ], ignore_conflicts=True)
+            CKEditorPostImages.objects.filter(pk__in=images.values()).recount_references()
@@ -0,0 +1,222 @@
+import operator
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta
+from functools import reduce
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from blog.models import AuthorDailyStats, CategoryDailyStats, Comment, Post
+from rating.models import CommentRating, PostRating
+
+LEADERBOARD_DAYS = 7
+LEADERBOARD_LIMIT = 10
+# Days recounted by the scheduled refresh, see `rebuild_daily_stats`
+REFRESH_DAYS = 2
+
+
+def add_daily_stats(model, day, deltas, **key):
+    """
+    Add `deltas` ({column: change}) to the rollup row of `key` for `day`, creating the row if needed.
+
+    The update is a single `UPDATE ... SET col = col + delta`, so concurrent changes are not lost.
+    """
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    changes = {column: F(column) + delta for column, delta in deltas.items()}
+    rows = model.objects.filter(day=day, **key)
+    if rows.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(day=day, **key, **deltas)
+    except IntegrityError:
+        # Created by a concurrent request in the meantime
+        rows.update(**changes)
+
+
+def bulk_add_daily_stats(model, key, deltas):
+    """
+    Add `deltas` ({(pk, day): {column: change}}) to the rollup rows of `key` ('author_id' or 'category_id').
+
+    The missing rows are inserted empty first, then all the rows get their changes in a single
+    `UPDATE ... SET col = col + CASE ... END`, so concurrent changes are not lost either.
+    """
+    deltas = {row: changes for row, changes in deltas.items() if any(changes.values())}
+    if not deltas:
+        return
+    model.objects.bulk_create([model(**{key: pk}, day=day) for pk, day in deltas], ignore_conflicts=True)
+    rows = {(pk, day): Q(**{key: pk}, day=day) for pk, day in deltas}
+    columns = {column for changes in deltas.values() for column, delta in changes.items() if delta}
+    model.objects.filter(reduce(operator.or_, rows.values())).update(**{
+        column: F(column) + Case(
+            *[When(rows[row], then=changes[column]) for row, changes in deltas.items() if changes[column]],
+            default=0,
+            output_field=IntegerField(),
+        )
+        for column in columns
+    })
+
+
+def record_activity(day, author_id=None, category_id=None, **deltas):
+    if author_id is not None:
+        add_daily_stats(AuthorDailyStats, day, deltas, author_id=author_id)
+    if category_id is not None:
+        add_daily_stats(CategoryDailyStats, day, deltas, category_id=category_id)
+
+
+def record_post(post, sign=1):
+    record_activity(timezone.localdate(post.created_at), post.author_id, post.category_id, posts=sign)
+
+
+def record_comment(comment, sign=1):
+    """
+    A comment counts for the author and the category of the commented post.
+    """
+    post = Post.objects.filter(pk=comment.post_id).values('author_id', 'category_id').first()
+    if post is not None:
+        record_activity(timezone.localdate(comment.created_at), **post, comments=sign)
+
+
+def record_post_vote(post_id, delta):
+    post = Post.objects.filter(pk=post_id).values('author_id', 'category_id').first()
+    if post is not None:
+        record_activity(timezone.localdate(), **post, votes=delta)
+
+
+def bulk_record_activity(changes):
+    """
+    Apply many `record_activity` changes, (day, author_id, category_id, column, delta) tuples,
+    with one `bulk_add_daily_stats` per rollup table.
+    """
+    author_stats, category_stats = defaultdict(Counter), defaultdict(Counter)
+    for day, author_id, category_id, column, delta in changes:
+        if author_id is not None:
+            author_stats[author_id, day][column] += delta
+        if category_id is not None:
+            category_stats[category_id, day][column] += delta
+    bulk_add_daily_stats(AuthorDailyStats, 'author_id', author_stats)
+    bulk_add_daily_stats(CategoryDailyStats, 'category_id', category_stats)
+
+
+def record_post_deletion(post):
+    """
+    Take a post that is about to be deleted out of the rollups together with its comments, its votes
+    and the votes of its comments, with a few aggregate queries instead of one update per deleted row.
+    The votes are taken back today, as they are when removed one by one.
+
+    Returns the primary keys of the comments of the post.
+    """
+    today = timezone.localdate()
+    changes = [(timezone.localdate(post.created_at), post.author_id, post.category_id, 'posts', -1)]
+    comment_ids = []
+    for pk, created_at in Comment.objects.filter(post=post).values_list('pk', 'created_at').order_by():
+        comment_ids.append(pk)
+        changes.append((timezone.localdate(created_at), post.author_id, post.category_id, 'comments', -1))
+    post_votes = PostRating.objects.filter(obj=post).aggregate(votes=Sum('vote'))['votes']
+    changes.append((today, post.author_id, post.category_id, 'votes', -(post_votes or 0)))
+    # A comment vote counted for the comment author, if they are a blogger
+    comment_votes = CommentRating.objects.filter(obj__post=post).values_list('obj__author__author').annotate(
+        votes=Sum('vote'),
+    ).order_by()
+    changes.extend((today, blogger_id, post.category_id, 'votes', -votes) for blogger_id, votes in comment_votes)
+    bulk_record_activity(changes)
+    return comment_ids
+
+
+def record_imported(objects, author, category, column, amounts):
+    """
+    Count rows created with `bulk_create`, which skips the signals: `amounts` ({pk: amount}) of the rows
+    of `objects` are added to `column` for the `author` and `category` lookups of the rows, on the day
+    the rows were created. Imported votes have no timestamps either, so they count on the day
+    their post or comment was created.
+    """
+    rows = objects.filter(pk__in=amounts).annotate(day=TruncDate('created_at')).values_list(
+        'pk', 'day', author, category,
+    ).order_by()
+    bulk_record_activity(
+        (day, author_id, category_id, column, amounts[pk]) for pk, day, author_id, category_id in rows
+    )
+
+
+def rebuild_daily_stats(days=REFRESH_DAYS):
+    """
+    Recount the posts and comments of the last `days` days from the source tables.
+
+    Fixes the rollups after changes that bypass the signals, such as `bulk_create` or raw SQL.
+    Votes have no timestamps, so they are kept as they are: the signals and `record_imported`
+    maintain them.
+    Returns the number of rollup rows written.
+    """
+    since = get_window_start(days)
+    # A range on created_at instead of `created_at__date`, so the column index can be used
+    start = timezone.make_aware(datetime.combine(since, time.min))
+    posts = Post.objects.filter(created_at__gte=start).annotate(day=TruncDate('created_at'))
+    comments = Comment.objects.filter(created_at__gte=start).annotate(day=TruncDate('created_at'))
+
+    written = 0
+    for model, key, post_key, comment_key in (
+        (AuthorDailyStats, 'author_id', 'author_id', 'post__author_id'),
+        (CategoryDailyStats, 'category_id', 'category_id', 'post__category_id'),
+    ):
+        counts = {}
+        for row in posts.values(post_key, 'day').annotate(count=Count('pk')).order_by():
+            counts.setdefault((row[post_key], row['day']), {})['posts'] = row['count']
+        for row in comments.values(comment_key, 'day').annotate(count=Count('pk')).order_by():
+            counts.setdefault((row[comment_key], row['day']), {})['comments'] = row['count']
+
+        with transaction.atomic():
+            model.objects.filter(day__gte=since).update(posts=0, comments=0)
+            model.objects.bulk_create(
+                [model(**{key: pk}, day=day, **values) for (pk, day), values in counts.items()],
+                update_conflicts=True,
+                unique_fields=[key.removesuffix('_id'), 'day'],
+                update_fields=['posts', 'comments'],
+            )
+        written += len(counts)
+    return written
+
+
+def get_window_start(days):
+    return timezone.localdate() - timedelta(days=days - 1)
+
+
+def get_top_authors(days=LEADERBOARD_DAYS, limit=LEADERBOARD_LIMIT):
+    """
+    Authors with the highest net rating received over the last `days` days (today included).
+    """
+    return list(
+        AuthorDailyStats.objects.filter(
+            day__gte=get_window_start(days),
+        ).values(
+            'author_id',
+            user_id=F('author__user_id'),
+            username=F('author__user__username'),
+        ).annotate(
+            rating=Sum('votes'),
+            comments_count=Sum('comments'),
+            posts_count=Sum('posts'),
+        ).order_by('-rating', '-comments_count', 'author_id')[:limit]
+    )
+
+
+def get_active_categories(days=LEADERBOARD_DAYS, limit=LEADERBOARD_LIMIT):
+    """
+    Categories with the most new posts and comments over the last `days` days (today included).
+    """
+    return list(
+        CategoryDailyStats.objects.filter(
+            day__gte=get_window_start(days),
+        ).values(
+            'category_id',
+            title=F('category__title'),
+        ).annotate(
+            posts_count=Sum('posts'),
+            comments_count=Sum('comments'),
+            rating=Sum('votes'),
+            activity=Sum(F('posts') + F('comments')),
+        ).order_by('-activity', '-rating', 'category_id')[:limit]
+    )
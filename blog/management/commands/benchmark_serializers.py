@@ -0,0 +1,84 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from blog.api.serializers.endpoints import comments as comment_s
+from blog.api.serializers.endpoints import posts as posts_s
+from blog.models import Comment, Post
+
+User = get_user_model()
+
+
+def get_benchmarks(user):
+    """
+    (regular serializer, fast list serializer, queryset of the list endpoint) pairs.
+    """
+    return (
+        (posts_s.PostSerializer, posts_s.PostFastListSerializer, Post.objects.get_posts_list(user=user)),
+        (
+            comment_s.CommentListSerializer,
+            comment_s.CommentFastListSerializer,
+            Comment.objects.get_comments(related_args=('post', 'author'), request_user=user),
+        ),
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Serializes the same rows with the regular and the fast list serializers of posts and comments, "
+        "checks that the rendered JSON is identical and reports the serialization time of both. "
+        "Rows are loaded once, so the database is not part of the timings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help='Number of rows to serialize.')
+        parser.add_argument('--repeat', type=int, default=20, help='Number of timed runs per serializer.')
+        parser.add_argument('--user', help='Username of the request user, anonymous by default.')
+
+    def get_request(self, username):
+        user = AnonymousUser()
+        if username:
+            try:
+                user = User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f'User {username!r} does not exist.')
+        request = Request(APIRequestFactory().get('/api/post/'))
+        request.user = user
+        return request
+
+    @staticmethod
+    def measure(serializer_class, rows, context, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            serializer_class(rows, many=True, context=context).data
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):
+        request = self.get_request(options['user'])
+        context = {'request': request, 'format': None}
+        renderer = JSONRenderer()
+
+        for serializer_class, fast_serializer_class, queryset in get_benchmarks(request.user):
+            rows = list(queryset[:options['rows']])
+            if not rows:
+                self.stdout.write(f'{serializer_class.__name__}: no rows, skipped')
+                continue
+
+            expected = renderer.render(serializer_class(rows, many=True, context=context).data)
+            if renderer.render(fast_serializer_class(rows, many=True, context=context).data) != expected:
+                raise CommandError(f'{fast_serializer_class.__name__} output differs from {serializer_class.__name__}.')
+
+            regular = self.measure(serializer_class, rows, context, options['repeat'])
+            fast = self.measure(fast_serializer_class, rows, context, options['repeat'])
+            self.stdout.write(
+                f'{serializer_class.__name__} -> {fast_serializer_class.__name__} ({len(rows)} rows, same output): '
+                f'{regular * 1000:.2f} ms -> {fast * 1000:.2f} ms ({regular / fast:.1f}x)'
+            )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.importer import BlogImporter, read_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports users, posts, comments (with reply trees) and votes from an NDJSON or JSON file "
+        "with bulk inserts, bypassing the per-row save hooks. See blog.importer.BlogImporter for the format."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='.ndjson, .json or their .gz variants.')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows inserted per query.')
+
+    def handle(self, *args, **options):
+        importer = BlogImporter(chunk_size=options['chunk_size'])
+        try:
+            counts = importer.run(read_records(options['path']))
+        except FileNotFoundError:
+            raise CommandError(f'File "{options["path"]}" does not exist.')
+        except (ValueError, KeyError) as error:
+            raise CommandError(f'Invalid record: {error!r}')
+
+        for name, count in sorted(counts.items()):
+            self.stdout.write(f'{name:<14} {count}')
+        rate = importer.rows / importer.elapsed if importer.elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {importer.rows} rows in {importer.elapsed:.1f}s ({rate:.0f} rows/s)'
+        ))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from blog import leaderboards
+
+
+class Command(BaseCommand):
+    help = (
+        "Recounts the posts and comments of the leaderboard rollups (blog.leaderboards) for the last days "
+        "from the source tables, e.g. after a bulk import. Votes are kept as they are."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=leaderboards.REFRESH_DAYS,
+                            help='Number of days to recount, today included.')
+
+    def handle(self, *args, **options):
+        written = leaderboards.rebuild_daily_stats(days=options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} daily stats rows'))
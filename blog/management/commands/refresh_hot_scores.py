@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from blog import constants as const
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the hot scores of the posts whose votes, comments or favorites changed. "
+        "With --all every post is recomputed, e.g. after changing the weights in blog.constants."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Recompute every post, not only the stale ones.')
+        parser.add_argument('--batch-size', type=int, default=const.HOT_REFRESH_BATCH_SIZE,
+                            help='Posts recomputed per query.')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            updated = Post.objects.refresh_hot_scores(batch_size=options['batch_size'])
+        else:
+            updated = Post.objects.refresh_stale_hot_scores(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Updated the hot scores of {updated} posts'))
@@ -1,15 +1,20 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import transaction
 from django.db.models import Subquery, Sum, OuterRef, Prefetch, Exists, Value, IntegerField, Q
 from django.db.models.functions import Coalesce
 
+from blog import constants as const
+from blog.ranking import get_hot_points, hot_score
+from common.db.querytags import TaggedManager, query_origin
+from common.expressions import SubqueryCount
+from common.mixins.serializers import is_requested
 from rating.models import PostRating, CommentRating
 from subscription.models import Favorite
 
 User = get_user_model()
 
 
-class PostManager(models.Manager):
+class PostManager(TaggedManager):
     def get_rating_subquery(self):
         """
         Returns a subquery to calculate the overall rating of a post.
@@ -26,6 +31,7 @@ class PostManager(models.Manager):
 
         return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
 
+    @query_origin
     def get_posts_prefetch(self, request_user=None):
         posts = self.select_related(
             'category',
@@ -41,58 +47,128 @@ class PostManager(models.Manager):
 
         return Prefetch('author__posts', posts)
 
-    def get_user_annotate(self, user, queryset):
+    def get_user_annotate(self, user, queryset, fields=None):
         """
         Annotate posts with additional data related to the current user.
 
         - favorite: whether the current user has marked the post as favorite
         - user_vote: the vote given by the current user to the post, if any
         """
-        user_favorite_subquery = Favorite.objects.filter(
-            post=OuterRef('pk'),
-            user=user
-        )
-
-        user_vote_subquery = PostRating.objects.filter(
-            obj_id=OuterRef('pk'),
-            owner_id=user.pk
-        ).values('vote')[:1]
-
-        return queryset.annotate(
-            user_favorite=Exists(user_favorite_subquery),
-            user_vote=Coalesce(Subquery(user_vote_subquery), 0)
-        )
-
-    def get_posts_list(self, user=None):
+        annotations = {}
+        if is_requested(fields, 'my_favorite'):
+            annotations['user_favorite'] = Exists(Favorite.objects.filter(
+                post=OuterRef('pk'),
+                user=user
+            ))
+        if is_requested(fields, 'my_vote'):
+            user_vote_subquery = PostRating.objects.filter(
+                obj_id=OuterRef('pk'),
+                owner_id=user.pk
+            ).values('vote')[:1]
+            annotations['user_vote'] = Coalesce(Subquery(user_vote_subquery), 0)
+
+        return queryset.annotate(**annotations)
+
+    @query_origin
+    def get_posts_list(self, user=None, fields=None):
         """
         Retrieves a list of posts.
         Applies user-specific annotations if a user is provided.
+
+        `fields` are the serializer fields that will be read (a sparse fieldset), None for all of them.
+        The joins, annotations, prefetches and the text column that they do not need are left out.
         """
-        queryset = self.select_related(
-            'author__user__profile',
-            'category',
-        ).prefetch_related(
-            'comments',
-            'favorites',
-        ).annotate(
-            rating=self.get_rating_subquery(),
-        )
+        if fields is None:
+            queryset = self.select_related(
+                'author__user__profile',
+                'category',
+            )
+        else:
+            queryset = self.all()
+            if 'author' in fields:
+                queryset = queryset.select_related('author__user')
+            elif 'author_profile' in fields:
+                queryset = queryset.select_related('author')
+            if 'category' in fields:
+                queryset = queryset.select_related('category')
+            if 'text' not in fields:
+                queryset = queryset.defer('text')
+
+        prefetch = [
+            lookup for lookup, field in (('comments', 'comments_count'), ('favorites', 'fav_count'))
+            if is_requested(fields, field)
+        ]
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+
+        if is_requested(fields, 'rating'):
+            queryset = queryset.annotate(rating=self.get_rating_subquery())
 
         if user and user.is_authenticated:
-            queryset = self.get_user_annotate(user, queryset)
+            queryset = self.get_user_annotate(user, queryset, fields)
 
         return queryset
 
-    def get_user_feed(self, user):
+    @query_origin
+    def get_user_feed(self, user, fields=None):
         subbed_categories = user.category_subscriptions.values_list('subscribed_to', flat=True)
         subbed_users = user.user_subscriptions.values_list('subscribed_to', flat=True)
 
-        return self.get_posts_list(user=user).filter(
+        return self.get_posts_list(user=user, fields=fields).filter(
             Q(category_id__in=subbed_categories) | Q(author__user_id__in=subbed_users)
         )
 
+    def mark_hot_score_stale(self, pk):
+        """
+        Queue the hot score of a post for the next incremental refresh.
+        The row is written only once between two refreshes, however many votes the post gets.
+        """
+        self.filter(pk=pk, hot_score_stale=False).update(hot_score_stale=True)
+
+    def refresh_hot_scores(self, queryset=None, batch_size=const.HOT_REFRESH_BATCH_SIZE):
+        """
+        Recompute the hot scores of the posts of `queryset` (all posts by default).
+
+        Posts are walked in primary key order, each batch costs one SELECT with the engagement
+        counted by correlated subqueries and one `bulk_update`. Returns the number of updated posts.
+        """
+        queryset = (self.all() if queryset is None else queryset).order_by('pk').annotate(
+            rating=self.get_rating_subquery(),
+            comments_count=SubqueryCount(self.model.comments.rel.related_model.objects.filter(post=OuterRef('pk'))),
+            favorites_count=SubqueryCount(Favorite.objects.filter(post=OuterRef('pk'))),
+        ).values_list('pk', 'created_at', 'rating', 'comments_count', 'favorites_count')
+
+        updated, last_pk = 0, 0
+        while rows := list(queryset.filter(pk__gt=last_pk)[:batch_size]):
+            self.bulk_update([
+                self.model(pk=pk, hot_score=hot_score(get_hot_points(*counts), created_at))
+                for pk, created_at, *counts in rows
+            ], ['hot_score'])
+            updated += len(rows)
+            last_pk = rows[-1][0]
+        return updated
+
+    def refresh_stale_hot_scores(self, batch_size=const.HOT_REFRESH_BATCH_SIZE):
+        """
+        Recompute the hot scores of the posts marked by `mark_hot_score_stale`.
+        """
+        updated = 0
+        while pks := list(self.filter(hot_score_stale=True).values_list('pk', flat=True)[:batch_size]):
+            with transaction.atomic():
+                # The flag is cleared before the counts are read, so engagement arriving
+                # during the refresh marks the post again instead of being lost.
+                self.filter(pk__in=pks).update(hot_score_stale=False)
+                updated += self.refresh_hot_scores(self.filter(pk__in=pks), batch_size)
+        return updated
+
+
+class CommentManager(TaggedManager):
+    # Serializer field that reads each relation of `get_comments(related_args)`
+    RELATED_FIELDS = {
+        'post': 'post_title',
+        'author': 'author',
+    }
 
-class CommentManager(models.Manager):
     def get_rating_subquery(self):
         """
         Returns a subquery to calculate the overall rating of a comment.
@@ -126,18 +202,30 @@ class CommentManager(models.Manager):
             )
         )
 
-    def get_comments(self, related_args=None, request_user: User = None):
+    @query_origin
+    def get_comments(self, related_args=None, request_user: User = None, fields=None):
+        """
+        `fields` are the serializer fields that will be read (a sparse fieldset), None for all of them.
+        The joins, annotations and the text column that they do not need are left out.
+        """
         if not related_args:
             related_args = (
                 'post',
             )
-        comments_qs = self.select_related(
-            *related_args,
-        ).annotate(
-            rating=self.get_rating_subquery(),
-        )
+        if fields is not None:
+            related_args = [
+                lookup for lookup in related_args
+                if lookup not in self.RELATED_FIELDS or self.RELATED_FIELDS[lookup] in fields
+            ]
+        comments_qs = self.select_related(*related_args) if related_args else self.all()
 
-        if request_user and request_user.is_authenticated:
+        if fields is not None and 'text' not in fields:
+            comments_qs = comments_qs.defer('text')
+
+        if is_requested(fields, 'rating'):
+            comments_qs = comments_qs.annotate(rating=self.get_rating_subquery())
+
+        if request_user and request_user.is_authenticated and is_requested(fields, 'my_vote'):
             comments_qs = self.get_user_annotate(user=request_user, queryset=comments_qs)
 
         return comments_qs
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:01
+
+import blog.ranking
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='hot_score',
+            field=models.FloatField(default=blog.ranking.new_post_hot_score, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='hot_score_stale',
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-hot_score', '-id'], name='blog_post_hot_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('hot_score_stale', True)), fields=['id'], name='blog_post_hot_stale_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_post_hot_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('posts', models.IntegerField(default=0)),
+                ('comments', models.IntegerField(default=0)),
+                ('votes', models.IntegerField(default=0)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='blog.author')),
+            ],
+            options={
+                'verbose_name_plural': 'Author daily stats',
+                'indexes': [models.Index(fields=['day'], name='blog_author_stats_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('author', 'day'), name='unique_author_daily_stats')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CategoryDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('posts', models.IntegerField(default=0)),
+                ('comments', models.IntegerField(default=0)),
+                ('votes', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='blog.category')),
+            ],
+            options={
+                'verbose_name_plural': 'Category daily stats',
+                'indexes': [models.Index(fields=['day'], name='blog_category_stats_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('category', 'day'), name='unique_category_daily_stats')],
+            },
+        ),
+    ]
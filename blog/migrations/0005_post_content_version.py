@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:37
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_daily_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='content_changed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='content_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
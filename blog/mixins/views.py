@@ -3,9 +3,12 @@ from django.core.exceptions import PermissionDenied
 from django.db.models import Prefetch
 
 from blog.models import Post, Comment, Author
+from common.db.querytags import query_origin
+from common.mixins.views import ConditionalGetMixin
 
 
 class PostDetailQuerySetMixin:
+    @query_origin
     def get_queryset(self):
         comments_prefetch = Prefetch('comments', Comment.objects.get_comments(
             related_args=['author__profile'],
@@ -28,6 +31,15 @@ class PostDetailQuerySetMixin:
         return qs
 
 
+class PostConditionalGetMixin(ConditionalGetMixin):
+    """
+    Conditional GET of the pages and API resources of a post and its comments: comments,
+    votes and favorites bump the content version of the post, edits its `updated_at`.
+    """
+    validators_model = Post
+    validators_fields = ('content_version', 'content_changed_at', 'updated_at')
+
+
 class PostLoginRequiredAndGetAuthorMixin(AccessMixin):
 
     def dispatch(self, request, *args, **kwargs):
@@ -6,8 +6,8 @@ from django.contrib.auth import get_user_model
 from django.db import models
 from django.urls import reverse
 
-from common.models.mixins import DateTimeMixin
-from rating.models import PostRating, Vote, CommentRating
+from blog.ranking import new_post_hot_score
+from common.models.mixins import ContentVersionMixin, DateTimeMixin
 from .managers import PostManager, CommentManager
 
 User = get_user_model()
@@ -24,14 +24,21 @@ class Author(models.Model):
         return self.user.username  # noqa
 
 
-class Post(DateTimeMixin):
+class Post(ContentVersionMixin, DateTimeMixin):
     class Meta:
         ordering = ('-created_at',)
+        indexes = (
+            models.Index(fields=['-hot_score', '-id'], name='blog_post_hot_score_idx'),
+            models.Index(fields=['id'], condition=models.Q(hot_score_stale=True), name='blog_post_hot_stale_idx'),
+        )
 
     author = models.ForeignKey('Author', on_delete=models.CASCADE, related_name='posts')
     category = models.ForeignKey('Category', on_delete=models.CASCADE, related_name='posts')
     title = models.CharField(max_length=100)
     text = RichTextUploadingField(max_length=3000, help_text='Enter text')
+    # Maintained by PostManager.refresh_hot_scores(), see blog.ranking
+    hot_score = models.FloatField(default=new_post_hot_score, editable=False)
+    hot_score_stale = models.BooleanField(default=True, editable=False)
 
     objects = PostManager()
 
@@ -49,12 +56,6 @@ class Post(DateTimeMixin):
     def __str__(self):
         return self.title
 
-    def save(self, *args, **kwargs):
-        is_new = self.pk is None
-        super().save(*args, **kwargs)
-        if is_new:
-            PostRating.objects.create(obj=self, owner=self.author.user, vote=Vote.VoteType.NEUTRAL)
-
 
 class Category(models.Model):
     class Meta:
@@ -84,8 +85,44 @@ class Comment(DateTimeMixin):
         clean_text = re.sub(r'<[^>]+>', '', self.text)[:15]
         return clean_text
 
-    def save(self, *args, **kwargs):
-        is_new = self.pk is None
-        super().save(*args, **kwargs)
-        if is_new:
-            CommentRating.objects.create(obj=self, owner=self.author, vote=Vote.VoteType.NEUTRAL)
+
+class DailyStats(models.Model):
+    """
+    Daily rollup of the activity around an author or a category, see blog.leaderboards.
+
+    `posts` and `comments` are counted on the day they were created, `votes` is the net rating
+    received on the day the votes were cast.
+    """
+    day = models.DateField()
+    posts = models.IntegerField(default=0)
+    comments = models.IntegerField(default=0)
+    votes = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class AuthorDailyStats(DailyStats):
+    class Meta:
+        verbose_name_plural = 'Author daily stats'
+        constraints = (
+            models.UniqueConstraint(fields=['author', 'day'], name='unique_author_daily_stats'),
+        )
+        indexes = (
+            models.Index(fields=['day'], name='blog_author_stats_day_idx'),
+        )
+
+    author = models.ForeignKey('Author', on_delete=models.CASCADE, related_name='daily_stats')
+
+
+class CategoryDailyStats(DailyStats):
+    class Meta:
+        verbose_name_plural = 'Category daily stats'
+        constraints = (
+            models.UniqueConstraint(fields=['category', 'day'], name='unique_category_daily_stats'),
+        )
+        indexes = (
+            models.Index(fields=['day'], name='blog_category_stats_day_idx'),
+        )
+
+    category = models.ForeignKey('Category', on_delete=models.CASCADE, related_name='daily_stats')
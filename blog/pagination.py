@@ -1,3 +1,4 @@
+from django.db.models import Q
 from rest_framework.pagination import CursorPagination
 
 
@@ -5,6 +6,86 @@ class CursorCreatedAtPagination(CursorPagination):
     ordering = '-created_at'
 
 
+class HotKeysetPage:
+    """
+    Page of posts in the `hot` ordering, fetched with a keyset (seek) condition.
+
+    The `cursor` query parameter holds `<hot_score>_<pk>` of the last post of the previous
+    page, so deep pages use the hot score index the same way the first one does instead of
+    scanning and discarding OFFSET rows. Provides the parts of `django.core.paginator.Page`
+    used by the templates.
+    """
+    cursor_query_param = 'cursor'
+
+    def __init__(self, queryset, per_page, query_params):
+        self.query_params = query_params
+        self.cursor = query_params.get(self.cursor_query_param)
+        self.per_page = per_page
+        # Links that send the user back to "the current page" fall back to the first one
+        self.number = 1
+
+        keyset_filter = self.get_keyset_filter(self.cursor)
+        if keyset_filter is not None:
+            queryset = queryset.filter(keyset_filter)
+        # One row more than the page size tells whether there is a next page
+        self.queryset = queryset[:per_page + 1]
+        self.object_list = None
+
+    @staticmethod
+    def get_keyset_filter(cursor):
+        try:
+            score, pk = cursor.split('_')
+            score, pk = float(score), int(pk)
+        except (AttributeError, ValueError):
+            return None
+        return Q(hot_score__lt=score) | Q(hot_score=score, pk__lt=pk)
+
+    def set_rows(self, rows):
+        self.object_list = rows[:self.per_page]
+        self._has_next = len(rows) > self.per_page
+        return self
+
+    def fetch(self):
+        return self.set_rows(list(self.queryset))
+
+    async def afetch(self):
+        return self.set_rows([obj async for obj in self.queryset])
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self.cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def get_page_url(self, cursor=None):
+        params = self.query_params.copy()
+        params.pop(self.cursor_query_param, None)
+        params.pop('page', None)
+        if cursor is not None:
+            params[self.cursor_query_param] = cursor
+        return f'?{params.urlencode()}'
+
+    @property
+    def first_page_url(self):
+        return self.get_page_url()
+
+    @property
+    def next_page_url(self):
+        if not self.has_next():
+            return None
+        last = self.object_list[-1]
+        return self.get_page_url(f'{last.hot_score!r}_{last.pk}')
+
+
 def paginate_and_serialize_objects(objects, paginator, serializer, request):
     """
     Paginate and serialize posts or comments.
@@ -0,0 +1,34 @@
+import math
+from datetime import datetime, timezone
+
+from django.utils import timezone as dj_timezone
+
+from blog import constants as const
+
+HOT_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def get_hot_points(rating, comments_count, favorites_count):
+    """
+    Engagement of a post: the sum of votes plus weighted comments and favorites.
+    """
+    return rating + const.HOT_COMMENT_WEIGHT * comments_count + const.HOT_FAVORITE_WEIGHT * favorites_count
+
+
+def hot_score(points, created_at):
+    """
+    Reddit-style "hot" score.
+
+    The order of magnitude of the points is added to the publication time measured in
+    `HOT_DECAY_SECONDS`, so newer posts win unless older ones have had much more engagement.
+    The age is a constant of the post, the score only changes with its engagement and
+    does not have to be recomputed as time passes.
+    """
+    order = math.log10(max(abs(points), 1))
+    sign = (points > 0) - (points < 0)
+    seconds = (created_at - HOT_EPOCH).total_seconds()
+    return round(sign * order + seconds / const.HOT_DECAY_SECONDS, 7)
+
+
+def new_post_hot_score():
+    return hot_score(0, dj_timezone.now())
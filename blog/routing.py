@@ -0,0 +1,7 @@
+from django.urls import path
+
+from blog import consumers
+
+websocket_urlpatterns = [
+    path('ws/blog/<int:post_pk>/', consumers.PostEventsConsumer.as_asgi()),
+]
@@ -1,15 +1,48 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.core.cache import cache
-from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete
 from django.dispatch import receiver
+from django.utils import timezone
 
 from blog import constants as const
-from blog.models import Author, Category
+from blog import events, leaderboards
+from blog.models import Author, Category, Comment, Post
+from common.models.mixins import bump_content_version
+from rating.models import CommentRating, PostRating
+from subscription.models import Favorite
+from users.models import Profile
 
 User = get_user_model()
 
 
+def content_changed(post_id=None, user_ids=(), hot_score_stale=False):
+    """
+    Bump the content versions (the conditional GET validators) of the post, of the profile of its author
+    and of the profiles of `user_ids`. With `hot_score_stale` (a change of the engagement of the post)
+    the same UPDATE queues the hot score of the post for the periodic refresh.
+    """
+    if post_id is not None:
+        changes = {'hot_score_stale': True} if hot_score_stale else {}
+        bump_content_version(Post.objects.filter(pk=post_id), **changes)
+    profiles = Q(pk__in=user_ids)
+    if post_id is not None:
+        profiles |= Q(user__author__posts=post_id)
+    bump_content_version(Profile.objects.filter(profiles))
+
+
+def deleted_with_post(origin, post_id=None, comment_id=None):
+    """
+    Whether a deleted row goes away together with its post, which `remove_deleted_post_from_rollups`
+    has marked on the `origin` of the delete (the object or the queryset `delete()` was called on).
+    """
+    return (
+        post_id in getattr(origin, '_deleted_post_ids', ())
+        or comment_id in getattr(origin, '_deleted_comment_ids', ())
+    )
+
+
 @receiver([post_save, post_delete], sender=Category, dispatch_uid='blog.update_category_cache')
 def update_category_cache(sender, **kwargs):
     """
@@ -54,3 +87,127 @@ def ensure_superusers_have_blogger_group_membership(sender, instance, created, *
             instance.groups.add(group)
 
         Author.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=Comment, dispatch_uid='blog.broadcast_comment_saved')
+def broadcast_comment_saved(sender, instance, created, **kwargs):
+    """
+    Notify the clients watching the post about a new or edited comment.
+    """
+    event_type = events.COMMENT_CREATED if created else events.COMMENT_EDITED
+    events.broadcast_post_event(instance.post_id, event_type, comment=instance.pk, reply_to=instance.reply_to_id)
+
+
+@receiver(post_delete, sender=Comment, dispatch_uid='blog.broadcast_comment_deleted')
+def broadcast_comment_deleted(sender, instance, **kwargs):
+    events.broadcast_post_event(instance.post_id, events.COMMENT_DELETED, comment=instance.pk)
+
+
+@receiver(post_save, sender=PostRating, dispatch_uid='blog.broadcast_post_rating_saved')
+@receiver(post_save, sender=CommentRating, dispatch_uid='blog.broadcast_comment_rating_saved')
+@receiver(post_delete, sender=PostRating, dispatch_uid='blog.broadcast_post_rating_deleted')
+@receiver(post_delete, sender=CommentRating, dispatch_uid='blog.broadcast_comment_rating_deleted')
+def apply_rating_delta(sender, instance, **kwargs):
+    """
+    Apply the rating change of the post or of one of its comments: notify the clients watching
+    the post, add the change to the leaderboard rollups and bump the content versions.
+
+    Only the change is sent, the clients apply it to the rating they show.
+    """
+    if kwargs['signal'] is post_delete:
+        key = {'post_id': instance.obj_id} if sender is PostRating else {'comment_id': instance.obj_id}
+        if deleted_with_post(kwargs.get('origin'), **key):
+            return
+        stored_vote = getattr(instance, 'stored_vote', None)
+        delta = -(instance.vote if stored_vote is None else stored_vote)
+    else:
+        delta = instance.rating_delta
+    instance.stored_vote = instance.vote
+    if not delta:
+        return
+
+    if sender is PostRating:
+        events.broadcast_post_event(instance.obj_id, events.POST_RATING, delta=delta)
+        leaderboards.record_post_vote(instance.obj_id, delta)
+        content_changed(instance.obj_id, hot_score_stale=True)
+        return
+
+    comment = Comment.objects.filter(pk=instance.obj_id).values_list(
+        'post_id', 'post__category_id', 'author_id', 'author__author',
+    ).first()
+    if comment is not None:
+        post_id, category_id, author_id, blogger_id = comment
+        events.broadcast_post_event(post_id, events.COMMENT_RATING, comment=instance.obj_id, delta=delta)
+        content_changed(post_id, user_ids=[author_id])
+        # A comment vote counts for the category and for the comment author, if they are a blogger
+        leaderboards.record_activity(timezone.localdate(), blogger_id, category_id, votes=delta)
+
+
+@receiver(pre_delete, sender=Post, dispatch_uid='blog.remove_deleted_post_from_rollups')
+def remove_deleted_post_from_rollups(sender, instance, origin=None, **kwargs):
+    """
+    Take the post with its comments and votes out of the leaderboard rollups at once, and mark them
+    on the `origin` of the delete, so the handlers of the cascaded rows skip them (see `deleted_with_post`).
+    Without an origin the rows are counted out one by one.
+    """
+    if origin is None:
+        return
+    comment_ids = leaderboards.record_post_deletion(instance)
+    if not hasattr(origin, '_deleted_post_ids'):
+        origin._deleted_post_ids, origin._deleted_comment_ids = set(), set()
+    origin._deleted_post_ids.add(instance.pk)
+    origin._deleted_comment_ids.update(comment_ids)
+
+
+@receiver(post_save, sender=Post, dispatch_uid='blog.record_post_created')
+@receiver(post_delete, sender=Post, dispatch_uid='blog.record_post_deleted')
+@receiver(post_save, sender=Comment, dispatch_uid='blog.record_comment_created')
+@receiver(post_delete, sender=Comment, dispatch_uid='blog.record_comment_deleted')
+def record_leaderboard_activity(sender, instance, **kwargs):
+    """
+    Count new and deleted posts and comments in the leaderboard rollups.
+    """
+    if kwargs.get('created') is False:
+        return
+    if deleted_with_post(kwargs.get('origin'), post_id=instance.pk if sender is Post else instance.post_id):
+        return
+    sign = -1 if kwargs['signal'] is post_delete else 1
+    if sender is Post:
+        leaderboards.record_post(instance, sign)
+    else:
+        leaderboards.record_comment(instance, sign)
+
+
+@receiver(post_save, sender=Comment, dispatch_uid='blog.comment_saved_content_changed')
+@receiver(post_delete, sender=Comment, dispatch_uid='blog.comment_deleted_content_changed')
+@receiver(post_save, sender=Favorite, dispatch_uid='blog.favorite_saved_content_changed')
+@receiver(post_delete, sender=Favorite, dispatch_uid='blog.favorite_deleted_content_changed')
+def bump_post_content_version(sender, instance, **kwargs):
+    """
+    A comment or a favorite changes the post page, the profile of the post author
+    and, for a comment, the profile of the comment author. Except for a comment edit,
+    it changes the engagement of the post too.
+    """
+    # A deleted post needs neither versions nor a score
+    if deleted_with_post(kwargs.get('origin'), post_id=instance.post_id):
+        return
+    content_changed(
+        instance.post_id,
+        user_ids=[instance.author_id] if sender is Comment else (),
+        hot_score_stale=not (sender is Comment and kwargs.get('created') is False),
+    )
+
+
+@receiver(post_save, sender=Post, dispatch_uid='blog.post_saved_content_changed')
+@receiver(post_delete, sender=Post, dispatch_uid='blog.post_deleted_content_changed')
+@receiver(post_save, sender=Author, dispatch_uid='blog.author_saved_content_changed')
+def bump_author_content_version(sender, instance, **kwargs):
+    """
+    The posts and the biography of an author are shown on their profile.
+    The post itself is covered by its `updated_at`.
+    """
+    user_id = instance.user_id if sender is Author else Author.objects.filter(
+        pk=instance.author_id
+    ).values_list('user_id', flat=True).first()
+    if user_id is not None:
+        content_changed(user_ids=[user_id])
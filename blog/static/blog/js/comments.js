@@ -19,3 +19,203 @@ function showAllReplies(element) {
         element.innerHTML = 'Expand entire thread';
     }
 }
+
+// Live updates of the post page: comments and votes of other users are pushed over a WebSocket
+// (see blog/consumers.py) and patched into the page instead of reloading it.
+
+function renderRating(rating) {
+    if (rating > 0) {
+        return '<span style="color: limegreen">+' + rating + '</span>';
+    } else if (rating < 0) {
+        return '<span style="color: orangered">' + rating + '</span>';
+    }
+    return '<span>' + rating + '</span>';
+}
+
+function setRating(target, rating) {
+    const element = document.querySelector('[data-rating="' + target + '"]');
+    if (element) {
+        element.dataset.value = rating;
+        element.innerHTML = renderRating(rating);
+    }
+}
+
+function addRating(target, delta) {
+    const element = document.querySelector('[data-rating="' + target + '"]');
+    if (element) {
+        const rating = parseInt(element.dataset.value ?? element.textContent, 10) || 0;
+        setRating(target, rating + delta);
+    }
+}
+
+function setUserVote(link, userVote) {
+    const actions = link.parentElement;
+    actions.querySelectorAll('a[data-vote]').forEach(function (voteLink) {
+        const vote = parseInt(voteLink.dataset.vote, 10);
+        const color = vote === 1 ? 'lightgreen' : 'lightcoral';
+        voteLink.querySelector('svg').style.color = vote === userVote ? color : 'gray';
+    });
+}
+
+function addCommentsCount(delta) {
+    const element = document.querySelector('[data-comments-count]');
+    if (element) {
+        element.textContent = (parseInt(element.textContent, 10) || 0) + delta;
+    }
+}
+
+function findComment(commentId) {
+    return document.querySelector('.comment-block[data-comment-id="' + commentId + '"]');
+}
+
+function fetchComment(container, commentId) {
+    const url = container.dataset.fragmentUrl.replace(/\/0\/$/, '/' + commentId + '/');
+    return fetch(url, {headers: {'X-Requested-With': 'XMLHttpRequest'}}).then(function (response) {
+        if (!response.ok) {
+            throw new Error('Comment ' + commentId + ' is not available');
+        }
+        return response.text();
+    }).then(function (html) {
+        const template = document.createElement('template');
+        template.innerHTML = html.trim();
+        return template.content.querySelector('.comment-block');
+    });
+}
+
+function insertReply(parent, comment) {
+    let replies = parent.querySelector(':scope > .comment-replies');
+    if (!replies) {
+        const button = document.createElement('button');
+        button.className = 'show-replies btn btn-link';
+        button.innerHTML = 'Hide replies';
+        button.setAttribute('onclick', 'toggleComments(this)');
+        replies = document.createElement('div');
+        replies.className = 'comment-replies';
+        replies.style.display = 'block';
+        replies.appendChild(document.createElement('ul'));
+        parent.append(button, replies);
+    }
+    replies.querySelector(':scope > ul').appendChild(comment);
+}
+
+function onCommentCreated(container, event) {
+    if (findComment(event.comment)) {
+        return;
+    }
+    const parent = event.reply_to ? findComment(event.reply_to) : null;
+    // New root comments are shown at the top of the first page, replies only when the parent is on the page.
+    if (event.reply_to ? !parent : container.dataset.firstPage !== 'true') {
+        addCommentsCount(1);
+        return;
+    }
+    fetchComment(container, event.comment).then(function (comment) {
+        if (findComment(event.comment)) {
+            return;
+        }
+        if (parent) {
+            insertReply(parent, comment);
+        } else {
+            const list = document.createElement('ul');
+            list.appendChild(comment);
+            container.prepend(list);
+        }
+        addCommentsCount(1);
+    }).catch(function () {});
+}
+
+function onCommentEdited(container, event) {
+    const current = findComment(event.comment);
+    if (!current) {
+        return;
+    }
+    fetchComment(container, event.comment).then(function (comment) {
+        current.querySelector(':scope > .comment-body').replaceWith(comment.querySelector(':scope > .comment-body'));
+    }).catch(function () {});
+}
+
+function onCommentDeleted(event) {
+    const current = findComment(event.comment);
+    if (current) {
+        // Replies are deleted together with the comment.
+        addCommentsCount(-(1 + current.querySelectorAll('.comment-block').length));
+        current.remove();
+    }
+}
+
+function connectLiveUpdates(container, retryDelay = 1000) {
+    const scheme = window.location.protocol === 'https:' ? 'wss://' : 'ws://';
+    const socket = new WebSocket(scheme + window.location.host + container.dataset.liveUrl);
+
+    socket.onmessage = function (message) {
+        const event = JSON.parse(message.data);
+        switch (event.type) {
+            case 'comment.created':
+                onCommentCreated(container, event);
+                break;
+            case 'comment.edited':
+                onCommentEdited(container, event);
+                break;
+            case 'comment.deleted':
+                onCommentDeleted(event);
+                break;
+            case 'post.rating':
+                addRating('post-' + event.post, event.delta);
+                break;
+            case 'comment.rating':
+                addRating('comment-' + event.comment, event.delta);
+                break;
+        }
+    };
+    socket.onopen = function () {
+        retryDelay = 1000;
+    };
+    socket.onclose = function () {
+        // Give up after a few attempts: the WSGI deployment has no WebSocket endpoint.
+        if (retryDelay > 30000) {
+            return;
+        }
+        setTimeout(function () {
+            container.liveSocket = connectLiveUpdates(container, retryDelay * 2);
+        }, retryDelay);
+    };
+    return socket;
+}
+
+function isLive(container) {
+    return Boolean(container.liveSocket) && container.liveSocket.readyState === WebSocket.OPEN;
+}
+
+function onVoteClick(container, event) {
+    const link = event.target.closest('a[data-vote]');
+    if (!link) {
+        return;
+    }
+    event.preventDefault();
+    fetch(link.href, {headers: {'X-Requested-With': 'XMLHttpRequest'}}).then(function (response) {
+        // Anonymous users are redirected to the login page.
+        if (response.redirected || !response.ok) {
+            window.location.href = link.href;
+            return;
+        }
+        return response.json().then(function (data) {
+            setUserVote(link, data.user_vote);
+            // With a live connection the rating change arrives as an event, applying it here would count it twice.
+            if (!isLive(container)) {
+                setRating(link.parentElement.querySelector('[data-rating]').dataset.rating, data.rating);
+            }
+        });
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function () {
+    const container = document.getElementById('comments');
+    if (!container) {
+        return;
+    }
+    document.addEventListener('click', function (event) {
+        onVoteClick(container, event);
+    });
+    if ('WebSocket' in window) {
+        container.liveSocket = connectLiveUpdates(container);
+    }
+});
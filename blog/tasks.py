@@ -0,0 +1,22 @@
+from celery import shared_task
+
+from blog import leaderboards
+from blog.models import Post
+
+
+@shared_task(ignore_result=True)
+def refresh_hot_scores() -> int:
+    """
+    Recompute the hot scores of the posts whose engagement changed since the last run.
+    Scheduled by celery beat (`CELERY_BEAT_SCHEDULE`).
+    """
+    return Post.objects.refresh_stale_hot_scores()
+
+
+@shared_task(ignore_result=True)
+def rebuild_daily_stats() -> int:
+    """
+    Recount the recent posts and comments of the leaderboard rollups.
+    Scheduled by celery beat (`CELERY_BEAT_SCHEDULE`).
+    """
+    return leaderboards.rebuild_daily_stats()
@@ -2,6 +2,9 @@ import re
 
 from django import template
 
+from blog.comment_tree import CommentTreeRenderer
+from blog.models import Comment
+
 register = template.Library()
 
 
@@ -29,3 +32,16 @@ def has_group(user, group_name):
 @register.filter(name='remove_empty_paragraphs')
 def remove_empty_paragraphs(value):
     return re.sub(r'<p>&nbsp;</p>', '', value)
+
+
+@register.simple_tag(takes_context=True)
+def comment_tree(context, comments):
+    """
+    Render root comments with their replies for the current viewer, see `blog.comment_tree`.
+    A single comment is rendered without its replies.
+    """
+    if isinstance(comments, Comment):
+        comments = [comments]
+    page_obj = context.get('page_obj')
+    renderer = CommentTreeRenderer(context['request'], context['post'].pk, getattr(page_obj, 'number', ''))
+    return renderer.render(comments)
@@ -1,9 +1,10 @@
 from django.contrib.admin.sites import AdminSite
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, RequestFactory
 
 from blog.admin import AuthorAdmin, CategoryAdmin, PostAdmin, CommentAdmin
 from blog.models import Author, Post, Category, Comment
+from common.mixins.admin import CURSOR_VAR
 from rating.models import PostRating
 from subscription.models import Favorite
 
@@ -69,8 +70,7 @@ class PostAdminTest(TestCase):
         self.assertEqual(model_admin.rating(obj), 0)
         self.assertEqual(model_admin.fav_count(obj), 0)
 
-        # When a post is created, a rating of 0 is automatically assigned to the author.
-        PostRating.objects.filter(obj=self.post, owner=self.user).update(vote=1)
+        PostRating.objects.create(obj=self.post, owner=self.user, vote=1)
         PostRating.objects.create(obj=self.post, owner=self.another_user, vote=1)
         Favorite.objects.create(user=self.user, post=self.post)
 
@@ -100,3 +100,64 @@ class CommentAdminTest(TestCase):
         link = model_admin.post_link(obj)
         self.assertIn('/admin/blog/post/', link)
         self.assertIn(str(self.post.pk), link)
+
+
+class PostAdminChangeListTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(username='admin', password='1X<ISRUkw+tuK', email='ad@min.com')
+        cls.author = Author.objects.get(user=cls.admin)
+        cls.category = Category.objects.create(title='BlogCategory')
+        cls.posts = [
+            Post.objects.create(author=cls.author, category=cls.category, title=f'Post {i}', text='Content')
+            for i in range(5)
+        ]
+        cls.site = AdminSite()
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def get_changelist(self, params=None):
+        request = self.factory.get('/admin/blog/post/', params or {})
+        request.user = self.admin
+        model_admin = PostAdmin(Post, self.site)
+        model_admin.list_per_page = 2
+        return model_admin.get_changelist_instance(request)
+
+    def test_changelist_loads_only_list_display_columns(self):
+        changelist = self.get_changelist()
+        deferred = changelist.result_list[0].get_deferred_fields()
+        self.assertIn('text', deferred)
+        self.assertNotIn('title', deferred)
+
+    def test_changelist_counts_are_annotated(self):
+        Comment.objects.create(author=self.admin, post=self.posts[-1], text='Comment')
+        Favorite.objects.create(user=self.admin, post=self.posts[-1])
+        changelist = self.get_changelist()
+        obj = changelist.result_list[0]
+        model_admin = changelist.model_admin
+        self.assertEqual(model_admin.comments_count(obj), 1)
+        self.assertEqual(model_admin.fav_count(obj), 1)
+
+    def test_keyset_pagination(self):
+        changelist = self.get_changelist()
+        first_page = list(changelist.result_list)
+        self.assertEqual(changelist.result_count, 5)
+        self.assertIsNotNone(changelist.next_cursor)
+
+        seen = [post.pk for post in first_page]
+        while changelist.next_cursor:
+            changelist = self.get_changelist({CURSOR_VAR: changelist.next_cursor})
+            seen += [post.pk for post in changelist.result_list]
+
+        # Newest posts first, every post exactly once
+        self.assertEqual(seen, [post.pk for post in reversed(self.posts)])
+
+    def test_changelist_renders(self):
+        self.client.force_login(self.admin)
+        response = self.client.get('/admin/blog/post/')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get('/admin/blog/post/', {CURSOR_VAR: self.posts[2].pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.posts[1].title)
+        self.assertNotContains(response, self.posts[3].title)
@@ -0,0 +1,75 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from blog.comment_tree import get_fragment_key
+from blog.models import Author, Category, Comment, Post
+
+User = get_user_model()
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CommentTreeTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='blogger', password='1X<ISRUkw+tuK', email='em@il.com')
+        cls.reader = User.objects.create_user(username='reader', password='1X<ISRUkw+tuK', email='re@ader.com')
+        author = Author.objects.create(user=cls.user, bio='Biography')
+        cls.post = Post.objects.create(
+            author=author, category=Category.objects.create(title='Python'), title='Post', text='Text',
+        )
+        cls.root = Comment.objects.create(author=cls.reader, post=cls.post, text='<p>Root</p>')
+        cls.replies = [
+            Comment.objects.create(author=cls.user, post=cls.post, reply_to=cls.root, text=f'Reply {i}')
+            for i in range(5)
+        ]
+        Comment.objects.create(author=cls.reader, post=cls.post, reply_to=cls.replies[0], text='Deep reply')
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('blog:post-detail', kwargs={'pk': self.post.pk})
+
+    def get_comments(self):
+        return self.client.get(self.url).content.decode().split('id="comments"', 1)[-1]
+
+    def test_tree(self):
+        html = self.get_comments()
+        self.assertEqual(html.count('class="comment-block"'), 7)
+        self.assertEqual(html.count('Show replies'), 2)
+        self.assertEqual(html.count('Expand entire thread'), 1)
+        # The replies beyond the limit are inside the thread block
+        shown, thread = html.split('class="comment-thread"')
+        self.assertEqual(len(re.findall(r'Reply \d', shown)), 3)
+        self.assertEqual(len(re.findall(r'Reply \d', thread)), 2)
+        self.assertIn(f'href="{reverse("blog:reply-comment", args=(self.post.pk, self.root.pk))}"', html)
+
+    def test_fragments_are_shared_by_viewers(self):
+        self.client.force_login(self.reader)
+        html = self.get_comments()
+        self.assertEqual(html.count('>Edit</a>'), 2)
+        fragments = cache.get_many([get_fragment_key(comment) for comment in Comment.objects.all()])
+        self.assertEqual(len(fragments), 7)
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.get_comments().count('>Edit</a>'), 5)
+        self.client.logout()
+        self.assertNotIn('>Edit</a>', self.get_comments())
+
+    def test_cached_fragment_is_used(self):
+        self.get_comments()
+        key = get_fragment_key(Comment.objects.select_related('author__profile').get(pk=self.root.pk))
+        before, after = cache.get(key)
+        cache.set(key, (before, after.replace('Root', 'From the cache')))
+        self.assertIn('From the cache', self.get_comments())
+
+    def test_edited_comment_is_rendered_again(self):
+        comment = Comment.objects.select_related('author__profile').get(pk=self.root.pk)
+        key = get_fragment_key(comment)
+        comment.text = 'Edited'
+        comment.save()
+        self.assertNotEqual(get_fragment_key(comment), key)
+        self.assertIn('Edited', self.get_comments())
@@ -0,0 +1,104 @@
+import asyncio
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from blog import events
+from blog.models import Author, Category, Comment, Post
+from blog.routing import websocket_urlpatterns
+from rating.models import CommentRating, PostRating, Vote
+
+User = get_user_model()
+
+
+class PostEventsConsumerTest(TestCase):
+    async def test_events_of_the_post_are_pushed_to_the_client(self):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), '/ws/blog/1/')
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        await get_channel_layer().group_send(events.post_group_name(1), {
+            'type': 'post.event',
+            'event': {'type': events.POST_RATING, 'post': 1, 'delta': 1},
+        })
+        self.assertEqual(await communicator.receive_json_from(), {'type': 'post.rating', 'post': 1, 'delta': 1})
+
+        await get_channel_layer().group_send(events.post_group_name(2), {
+            'type': 'post.event',
+            'event': {'type': events.POST_RATING, 'post': 2, 'delta': 1},
+        })
+        self.assertTrue(await communicator.receive_nothing())
+        await communicator.disconnect()
+
+
+class PostEventsSignalsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser1', password='1X<ISRUkw+tuK', email='em@il.com')
+        cls.voter = User.objects.create_user(username='testuser2', password='1X<ISRUkw+tuK', email='em@ial.com')
+        cls.author = Author.objects.create(user=cls.user, bio='Biography.')
+        cls.category = Category.objects.create(title='BlogCategory')
+        cls.post = Post.objects.create(author=cls.author, category=cls.category, title='Title', text='Post text')
+
+    def setUp(self):
+        self.channel_layer = get_channel_layer()
+        self.channel = async_to_sync(self.channel_layer.new_channel)()
+        async_to_sync(self.channel_layer.group_add)(events.post_group_name(self.post.pk), self.channel)
+
+    def tearDown(self):
+        async_to_sync(self.channel_layer.flush)()
+
+    def receive_event(self, timeout=1):
+        async def receive():
+            return await asyncio.wait_for(self.channel_layer.receive(self.channel), timeout)
+        return async_to_sync(receive)()['event']
+
+    def assertNoEvent(self):
+        with self.assertRaises(asyncio.TimeoutError):
+            self.receive_event(timeout=0.1)
+
+    def test_comment_events(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            comment = Comment.objects.create(post=self.post, author=self.user, text='Comment')
+        self.assertEqual(self.receive_event(), {
+            'type': events.COMMENT_CREATED, 'post': self.post.pk, 'comment': comment.pk, 'reply_to': None,
+        })
+        # No rating event, the comment is created without a vote
+        self.assertNoEvent()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            comment.text = 'Edited'
+            comment.save()
+        self.assertEqual(self.receive_event()['type'], events.COMMENT_EDITED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            comment.delete()
+        self.assertEqual(self.receive_event()['type'], events.COMMENT_DELETED)
+
+    def test_post_rating_delta(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            vote = PostRating.objects.create(obj=self.post, owner=self.voter, vote=Vote.VoteType.LIKE)
+        self.assertEqual(self.receive_event(), {'type': events.POST_RATING, 'post': self.post.pk, 'delta': 1})
+
+        vote = PostRating.objects.get(pk=vote.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            vote.vote = Vote.VoteType.DISLIKE
+            vote.save()
+        self.assertEqual(self.receive_event()['delta'], -2)
+
+    def test_comment_rating_delta(self):
+        comment = Comment.objects.create(post=self.post, author=self.user, text='Comment')
+        with self.captureOnCommitCallbacks(execute=True):
+            CommentRating.objects.create(obj=comment, owner=self.voter, vote=Vote.VoteType.DISLIKE)
+        self.assertEqual(self.receive_event(), {
+            'type': events.COMMENT_RATING, 'post': self.post.pk, 'comment': comment.pk, 'delta': -1,
+        })
+
+    def test_nothing_is_sent_for_rolled_back_changes(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            Comment.objects.create(post=self.post, author=self.user, text='Comment')
+        self.assertNoEvent()
@@ -1,13 +1,17 @@
 from datetime import datetime, timedelta
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from django.test import TestCase
+from django.http import Http404
+from django.test import TestCase, AsyncRequestFactory
 from django.urls import reverse
 from freezegun import freeze_time
 
 from blog.models import Author, Post, Category, Comment
+from blog.views import posts
 from rating.models import PostRating
+from subscription.models import CategorySubscription
 
 User = get_user_model()
 
@@ -63,9 +67,8 @@ class PostListViewTest(TestCase):
         self.assertEqual(response.context['post_list'][0].category, self.another_category)
 
     def test_ordering_by_rating(self):
-        # When a post is created, a rating of 0 is automatically assigned to the author.
-        PostRating.objects.filter(owner=self.user, obj=self.post1).update(vote=1)
-        PostRating.objects.filter(owner=self.user, obj=self.post2).update(vote=-1)
+        PostRating.objects.create(owner=self.user, obj=self.post1, vote=1)
+        PostRating.objects.create(owner=self.user, obj=self.post2, vote=-1)
 
         response = self.client.get(reverse('blog:posts'), {'ordering': 'rating'})
         self.assertEqual(response.status_code, 200)
@@ -88,6 +91,34 @@ class PostListViewTest(TestCase):
         self.assertEqual(response.context['post_list'][0], self.post2)
         self.assertEqual(response.context['post_list'][1], self.post1)
 
+    def test_ordering_by_hot_score(self):
+        PostRating.objects.create(owner=self.user, obj=self.post1, vote=1)
+        Comment.objects.create(author=self.user, post=self.post1, text='Comment')
+        Post.objects.refresh_stale_hot_scores()
+
+        response = self.client.get(reverse('blog:posts'), {'ordering': 'hot'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['post_list']), [self.post1, self.post2])
+        self.assertTrue(response.context['keyset_pagination'])
+        self.assertFalse(response.context['page_obj'].has_next())
+
+    def test_hot_ordering_keyset_pages(self):
+        with freeze_time(datetime.now() + timedelta(seconds=2)):
+            for i in range(5):
+                Post.objects.create(author=self.author, category=self.category, title=f'Newer {i}', text='...')
+        Post.objects.refresh_stale_hot_scores()
+
+        response = self.client.get(reverse('blog:posts'), {'ordering': 'hot'})
+        page = response.context['page_obj']
+        self.assertEqual(len(page), 5)
+        self.assertTrue(page.has_next())
+        self.assertIn('ordering=hot', page.next_page_url)
+
+        response = self.client.get(reverse('blog:posts') + page.next_page_url)
+        self.assertEqual(list(response.context['post_list']), [self.post2, self.post1])
+        self.assertFalse(response.context['page_obj'].has_next())
+        self.assertContains(response, 'First')
+
 
 class PostDetailViewTest(TestCase):
     @classmethod
@@ -415,3 +446,97 @@ class CommentDeleteViewTest(TestCase):
             reverse('blog:delete-comment', kwargs={'post_pk': self.post.pk, 'comment_pk': self.comment.pk}))
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, f'/accounts/login/?next=/blog/{self.post.pk}/delete-comment/{self.comment.pk}/')
+
+
+class CommentFragmentViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser1', password='1X<ISRUkw+tuK', email='em@il.com')
+        cls.author = Author.objects.create(user=cls.user, bio='Biography.')
+        cls.category = Category.objects.create(title='BlogCategory')
+        cls.post = Post.objects.create(author=cls.author, category=cls.category, title='Title', text='Post text')
+        cls.other_post = Post.objects.create(author=cls.author, category=cls.category, title='Other', text='...')
+        cls.comment = Comment.objects.create(post=cls.post, author=cls.user, text='Live comment')
+
+    def test_renders_single_comment(self):
+        url = reverse('blog:comment-fragment', kwargs={'post_pk': self.post.pk, 'comment_pk': self.comment.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'blog/includes/blog_comments_recursive.html')
+        self.assertContains(response, f'data-comment-id="{self.comment.pk}"')
+        self.assertContains(response, 'Live comment')
+        self.assertNotContains(response, 'Edit</a>')
+
+    def test_author_sees_edit_buttons(self):
+        self.client.force_login(self.user)
+        url = reverse('blog:comment-fragment', kwargs={'post_pk': self.post.pk, 'comment_pk': self.comment.pk})
+        response = self.client.get(url)
+        self.assertContains(response, 'Edit</a>')
+
+    def test_comment_of_another_post_is_not_found(self):
+        url = reverse('blog:comment-fragment', kwargs={'post_pk': self.other_post.pk, 'comment_pk': self.comment.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+
+class AsyncPostViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser1', password='1X<ISRUkw+tuK', email='em@il.com')
+        cls.author = Author.objects.create(user=cls.user, bio='Biography.')
+        cls.category = Category.objects.create(title='BlogCategory.')
+        cls.another_category = Category.objects.create(title='AnotherCategory')
+        for i in range(6):
+            Post.objects.create(author=cls.author, category=cls.category, title=f'Title{i}', text='...')
+        cls.post = Post.objects.create(author=cls.author, category=cls.another_category, title='Title', text='...')
+
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+
+    def get_request(self, path, data=None):
+        request = self.factory.get(path, data)
+
+        async def auser():
+            return self.user
+
+        request.auser = auser
+        return request
+
+    async def test_post_list(self):
+        request = self.get_request(reverse('blog:posts'))
+        response = await posts.AsyncPostListView.as_view()(request)
+        await sync_to_async(response.render)()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context_data['is_paginated'])
+        self.assertIsInstance(response.context_data['post_list'], list)
+        self.assertEqual(len(response.context_data['post_list']), 5)
+        self.assertEqual(response.context_data['header'], 'All posts')
+
+    async def test_post_list_filtered_by_category(self):
+        await CategorySubscription.objects.acreate(subscriber=self.user, subscribed_to=self.another_category)
+        request = self.get_request(reverse('blog:posts'), {'category': self.another_category.title})
+        response = await posts.AsyncPostListView.as_view()(request)
+        await sync_to_async(response.render)()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context_data['post_list'], [self.post])
+        self.assertTrue(response.context_data['subscribed'])
+        self.assertEqual(response.context_data['subscribers_count'], 1)
+
+    async def test_post_detail(self):
+        for _ in range(6):
+            await Comment.objects.acreate(post=self.post, author=self.user, text='...')
+
+        request = self.get_request(reverse('blog:post-detail', args=(self.post.pk,)))
+        response = await posts.AsyncPostDetailView.as_view()(request, pk=self.post.pk)
+        await sync_to_async(response.render)()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context_data['post'], self.post)
+        self.assertEqual(len(response.context_data['page_obj']), 5)
+
+    async def test_post_detail_not_found(self):
+        request = self.get_request(reverse('blog:post-detail', args=(99999,)))
+        with self.assertRaises(Http404):
+            await posts.AsyncPostDetailView.as_view()(request, pk=99999)
@@ -9,6 +9,7 @@ from rest_framework.test import APIClient, APITestCase
 
 from blog.api.serializers.endpoints.categories import CategorySerializer
 from blog.models import Category, Post, Comment, Author
+from rating.models import PostRating
 from subscription.models import CategorySubscription
 
 User = get_user_model()
@@ -289,6 +290,22 @@ class PostViewSetTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['results'][0]['title'], 'Test Post')
 
+    def test_hot_ordering_is_cursor_paginated(self):
+        # The older post has enough engagement to outrank the newer one
+        PostRating.objects.create(obj=self.post, owner=self.another_blogger, vote=1)
+        PostRating.objects.create(obj=self.post, owner=self.non_blogger_user, vote=1)
+        Post.objects.refresh_stale_hot_scores()
+
+        response = self.client.get(reverse('api:post-list'), {'ordering': 'hot', 'page_size': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        self.assertEqual([post['title'] for post in response.data['results']], ['Test Post'])
+        self.assertIn('cursor=', response.data['next'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual([post['title'] for post in response.data['results']], ['Test Post from another user'])
+        self.assertIsNone(response.data['next'])
+
 
 class CommentViewSetTest(APITestCase):
     @classmethod
@@ -0,0 +1,128 @@
+import json
+import shutil
+import tempfile
+from datetime import date
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from blog.importer import BlogImporter
+from blog.models import Author, AuthorDailyStats, Category, CategoryDailyStats, Comment, Post
+from common.models.ckeditor import CKEditorPostImages
+from rating.models import CommentRating, PostRating
+
+User = get_user_model()
+
+RECORDS = [
+    {'type': 'user', 'id': 10, 'username': 'legacy_author', 'email': 'author@legacy.com', 'author': True,
+     'bio': 'Legacy bio'},
+    {'type': 'user', 'id': 11, 'username': 'legacy_reader', 'email': 'reader@legacy.com'},
+    {'type': 'post', 'id': 100, 'author': 10, 'category': 'Legacy', 'title': 'Old post',
+     'text': '<p><img src="/media/uploads/old.jpg"></p>', 'created_at': '2015-03-01T10:00:00Z',
+     'updated_at': '2015-03-02T10:00:00Z'},
+    # The reply comes before its parent
+    {'type': 'comment', 'id': 1001, 'post': 100, 'user': 10, 'reply_to': 1000, 'text': 'Reply'},
+    {'type': 'comment', 'id': 1000, 'post': 100, 'user': 11, 'reply_to': None, 'text': 'Root'},
+    {'type': 'comment', 'id': 1002, 'post': 999, 'user': 11, 'text': 'Unknown post'},
+    {'type': 'post_vote', 'post': 100, 'user': 11, 'vote': 1},
+    {'type': 'post_vote', 'post': 100, 'user': 10, 'vote': -1},
+    {'type': 'comment_vote', 'comment': 1000, 'user': 10, 'vote': -1},
+]
+
+
+class BlogImporterTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+
+    def write_ndjson(self, records):
+        path = Path(self.tmp_dir) / 'import.ndjson'
+        path.write_text('\n'.join(json.dumps(record) for record in records))
+        return str(path)
+
+    def test_import(self):
+        importer = BlogImporter(chunk_size=1)
+        counts = importer.run(RECORDS)
+
+        self.assertEqual(counts['user'], 2)
+        self.assertEqual(counts['post'], 1)
+        self.assertEqual(counts['comment'], 2)
+        self.assertEqual(counts['skipped'], 1)
+
+        author = User.objects.get(username='legacy_author')
+        self.assertTrue(author.groups.filter(name='Bloggers').exists())
+        self.assertEqual(Author.objects.get(user=author).bio, 'Legacy bio')
+        self.assertTrue(hasattr(User.objects.get(username='legacy_reader'), 'profile'))
+        self.assertFalse(author.has_usable_password())
+
+        post = Post.objects.get(title='Old post')
+        self.assertEqual(post.category, Category.objects.get(title='Legacy'))
+        self.assertEqual(post.created_at.year, 2015)
+        self.assertEqual(post.updated_at.day, 2)
+
+        root = Comment.objects.get(text='Root')
+        reply = Comment.objects.get(text='Reply')
+        self.assertEqual(reply.reply_to, root)
+
+    def test_votes(self):
+        BlogImporter().run(RECORDS)
+        post = Post.objects.get(title='Old post')
+        author = User.objects.get(username='legacy_author')
+
+        self.assertEqual(PostRating.objects.get(obj=post, owner=author).vote, -1)
+        self.assertEqual(PostRating.objects.filter(obj=post).count(), 2)
+
+        # No neutral placeholder rows are created for the authors
+        self.assertFalse(CommentRating.objects.filter(obj__text='Reply').exists())
+        self.assertEqual(CommentRating.objects.get(obj__text='Root', owner=author).vote, -1)
+
+    def test_daily_stats(self):
+        # The author's own vote is left out, the repeated vote of the reader is skipped
+        duplicate = {'type': 'post_vote', 'post': 100, 'user': 11, 'vote': -1}
+        counts = BlogImporter().run(RECORDS[:7] + [RECORDS[8], duplicate])
+        self.assertEqual(counts['post_vote'], 1)
+
+        # The comments are dated today, the votes count on the day of the voted post or comment
+        old_day, today = date(2015, 3, 1), timezone.localdate()
+        self.assertEqual(
+            set(AuthorDailyStats.objects.values_list('day', 'posts', 'comments', 'votes')),
+            {(old_day, 1, 0, 1), (today, 0, 2, 0)},
+        )
+        self.assertEqual(
+            set(CategoryDailyStats.objects.values_list('day', 'posts', 'comments', 'votes')),
+            {(old_day, 1, 0, 1), (today, 0, 2, -1)},
+        )
+
+    def test_images_are_linked(self):
+        BlogImporter().run(RECORDS)
+        image = CKEditorPostImages.objects.get(uri='/media/uploads/old.jpg')
+        self.assertEqual(list(image.posts.values_list('title', flat=True)), ['Old post'])
+
+    def test_existing_users_are_reused(self):
+        user = User.objects.create_user(username='legacy_reader', email='reader@legacy.com', password='1X<ISRUkw+tuK')
+        BlogImporter().run(RECORDS)
+        self.assertEqual(Comment.objects.get(text='Root').author, user)
+
+    def test_number_of_queries_does_not_depend_on_rows(self):
+        posts = [
+            {'type': 'post', 'id': pk, 'author': 10, 'category': 'Legacy', 'title': f'Post {pk}', 'text': '...'}
+            for pk in range(50)
+        ]
+        importer = BlogImporter(chunk_size=100)
+        importer.run(RECORDS[:1])
+        # Savepoints, category lookup and creation, one bulk insert, the rollups (a SELECT and an INSERT
+        # and an UPDATE per table), image scan and the category cache refresh
+        with self.assertNumQueries(15):
+            importer.run(posts)
+        self.assertEqual(Post.objects.count(), 50)
+
+    def test_command(self):
+        path = self.write_ndjson(RECORDS)
+        out = StringIO()
+        call_command('import_blog', path, stdout=out)
+        self.assertIn('rows/s', out.getvalue())
+        self.assertEqual(Comment.objects.count(), 2)
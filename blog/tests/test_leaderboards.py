@@ -0,0 +1,147 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog import leaderboards
+from blog.models import Author, AuthorDailyStats, Category, CategoryDailyStats, Comment, Post
+from rating.models import CommentRating, PostRating
+
+User = get_user_model()
+
+
+class LeaderboardDataMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='blogger', password='1X<ISRUkw+tuK', email='em@il.com')
+        cls.other_user = User.objects.create_user(username='other', password='1X<ISRUkw+tuK', email='ot@her.com')
+        cls.reader = User.objects.create_user(username='reader', password='1X<ISRUkw+tuK', email='re@ader.com')
+        cls.author = Author.objects.create(user=cls.user, bio='Biography')
+        cls.other_author = Author.objects.create(user=cls.other_user, bio='Biography')
+        cls.category = Category.objects.create(title='Python')
+        cls.other_category = Category.objects.create(title='Go')
+        cls.post = Post.objects.create(author=cls.author, category=cls.category, title='Post', text='...')
+        cls.other_post = Post.objects.create(author=cls.other_author, category=cls.other_category, title='Other', text='...')
+
+
+class DailyStatsTest(LeaderboardDataMixin, TestCase):
+
+    def stats(self, model=AuthorDailyStats, **key):
+        return model.objects.values('posts', 'comments', 'votes').get(day=timezone.localdate(), **key)
+
+    def test_posts_comments_and_votes_are_counted(self):
+        comment = Comment.objects.create(author=self.other_user, post=self.post, text='Comment')
+        PostRating.objects.create(obj=self.post, owner=self.reader, vote=1)
+        CommentRating.objects.create(obj=comment, owner=self.reader, vote=-1)
+
+        self.assertEqual(self.stats(author=self.author), {'posts': 1, 'comments': 1, 'votes': 1})
+        # The comment vote counts for the comment author, who is a blogger too
+        self.assertEqual(self.stats(author=self.other_author), {'posts': 1, 'comments': 0, 'votes': -1})
+        self.assertEqual(self.stats(CategoryDailyStats, category=self.category),
+                         {'posts': 1, 'comments': 1, 'votes': 0})
+
+    def test_changes_and_deletes_are_applied(self):
+        vote = PostRating.objects.create(obj=self.post, owner=self.reader, vote=1)
+        vote.vote = -1
+        vote.save()
+        self.assertEqual(self.stats(author=self.author)['votes'], -1)
+        vote.delete()
+        self.assertEqual(self.stats(author=self.author)['votes'], 0)
+
+        comment = Comment.objects.create(author=self.reader, post=self.post, text='Comment')
+        comment.text = 'Edited'
+        comment.save()
+        self.assertEqual(self.stats(author=self.author)['comments'], 1)
+        comment.delete()
+        self.assertEqual(self.stats(author=self.author)['comments'], 0)
+
+    def test_post_delete_takes_its_rows_out_at_once(self):
+        for user in (self.reader, self.other_user):
+            comment = Comment.objects.create(author=user, post=self.post, text='Comment')
+            CommentRating.objects.create(obj=comment, owner=self.reader, vote=1)
+            PostRating.objects.create(obj=self.post, owner=user, vote=1)
+        Comment.objects.create(author=self.reader, post=self.other_post, text='Comment')
+
+        with self.assertNumQueries(24):
+            self.post.delete()
+        self.assertEqual(self.stats(author=self.author), {'posts': 0, 'comments': 0, 'votes': 0})
+        self.assertEqual(self.stats(author=self.other_author), {'posts': 1, 'comments': 1, 'votes': 0})
+        self.assertEqual(self.stats(CategoryDailyStats, category=self.category),
+                         {'posts': 0, 'comments': 0, 'votes': 0})
+
+    def test_rebuild_recounts_recent_days(self):
+        Comment.objects.bulk_create([Comment(author=self.reader, post=self.post, text='Imported') for _ in range(3)])
+        AuthorDailyStats.objects.filter(author=self.author).update(posts=5)
+        PostRating.objects.create(obj=self.post, owner=self.reader, vote=1)
+
+        self.assertEqual(leaderboards.rebuild_daily_stats(), 4)
+        # Votes have no timestamps and are kept
+        self.assertEqual(self.stats(author=self.author), {'posts': 1, 'comments': 3, 'votes': 1})
+        self.assertEqual(self.stats(CategoryDailyStats, category=self.category),
+                         {'posts': 1, 'comments': 3, 'votes': 1})
+
+    def test_rebuild_command(self):
+        out = StringIO()
+        call_command('rebuild_daily_stats', days=7, stdout=out)
+        self.assertIn('Rebuilt 4 daily stats rows', out.getvalue())
+
+    def test_leaderboards_sum_the_window(self):
+        PostRating.objects.create(obj=self.other_post, owner=self.reader, vote=1)
+        with freeze_time(timezone.now() - timedelta(days=10)):
+            PostRating.objects.create(obj=self.post, owner=self.reader, vote=1)
+            PostRating.objects.create(obj=self.post, owner=self.other_user, vote=1)
+            Comment.objects.create(author=self.reader, post=self.post, text='Old comment')
+
+        top = leaderboards.get_top_authors(days=7)
+        self.assertEqual([row['username'] for row in top], ['other', 'blogger'])
+        self.assertEqual(top[0]['rating'], 1)
+
+        top = leaderboards.get_top_authors(days=30)
+        self.assertEqual([(row['username'], row['rating']) for row in top], [('blogger', 2), ('other', 1)])
+
+        categories = leaderboards.get_active_categories(days=30)
+        self.assertEqual([(row['title'], row['activity']) for row in categories], [('Python', 2), ('Go', 1)])
+
+    def test_leaderboard_is_one_query(self):
+        with self.assertNumQueries(1):
+            leaderboards.get_top_authors()
+
+
+class LeaderboardAPIViewTest(LeaderboardDataMixin, APITestCase):
+
+    def test_top_authors(self):
+        PostRating.objects.create(obj=self.other_post, owner=self.reader, vote=1)
+        response = self.client.get(reverse('api:leaderboard-authors'), {'limit': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{
+            'author_id': self.other_author.pk, 'user_id': self.other_user.pk, 'username': 'other',
+            'rating': 1, 'comments_count': 0, 'posts_count': 1,
+        }])
+
+    def test_active_categories(self):
+        Comment.objects.create(author=self.reader, post=self.post, text='Comment')
+        response = self.client.get(reverse('api:leaderboard-categories'), {'days': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['title'] for row in response.data], ['Python', 'Go'])
+        self.assertEqual(response.data[0]['activity'], 2)
+
+    def test_invalid_window(self):
+        response = self.client.get(reverse('api:leaderboard-authors'), {'days': 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class HomeViewTest(LeaderboardDataMixin, TestCase):
+
+    def test_widgets(self):
+        response = self.client.get(reverse('blog:index'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['top_authors']), 2)
+        self.assertContains(response, 'Most active categories')
+        self.assertContains(response, '?category=Python')
@@ -1,10 +1,15 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from io import StringIO
 
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
+from freezegun import freeze_time
 
 from blog.models import Author, Post, Category, Comment
-from rating.models import PostRating, Vote, CommentRating
+from blog.ranking import hot_score
+from rating.models import PostRating, CommentRating
+from subscription.models import Favorite
 
 User = get_user_model()
 
@@ -97,25 +102,12 @@ class PostModelTest(TestCase):
         favs = post.favorites.all()
         return self.assertEqual(post.fav_count, len(favs))
 
-    def test_save_method_creates_post_rating(self):
-        # Creating a new post
-        new_post = Post(author=self.author, category=self.category, title='New Post', text='New post content')
-
-        # Checking that PostRating hasn't been created yet. By default, we already have 3 posts.
-        self.assertEqual(PostRating.objects.count(), 3)
-        new_post.save()
-        self.assertEqual(PostRating.objects.count(), 4)
-
-        # Checking the details of the created PostRating
-        post_rating = PostRating.objects.filter(obj=new_post).get()
-        self.assertEqual(post_rating.obj, new_post)
-        self.assertEqual(post_rating.owner, self.user)
-        self.assertEqual(post_rating.vote, Vote.VoteType.NEUTRAL)
-
-        # Checking that saving again doesn't create a new PostRating
-        new_post.title = 'Updated Title'
-        new_post.save()
-        self.assertEqual(PostRating.objects.count(), 4)
+    def test_save_method_does_not_create_post_rating(self):
+        # A missing rating row means a neutral vote, so no placeholder row is stored for the author
+        new_post = Post.objects.create(
+            author=self.author, category=self.category, title='New Post', text='New post content',
+        )
+        self.assertFalse(PostRating.objects.filter(obj=new_post).exists())
 
 
 class CategoryModelTest(TestCase):
@@ -179,22 +171,64 @@ class CommentModelTest(TestCase):
         comment = self.regexp_comment
         return self.assertEqual(str(comment), 'ThirdComm')
 
-    def test_save_method_creates_comment_rating(self):
-        # Creating a new comment
-        new_comment = Comment(author=self.user, post=self.post, text='New comment')
-
-        # Checking that CommentRating hasn't been created yet. By default, we already have 3 comments.
-        self.assertEqual(CommentRating.objects.count(), 3)
-        new_comment.save()
-        self.assertEqual(CommentRating.objects.count(), 4)
-
-        # Checking the details of the created CommentRating
-        comment_rating = CommentRating.objects.filter(obj=new_comment).get()
-        self.assertEqual(comment_rating.obj, new_comment)
-        self.assertEqual(comment_rating.owner, self.user)
-        self.assertEqual(comment_rating.vote, Vote.VoteType.NEUTRAL)
-
-        # Checking that saving again doesn't create a new CommentRating
-        new_comment.title = 'Updated Title'
-        new_comment.save()
-        self.assertEqual(CommentRating.objects.count(), 4)
+    def test_save_method_does_not_create_comment_rating(self):
+        # A missing rating row means a neutral vote, so no placeholder row is stored for the author
+        new_comment = Comment.objects.create(author=self.user, post=self.post, text='New comment')
+        self.assertFalse(CommentRating.objects.filter(obj=new_comment).exists())
+
+
+class PostHotScoreTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser1', password='1X<ISRUkw+tuK', email='em@il.com')
+        cls.reader = User.objects.create_user(username='testuser2', password='1X<ISRUkw+tuK', email='em@ail.com')
+        cls.author = Author.objects.create(user=cls.user, bio='Biography')
+        cls.category = Category.objects.create(title='BlogCategory')
+        with freeze_time('2024-06-01'):
+            cls.old_post = Post.objects.create(author=cls.author, category=cls.category, title='Old', text='...')
+        with freeze_time('2024-06-01 06:00'):
+            cls.new_post = Post.objects.create(author=cls.author, category=cls.category, title='New', text='...')
+        Post.objects.refresh_hot_scores()
+        Post.objects.update(hot_score_stale=False)
+
+    def test_hot_score_formula(self):
+        created_at = datetime(2024, 6, 1, tzinfo=timezone.utc)
+        self.assertAlmostEqual(hot_score(10, created_at) - hot_score(1, created_at), 1)
+        self.assertAlmostEqual(hot_score(-10, created_at) - hot_score(0, created_at), -1)
+        # A day later needs about 10^(86400 / HOT_DECAY_SECONDS) times the points to rank the same
+        self.assertGreater(hot_score(1, created_at + timedelta(days=1)), hot_score(10, created_at))
+        self.assertLess(hot_score(1, created_at + timedelta(days=1)), hot_score(100, created_at))
+
+    def test_newer_post_is_hotter_without_engagement(self):
+        self.old_post.refresh_from_db()
+        self.new_post.refresh_from_db()
+        self.assertGreater(self.new_post.hot_score, self.old_post.hot_score)
+
+    def test_engagement_marks_the_post_stale(self):
+        PostRating.objects.create(obj=self.old_post, owner=self.reader, vote=1)
+        Comment.objects.create(author=self.reader, post=self.old_post, text='Comment')
+        Favorite.objects.create(user=self.reader, post=self.old_post)
+        self.assertEqual(list(Post.objects.filter(hot_score_stale=True)), [self.old_post])
+
+        # 1 + 2 + 3 points outweigh the six hours the newer post has
+        self.assertEqual(Post.objects.refresh_stale_hot_scores(), 1)
+        self.assertFalse(Post.objects.filter(hot_score_stale=True).exists())
+        self.assertEqual(list(Post.objects.order_by('-hot_score')), [self.old_post, self.new_post])
+
+    def test_marking_stale_writes_once(self):
+        Post.objects.mark_hot_score_stale(self.old_post.pk)
+        with self.assertNumQueries(1):
+            Post.objects.mark_hot_score_stale(self.old_post.pk)
+
+    def test_refresh_batches(self):
+        # One SELECT and one UPDATE per batch, and an empty SELECT at the end
+        with self.assertNumQueries(5):
+            self.assertEqual(Post.objects.refresh_hot_scores(batch_size=1), 2)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('refresh_hot_scores', stdout=out)
+        self.assertIn('Updated the hot scores of 0 posts', out.getvalue())
+        call_command('refresh_hot_scores', '--all', stdout=out)
+        self.assertIn('Updated the hot scores of 2 posts', out.getvalue())
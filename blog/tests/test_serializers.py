@@ -0,0 +1,94 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from blog.api.serializers.endpoints import comments as comment_s
+from blog.api.serializers.endpoints import posts as posts_s
+from blog.models import Author, Category, Comment, Post
+from rating.models import CommentRating, PostRating
+from subscription.models import Favorite
+
+User = get_user_model()
+
+
+class FastSerializerDataMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='blogger', password='1X<ISRUkw+tuK', email='em@il.com')
+        cls.reader = User.objects.create_user(username='reader', password='1X<ISRUkw+tuK', email='re@ader.com')
+        author = Author.objects.create(user=cls.user, bio='Biography')
+        category = Category.objects.create(title='Python')
+        cls.post = Post.objects.create(author=author, category=category, title='Post', text='Long text ' * 20)
+        Post.objects.create(author=author, category=category, title='Other', text='...')
+        comment = Comment.objects.create(author=cls.reader, post=cls.post, text='<p>Comment</p>')
+        Comment.objects.create(author=cls.user, post=cls.post, reply_to=comment, text='Reply ' * 30)
+        PostRating.objects.create(obj=cls.post, owner=cls.reader, vote=1)
+        CommentRating.objects.create(obj=comment, owner=cls.reader, vote=-1)
+        Favorite.objects.create(user=cls.reader, post=cls.post)
+
+
+class FastListSerializerTest(FastSerializerDataMixin, TestCase):
+
+    def render(self, serializer_class, rows, user):
+        request = Request(APIRequestFactory().get('/api/post/'))
+        request.user = user
+        data = serializer_class(rows, many=True, context={'request': request, 'format': None}).data
+        return JSONRenderer().render(data)
+
+    def assertSameOutput(self, serializer_class, fast_serializer_class, rows, user):
+        self.assertEqual(self.render(fast_serializer_class, rows, user), self.render(serializer_class, rows, user))
+
+    def test_posts(self):
+        for user in (AnonymousUser(), self.reader):
+            with self.subTest(user=user):
+                rows = list(Post.objects.get_posts_list(user=user))
+                self.assertSameOutput(posts_s.PostSerializer, posts_s.PostFastListSerializer, rows, user)
+
+    def test_comments(self):
+        for user in (AnonymousUser(), self.reader):
+            with self.subTest(user=user):
+                rows = list(Comment.objects.get_comments(related_args=('post', 'author'), request_user=user))
+                self.assertSameOutput(comment_s.CommentListSerializer, comment_s.CommentFastListSerializer, rows, user)
+
+    def test_url_is_reversed_once(self):
+        rows = list(Post.objects.get_posts_list())
+        request = Request(APIRequestFactory().get('/api/post/'))
+        serializer = posts_s.PostFastListSerializer(rows, many=True, context={'request': request})
+        data = serializer.data
+        self.assertEqual(data[0]['url'], f'http://testserver/blog/{rows[0].pk}/')
+        self.assertIs(serializer.child.row_getters, serializer.child.row_getters)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_serializers', rows=10, repeat=2, user='reader', stdout=out)
+        self.assertIn('PostSerializer -> PostFastListSerializer (2 rows, same output)', out.getvalue())
+        self.assertIn('CommentListSerializer -> CommentFastListSerializer (2 rows, same output)', out.getvalue())
+
+
+class FastListEndpointTest(FastSerializerDataMixin, APITestCase):
+
+    def test_post_list(self):
+        self.client.force_authenticate(user=self.reader)
+        response = self.client.get(reverse('api:post-list'))
+        post = next(row for row in response.data['results'] if row['id'] == self.post.pk)
+        self.assertEqual(post['rating'], 1)
+        self.assertEqual(post['comments_count'], 2)
+        self.assertIs(post['my_favorite'], True)
+        self.assertEqual(post['author_profile'], f'http://testserver/users/profile/{self.user.pk}/')
+        self.assertEqual(len(post['text']), 100)
+
+    def test_comment_list(self):
+        self.client.force_authenticate(user=self.reader)
+        response = self.client.get(reverse('api:comment-list', kwargs={'post_id': self.post.pk}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {row['post_url'] for row in response.data['results']},
+            {f'http://testserver/blog/{self.post.pk}/'},
+        )
@@ -1,17 +1,22 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework import routers
 
 from blog.api.views import comments as api_comms
+from blog.api.views import leaderboards as api_leaderboards
 from blog.api.views import posts as api_posts
 from blog.api.views.categories import CategoryViewSet
 from blog.views import posts, comments, common
 
 app_name = 'blog'
 
+PostListView = posts.AsyncPostListView if settings.ASYNC_VIEWS else posts.PostListView
+PostDetailView = posts.AsyncPostDetailView if settings.ASYNC_VIEWS else posts.PostDetailView
+
 urlpatterns = [
     path('index/', common.HomeView.as_view(), name='index'),
-    path('all/', posts.PostListView.as_view(), name='posts'),
-    path('<int:pk>/', posts.PostDetailView.as_view(), name='post-detail'),
+    path('all/', PostListView.as_view(), name='posts'),
+    path('<int:pk>/', PostDetailView.as_view(), name='post-detail'),
     path('create/', posts.CreatePost.as_view(), name='create-post'),
     path('<int:pk>/edit/', posts.EditPost.as_view(), name='edit-post'),
     path('<int:pk>/delete/', posts.DeletePost.as_view(), name='delete-post'),
@@ -20,6 +25,7 @@ urlpatterns = [
     path('<int:post_pk>/reply/<int:comment_pk>', comments.CommentCreate.as_view(), name='reply-comment'),
     path('<int:post_pk>/edit-comment/<int:comment_pk>/', comments.CommentEdit.as_view(), name='edit-comment'),
     path('<int:post_pk>/delete-comment/<int:comment_pk>/', comments.CommentDelete.as_view(), name='delete-comment'),
+    path('<int:post_pk>/comment/<int:comment_pk>/', comments.CommentFragmentView.as_view(), name='comment-fragment'),
 ]
 
 router = routers.DefaultRouter()
@@ -31,4 +37,7 @@ drf_urlpatterns = [
     path('', include(router.urls)),
     path('post-with-comments/<int:pk>/', api_posts.PostWCommentsRetrieveAPIView.as_view(), name='post-with-comments'),
     path('comment/user/<int:user_id>/', api_comms.CommentListByUserAPIView.as_view(), name='comments-by-user'),
+    path('leaderboards/authors/', api_leaderboards.TopAuthorsAPIView.as_view(), name='leaderboard-authors'),
+    path('leaderboards/categories/', api_leaderboards.ActiveCategoriesAPIView.as_view(),
+         name='leaderboard-categories'),
 ]
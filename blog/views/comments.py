@@ -1,9 +1,10 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
-from django.views.generic import CreateView, UpdateView, DeleteView
+from django.views.generic import CreateView, UpdateView, DeleteView, DetailView
 
 from blog.mixins import views as blogmixins
 from blog.models import Post, Comment
+from common.db.routers import use_primary
 
 
 class CommentCreate(LoginRequiredMixin, CreateView):
@@ -53,3 +54,28 @@ class CommentDelete(blogmixins.CommentLoginRequiredAndCheckAuthorMixin, DeleteVi
 
     def get_success_url(self):
         return reverse_lazy('blog:post-detail', kwargs={'pk': self.kwargs['post_pk']})
+
+
+class CommentFragmentView(DetailView):
+    """
+    Render a single comment (without its replies) for the live updates of the post page.
+    """
+    template_name = 'blog/includes/blog_comments_recursive.html'
+    pk_url_kwarg = 'comment_pk'
+    context_object_name = 'comment'
+
+    def get_queryset(self):
+        return Comment.objects.get_comments(
+            related_args=('post', 'author__profile'),
+            request_user=self.request.user,
+        ).filter(post_id=self.kwargs['post_pk'])
+
+    def get(self, request, *args, **kwargs):
+        # The fragment is requested right after the comment was written, a replica may not have it yet.
+        with use_primary():
+            return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['post'] = self.object.post
+        return context
@@ -1,5 +1,16 @@
 from django.views.generic import TemplateView
 
+from blog import leaderboards
+
 
 class HomeView(TemplateView):
     template_name = 'blog/index.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({
+            'leaderboard_days': leaderboards.LEADERBOARD_DAYS,
+            'top_authors': leaderboards.get_top_authors(limit=5),
+            'active_categories': leaderboards.get_active_categories(limit=5),
+        })
+        return context
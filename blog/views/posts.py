@@ -1,13 +1,15 @@
 from django.core.paginator import Paginator
-from django.shortcuts import get_object_or_404
+from django.shortcuts import get_object_or_404, aget_object_or_404
 from django.urls import reverse_lazy
 from django.views.generic import DetailView, CreateView, UpdateView, DeleteView
 from django_filters.views import FilterView
 
+from blog import constants as const
 from blog.filters import PostFilterSet
 from blog.mixins import views as blogmixins
 from blog.models import Post, Category
-from common.mixins.views import CommentTreeMixin
+from blog.pagination import HotKeysetPage
+from common.mixins.views import CommentTreeMixin, AsyncMultipleObjectMixin, AsyncViewMixin
 
 
 class PostListView(FilterView):
@@ -19,6 +21,18 @@ class PostListView(FilterView):
     def get_queryset(self):
         return Post.objects.get_posts_list(user=self.request.user)
 
+    def is_keyset_paginated(self):
+        return self.request.GET.get('ordering') == const.HOT_ORDERING
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Page the `hot` ordering with a keyset cursor, the other orderings by page number.
+        """
+        if not self.is_keyset_paginated():
+            return super().paginate_queryset(queryset, page_size)
+        page = HotKeysetPage(queryset, page_size, self.request.GET).fetch()
+        return None, page, page.object_list, page.has_other_pages()
+
     def _update_context_with_category_information(self, category, context):
         """
         Add information about the selected category to the context.
@@ -40,18 +54,79 @@ class PostListView(FilterView):
             self._update_context_with_category_information(category, context)
 
         context['header'] = category or 'All posts'
+        context['keyset_pagination'] = self.is_keyset_paginated()
 
         return context
 
 
-class PostDetailView(blogmixins.PostDetailQuerySetMixin, CommentTreeMixin, DetailView):
+class AsyncPostListView(AsyncMultipleObjectMixin, PostListView):
+    """
+    PostListView served with the async ORM and cache under ASGI.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        await self.resolve_user(request)
+        self.category_choices = await PostFilterSet.aget_category_choices()
+
+        self.filterset = self.get_filterset(self.get_filterset_class())
+        if not self.filterset.is_bound or self.filterset.is_valid() or not self.get_strict():
+            self.object_list = self.filterset.qs
+        else:
+            self.object_list = self.filterset.queryset.none()
+
+        context = await self.aget_context_data(filter=self.filterset, object_list=self.object_list)
+
+        category = request.GET.get('category')
+        if category:
+            await self._aupdate_context_with_category_information(category, context)
+        context['header'] = category or 'All posts'
+        context['keyset_pagination'] = self.is_keyset_paginated()
+
+        return self.render_to_response(context)
+
+    async def apaginate_queryset(self, queryset, page_size):
+        if not self.is_keyset_paginated():
+            return await super().apaginate_queryset(queryset, page_size)
+        page = await HotKeysetPage(queryset, page_size, self.request.GET).afetch()
+        return None, page, page.object_list, page.has_other_pages()
+
+    def get_filterset_kwargs(self, filterset_class):
+        kwargs = super().get_filterset_kwargs(filterset_class)
+        kwargs['category_choices'] = self.category_choices
+        return kwargs
+
+    async def _aupdate_context_with_category_information(self, category, context):
+        category_obj = await aget_object_or_404(Category, title=category)
+        category_subscribers = [
+            subscriber_id async for subscriber_id in
+            category_obj.subscribers.values_list('subscriber_id', flat=True)
+        ]
+
+        context.update({
+            'category': category_obj,
+            'subscribed': self.request.user.pk in category_subscribers,
+            'subscribers_count': len(category_subscribers),
+        })
+
+
+class PostDetailView(
+    blogmixins.PostConditionalGetMixin,
+    blogmixins.PostDetailQuerySetMixin,
+    CommentTreeMixin,
+    DetailView,
+):
     model = Post
     root_comments_paginate_by = 5
     comment_replies_limit = 3
 
     def get_object(self, queryset=None):
         obj = super().get_object()
+        return self.paginate_comments(obj)
 
+    def paginate_comments(self, obj):
+        """
+        Build the comment tree from the prefetched comments and paginate its root comments.
+        """
         comments = obj.comments.all()
         comment_tree = self.comment_tree(comments)
         paginator = Paginator(comment_tree, self.root_comments_paginate_by)
@@ -69,6 +144,25 @@ class PostDetailView(blogmixins.PostDetailQuerySetMixin, CommentTreeMixin, Detai
         return context
 
 
+class AsyncPostDetailView(AsyncViewMixin, PostDetailView):
+    """
+    PostDetailView served with the async ORM under ASGI.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        await self.resolve_user(request)
+        return await self.aconditional_get(self.render_object, request, *args, **kwargs)
+
+    async def render_object(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    async def aget_object(self):
+        obj = await aget_object_or_404(self.get_queryset(), pk=self.kwargs.get(self.pk_url_kwarg))
+        return self.paginate_comments(obj)
+
+
 class CreatePost(blogmixins.PostLoginRequiredAndGetAuthorMixin, CreateView):
     model = Post
     fields = ['title', 'category', 'text']
@@ -1,3 +1,63 @@
 from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
 
-# Register your models here.
+from common.models import RequestProfile
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """
+    Profiled requests, slowest first. Filter by view to see the slowest requests of a view.
+    """
+    list_display = ['view_name', 'method', 'path', 'status_code', 'duration', 'user', 'created_at']
+    list_filter = ['view_name', 'method', 'status_code']
+    search_fields = ['path', 'request_id']
+    search_help_text = f"search in: {', '.join(search_fields)}"
+    ordering = ['-duration_ms']
+    fields = ['request_id', 'method', 'path', 'view_name', 'status_code', 'duration', 'user', 'created_at',
+              'download', 'summary_text']
+    readonly_fields = fields
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user').defer('stats', 'summary')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path('<path:object_id>/download/', self.admin_site.admin_view(self.download_view),
+                 name='common_requestprofile_download'),
+        ] + super().get_urls()
+
+    def download_view(self, request, object_id):
+        """
+        The pstats data as a `.prof` file, for `python -m pstats`, snakeviz or a flamegraph tool.
+        """
+        if not self.has_view_permission(request):
+            return HttpResponse(status=403)
+        profile = get_object_or_404(RequestProfile, pk=object_id)
+        return HttpResponse(
+            bytes(profile.stats),
+            content_type='application/octet-stream',
+            headers={'Content-Disposition': f'attachment; filename="{profile.request_id}.prof"'},
+        )
+
+    @admin.display(description='Duration', ordering='duration_ms')
+    def duration(self, obj):
+        return f'{obj.duration_ms:.1f} ms'
+
+    @admin.display(description='pstats file')
+    def download(self, obj):
+        url = reverse('admin:common_requestprofile_download', args=[obj.pk])
+        return format_html('<a href="{}">{}.prof</a>', url, obj.request_id)
+
+    @admin.display(description='Top functions (cumulative time)')
+    def summary_text(self, obj):
+        return format_html('<pre style="white-space: pre; overflow-x: auto">{}</pre>', obj.summary)
@@ -0,0 +1,25 @@
+from drf_spectacular.utils import extend_schema, inline_serializer
+from rest_framework import serializers
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from common.db.pool import get_database_stats
+
+
+class DatabaseHealthAPIView(APIView):
+    """
+    Connection settings and pool counters of the worker process that served the request.
+    """
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(
+        description="Returns, for every configured database, how connections are reused "
+                    "(persistent connections or a pool) and the pool counters of the worker "
+                    "that handled the request. Available to staff users only.",
+        summary='Database connections',
+        tags=['Health'],
+        responses=inline_serializer('DatabaseHealth', fields={'databases': serializers.DictField()}),
+    )
+    def get(self, request):
+        return Response({'databases': get_database_stats()})
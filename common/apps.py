@@ -6,4 +6,9 @@ class CommonConfig(AppConfig):
     name = 'common'
 
     def ready(self):
-        import common.signals  # noqa
\ No newline at end of file
+        import common.signals  # noqa
+        from common import timing
+        from common.db import querylog, querytags  # noqa
+
+        timing.instrument()
+        querytags.instrument()
@@ -0,0 +1,45 @@
+"""
+Cache backends that report their time to the request timings (`common.timing`)
+and their hits and misses to the Prometheus metrics (`common.metrics`).
+"""
+from django.core.cache.backends import locmem, redis
+from django.core.cache.backends.base import BaseCache
+
+from common import metrics
+from common.timing import timed
+
+TIMED_METHODS = (
+    'add', 'get', 'set', 'touch', 'delete', 'has_key', 'incr', 'decr',
+    'get_many', 'set_many', 'delete_many', 'get_or_set', 'clear',
+)
+
+_MISSING = object()
+
+
+class CacheMetricsMixin:
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        metrics.record_cache_lookup(key, value is not _MISSING)
+        return default if value is _MISSING else value
+
+    def get_many(self, keys, version=None):
+        get_many = super().get_many
+        if get_many.__func__ is BaseCache.get_many:
+            # The default implementation calls get() for every key, which counts them already
+            return get_many(keys, version)
+        keys = list(keys)
+        found = get_many(keys, version)
+        for key in keys:
+            metrics.record_cache_lookup(key, key in found)
+        return found
+
+
+def instrumented_backend(backend_class):
+    base = type(backend_class.__name__, (CacheMetricsMixin, backend_class), {})
+    namespace = {name: timed('cache')(getattr(base, name)) for name in TIMED_METHODS}
+    return type(backend_class.__name__, (base,), namespace)
+
+
+RedisCache = instrumented_backend(redis.RedisCache)
+LocMemCache = instrumented_backend(locmem.LocMemCache)
@@ -0,0 +1,34 @@
+from django.db import connections
+
+
+def get_connection_stats(alias):
+    """
+    Describe how the connections of a database alias are managed in the current worker process.
+
+    For a pooled PostgreSQL connection the psycopg pool counters are included
+    (`pool_size`, `pool_available`, `requests_waiting`, `requests_wait_ms`, `connections_lost`...).
+    """
+    connection = connections[alias]
+    settings_dict = connection.settings_dict
+    stats = {
+        'vendor': connection.vendor,
+        'conn_max_age': settings_dict['CONN_MAX_AGE'],
+        'conn_health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+        'pooled': False,
+    }
+
+    pool = getattr(connection, 'pool', None) if connection.vendor == 'postgresql' else None
+    if pool is not None:
+        stats['pooled'] = True
+        stats['pool'] = {
+            'min_size': pool.min_size,
+            'max_size': pool.max_size,
+            'max_lifetime': pool.max_lifetime,
+            'timeout': pool.timeout,
+            **pool.get_stats(),
+        }
+    return stats
+
+
+def get_database_stats():
+    return {alias: get_connection_stats(alias) for alias in connections}
@@ -0,0 +1,149 @@
+"""
+Execute wrapper installed on every database connection:
+
+- adds the query tags (`common.db.querytags`) to the SQL as an sqlcommenter comment, so the slow
+  query log and `pg_stat_activity` of the server show which view, manager method and serializer sent it;
+- logs the queries slower than `settings.SLOW_QUERY_MS` with their tags and fingerprint;
+- sums the time of every query by fingerprint and writes the top fingerprints to the log every
+  `settings.QUERY_STATS_DUMP_SECONDS` (per process).
+
+The fingerprint is the SQL with literals, placeholders and IN lists normalized, so the same query
+with different parameters has the same fingerprint.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from common.db.querytags import get_tags
+
+logger = logging.getLogger('common.db.queries')
+
+# Fingerprints kept between two dumps, the queries of new fingerprints are not summed beyond that
+MAX_FINGERPRINTS = 1000
+
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDER_RE = re.compile(r'%s|\?')
+VALUES_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=4096)
+def normalize(sql):
+    sql = STRING_RE.sub('?', sql)
+    sql = NUMBER_RE.sub('?', sql)
+    sql = PLACEHOLDER_RE.sub('?', sql)
+    sql = VALUES_LIST_RE.sub('(...)', sql)
+    return WHITESPACE_RE.sub(' ', sql).strip()
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql):
+    return hashlib.sha1(normalize(sql).encode()).hexdigest()[:16]
+
+
+def format_comment(tags):
+    """
+    sqlcommenter format: url-encoded keys and quoted url-encoded values, sorted by key.
+    """
+    return '/*' + ','.join(
+        f"{quote(key, safe='')}='{quote(str(value), safe='/:<>')}'"
+        for key, value in sorted(tags.items()) if value
+    ) + '*/'
+
+
+def add_comment(sql, tags, params):
+    if not tags or '/*' in sql:
+        return sql
+    comment = format_comment(tags)
+    if params is not None:
+        # The driver formats the SQL with the params, `%` of the url-encoding must not be taken for a placeholder
+        comment = comment.replace('%', '%%')
+    return f'{sql} {comment}'
+
+
+class QueryStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.started = time.monotonic()
+
+    def add(self, sql, tags, duration_ms):
+        key = fingerprint(sql)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                if len(self.entries) >= MAX_FINGERPRINTS:
+                    return
+                entry = self.entries[key] = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'sql': sql, 'tags': {}}
+            entry['count'] += 1
+            entry['total_ms'] += duration_ms
+            if duration_ms >= entry['max_ms']:
+                entry['max_ms'] = duration_ms
+                # The tags of the slowest execution
+                entry['tags'] = dict(tags)
+
+    def dump_if_due(self, interval):
+        if not interval or time.monotonic() - self.started < interval:
+            return
+        with self.lock:
+            entries, window = self.entries, time.monotonic() - self.started
+            self.entries, self.started = {}, time.monotonic()
+        self.dump(entries, window)
+
+    @staticmethod
+    def dump(entries, window):
+        top = sorted(entries.items(), key=lambda item: item[1]['total_ms'], reverse=True)
+        for key, entry in top[:settings.QUERY_STATS_TOP]:
+            logger.info(json.dumps({
+                'event': 'query_stats',
+                'window_s': round(window),
+                'fingerprint': key,
+                'count': entry['count'],
+                'total_ms': round(entry['total_ms'], 2),
+                'avg_ms': round(entry['total_ms'] / entry['count'], 2),
+                'max_ms': round(entry['max_ms'], 2),
+                'tags': entry['tags'],
+                'sql': normalize(entry['sql'])[:1000],
+            }))
+
+
+query_stats = QueryStats()
+
+
+def log_query(execute, sql, params, many, context):
+    tags = get_tags()
+    sent_sql = add_comment(sql, tags, params) if settings.QUERY_COMMENTS else sql
+    started = time.perf_counter()
+    try:
+        return execute(sent_sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms >= settings.SLOW_QUERY_MS:
+            logger.warning(json.dumps({
+                'event': 'slow_query',
+                'duration_ms': round(duration_ms, 2),
+                'fingerprint': fingerprint(sql),
+                'tags': tags,
+                'sql': sql[:2000],
+            }))
+        if settings.QUERY_STATS_DUMP_SECONDS:
+            query_stats.add(sql, tags, duration_ms)
+            query_stats.dump_if_due(settings.QUERY_STATS_DUMP_SECONDS)
+
+
+@receiver(connection_created, dispatch_uid='common.install_query_log')
+def install_query_log(sender, connection, **kwargs):
+    # First in the list, so it wraps the wrappers that are added and removed around a block
+    # (`connection.execute_wrapper()` removes the last one)
+    if log_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, log_query)
@@ -0,0 +1,151 @@
+"""
+Attribution of SQL queries to the code that built them.
+
+Tags are kept in a context variable while a request, a queryset or a serializer runs and are added
+to every query as an sqlcommenter-style comment by `common.db.querylog`:
+
+    SELECT ... /*controller='PostListView',origin='PostManager.get_posts_list',route='blog/all/'*/
+
+- `controller`, `route`: the view of the request (`QueryTagsMiddleware`);
+- `task`: the Celery task (`common.signals.celery`);
+- `origin`: the manager method or view method that built the queryset (`@query_origin`);
+- `serializer`: the DRF serializer whose `.data` is being rendered.
+"""
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+
+from django.db import models
+from django.db.models import Prefetch
+
+_tags = ContextVar('query_tags', default=None)
+
+
+def get_tags():
+    return _tags.get() or {}
+
+
+@contextmanager
+def query_tags(**tags):
+    """
+    Add tags to the queries made in the block. Inner blocks override the tags of outer ones.
+    """
+    token = push_tags(**tags)
+    try:
+        yield
+    finally:
+        pop_tags(token)
+
+
+def push_tags(**tags):
+    """
+    Start a tag scope that does not fit a `with` block (e.g. between Celery task signals).
+    """
+    return _tags.set({**get_tags(), **tags})
+
+
+def pop_tags(token):
+    _tags.reset(token)
+
+
+def set_tags(**tags):
+    """
+    Add tags to the current `query_tags()` block, e.g. once the view of the request is known.
+    """
+    current = _tags.get()
+    if current is not None:
+        current.update(tags)
+
+
+class TaggedQuerySet(models.QuerySet):
+    """
+    QuerySet that remembers where it was built (`origin`) and tags its queries with it
+    when it is evaluated, which is usually later and elsewhere (a template, a serializer).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._origin = None
+
+    def tag_origin(self, origin):
+        clone = self._chain()
+        clone._origin = origin
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._origin = self._origin
+        return clone
+
+    def _origin_tags(self):
+        return query_tags(origin=self._origin) if self._origin else nullcontext()
+
+    def _fetch_all(self):
+        if self._result_cache is None:
+            with self._origin_tags():
+                super()._fetch_all()
+        else:
+            super()._fetch_all()
+
+    def count(self):
+        with self._origin_tags():
+            return super().count()
+
+    def exists(self):
+        with self._origin_tags():
+            return super().exists()
+
+    def aggregate(self, *args, **kwargs):
+        with self._origin_tags():
+            return super().aggregate(*args, **kwargs)
+
+    def update(self, **kwargs):
+        with self._origin_tags():
+            return super().update(**kwargs)
+
+    def delete(self):
+        with self._origin_tags():
+            return super().delete()
+
+
+class TaggedManager(models.Manager.from_queryset(TaggedQuerySet)):
+    pass
+
+
+def query_origin(method):
+    """
+    Tag the queryset (or the queryset of the `Prefetch`) returned by `method` with its qualified name.
+    Querysets of models without a `TaggedManager` are returned unchanged.
+    """
+    origin = method.__qualname__
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        result = method(*args, **kwargs)
+        if isinstance(result, TaggedQuerySet):
+            return result.tag_origin(origin)
+        if isinstance(result, Prefetch) and isinstance(result.queryset, TaggedQuerySet):
+            result.queryset = result.queryset.tag_origin(origin)
+        return result
+
+    return wrapper
+
+
+def instrument():
+    """
+    Tag the queries made while a DRF serializer renders `.data` (lazy relations, prefetches)
+    with the serializer. Called once from `CommonConfig.ready`.
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    data = BaseSerializer.data.fget
+    if getattr(data, 'query_tags', False):
+        return
+
+    @wraps(data)
+    def tagged_data(self):
+        with query_tags(serializer=type(getattr(self, 'child', self)).__name__):
+            return data(self)
+
+    tagged_data.query_tags = True
+    BaseSerializer.data = property(tagged_data)
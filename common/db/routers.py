@@ -0,0 +1,53 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Set by `ReplicaRoutingMiddleware` for the duration of a request that may read from a replica.
+# Outside of such a request (writes, admin, management commands, celery, shell) every query
+# goes to the primary.
+replica_reads_allowed = ContextVar('replica_reads_allowed', default=False)
+
+
+@contextmanager
+def use_replicas(allowed=True):
+    token = replica_reads_allowed.set(allowed)
+    try:
+        yield
+    finally:
+        replica_reads_allowed.reset(token)
+
+
+def use_primary():
+    """
+    Force reads to the primary, e.g. in a view that has to see a row it has just written.
+    """
+    return use_replicas(False)
+
+
+class PrimaryReplicaRouter:
+    """
+    Send reads to a random replica from `settings.DATABASE_REPLICAS` when replica reads are allowed
+    for the current context, and everything else to the primary (`default`).
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or not replica_reads_allowed.get():
+            return DEFAULT_DB_ALIAS
+        # Reads inside a transaction on the primary must see its uncommitted changes.
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,19 @@
+from django.db.models import IntegerField, Subquery
+
+
+class SubqueryCount(Subquery):
+    """
+    Counts the rows of a correlated subquery.
+
+    Unlike `Count()` over a reverse relation, this does not join the related table into
+    the outer query, so several counters can be annotated on the same queryset without
+    multiplying rows or requiring GROUP BY over the whole table.
+
+    Usage:
+        Author.objects.annotate(posts_count=SubqueryCount(Post.objects.filter(author=OuterRef('pk'))))
+    """
+    template = '(SELECT COUNT(*) FROM (%(subquery)s) _count)'
+    output_field = IntegerField()
+
+    def __init__(self, queryset, **extra):
+        super().__init__(queryset.order_by().values('pk'), **extra)
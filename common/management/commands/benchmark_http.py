@@ -0,0 +1,126 @@
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = (
+    '/blog/all/',
+    '/api/post/',
+    '/api/category/',
+)
+
+
+def process_tree_rss(pid: int) -> int:
+    """
+    Return the resident memory (in bytes) of a process and all of its descendants.
+    Linux only: the values are read from /proc.
+    """
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        status = Path(f'/proc/{current}/status')
+        if not status.exists():
+            continue
+        for line in status.read_text().splitlines():
+            if line.startswith('VmRSS:'):
+                total += int(line.split()[1]) * 1024
+                break
+        for task in Path(f'/proc/{current}/task').iterdir():
+            children = (task / 'children').read_text().split()
+            pending.extend(int(child) for child in children)
+    return total
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests a running server with concurrent GET requests and reports throughput and latency. "
+        "Run it against the WSGI and the ASGI deployment with the same worker memory budget "
+        "(pass --server-pid to report the memory of the server process tree) to compare them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Path to request, can be repeated. Requests are spread across the paths evenly.')
+        parser.add_argument('--concurrency', type=int, default=20, help='Number of concurrent clients.')
+        parser.add_argument('--duration', type=float, default=30, help='Test duration in seconds.')
+        parser.add_argument('--timeout', type=float, default=10, help='Timeout of a single request in seconds.')
+        parser.add_argument('--server-pid', type=int, help='PID of the server master process (gunicorn).')
+        parser.add_argument('--header', action='append', dest='headers', default=[],
+                            help='Extra request header as "Name: value", can be repeated.')
+        parser.add_argument('--stats-path',
+                            help='JSON endpoint fetched (with the same headers) and printed after the run, '
+                                 'e.g. /api/health/db/ to see the connection pool counters.')
+
+    @staticmethod
+    def parse_headers(headers):
+        parsed = {}
+        for header in headers:
+            name, separator, value = header.partition(':')
+            if not separator or not name.strip():
+                raise CommandError(f'Invalid header {header!r}, expected "Name: value".')
+            parsed[name.strip()] = value.strip()
+        return parsed
+
+    def handle(self, *args, **options):
+        base_url = options['base_url'].rstrip('/')
+        urls = [base_url + path for path in (options['paths'] or DEFAULT_PATHS)]
+        headers = self.parse_headers(options['headers'])
+        deadline = time.monotonic() + options['duration']
+
+        def client(index):
+            latencies, errors = [], 0
+            request_number = index
+            while time.monotonic() < deadline:
+                url = urls[request_number % len(urls)]
+                request_number += 1
+                started = time.perf_counter()
+                try:
+                    with urlopen(Request(url, headers=headers), timeout=options['timeout']) as response:
+                        response.read()
+                except (URLError, OSError):
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+            return latencies, errors
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            results = list(executor.map(client, range(options['concurrency'])))
+        elapsed = time.monotonic() - started
+
+        latencies = sorted(latency for client_latencies, _ in results for latency in client_latencies)
+        errors = sum(client_errors for _, client_errors in results)
+        if not latencies:
+            raise CommandError(f'No successful requests to {base_url} ({errors} errors).')
+
+        throughput = len(latencies) / elapsed
+        percentiles = statistics.quantiles(latencies, n=100)
+
+        self.stdout.write(f'Requests:    {len(latencies)} ok, {errors} failed in {elapsed:.1f}s')
+        self.stdout.write(f'Throughput:  {throughput:.1f} req/s')
+        self.stdout.write(
+            f'Latency:     p50 {percentiles[49] * 1000:.1f} ms, '
+            f'p95 {percentiles[94] * 1000:.1f} ms, '
+            f'p99 {percentiles[98] * 1000:.1f} ms'
+        )
+
+        if options['server_pid']:
+            rss = process_tree_rss(options['server_pid'])
+            self.stdout.write(f'Server RSS:  {rss / 1024 ** 2:.1f} MiB')
+            self.stdout.write(f'Efficiency:  {throughput / (rss / 1024 ** 3):.1f} req/s per GiB of server memory')
+
+        if options['stats_path']:
+            try:
+                with urlopen(Request(base_url + options['stats_path'], headers=headers),
+                             timeout=options['timeout']) as response:
+                    stats = json.load(response)
+            except (URLError, OSError, ValueError) as error:
+                raise CommandError(f'Could not fetch {options["stats_path"]}: {error}')
+            self.stdout.write(f'Stats:       {json.dumps(stats, indent=2)}')
@@ -0,0 +1,94 @@
+import io
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import Resolver404, resolve, reverse
+from rest_framework import parsers, renderers
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from blog.models import Author
+from common.parsers import ORJSONParser
+from common.renderers import ORJSONRenderer
+
+User = get_user_model()
+
+
+def get_default_paths():
+    """
+    The post list with a large page and the full profile of the first author.
+    """
+    paths = [reverse('api:post-list') + '?limit=100']
+    user_id = Author.objects.order_by('pk').values_list('user_id', flat=True).first()
+    if user_id is not None:
+        paths.append(reverse('api:user-profile-full', kwargs={'pk': user_id}))
+    return paths
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders the responses of API endpoints with the stdlib JSON renderer of DRF and with the orjson one, "
+        "checks that both decode to the same data and reports the rendering and parsing time of both. "
+        "The views are run in-process once, only the JSON encoding and decoding are timed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='API path to render, can be repeated. '
+                                 'By default the post list (100 posts) and the full profile of the first author.')
+        parser.add_argument('--repeat', type=int, default=50, help='Number of timed runs per renderer.')
+        parser.add_argument('--user', help='Username of the request user, anonymous by default.')
+        parser.add_argument('--host', default='127.0.0.1', help='Host of the requests, must be in ALLOWED_HOSTS.')
+
+    def get_response_data(self, path, user, host):
+        try:
+            match = resolve(urlsplit(path).path)
+        except Resolver404:
+            raise CommandError(f'{path} does not match any URL.')
+        request = APIRequestFactory().get(path, HTTP_HOST=host)
+        if user is not None:
+            force_authenticate(request, user=user)
+        response = match.func(request, *match.args, **match.kwargs)
+        if response.status_code != 200 or getattr(response, 'data', None) is None:
+            raise CommandError(f'{path} returned {response.status_code}.')
+        return response.data
+
+    @staticmethod
+    def measure(func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f'User {options["user"]!r} does not exist.')
+
+        stdlib_renderer, orjson_renderer = renderers.JSONRenderer(), ORJSONRenderer()
+        stdlib_parser, orjson_parser = parsers.JSONParser(), ORJSONParser()
+        repeat = options['repeat']
+
+        for path in options['paths'] or get_default_paths():
+            data = self.get_response_data(path, user, options['host'])
+            content = stdlib_renderer.render(data)
+            if json.loads(orjson_renderer.render(data)) != json.loads(content):
+                raise CommandError(f'The orjson rendering of {path} differs.')
+
+            rendering = [self.measure(lambda: renderer.render(data), repeat)
+                         for renderer in (stdlib_renderer, orjson_renderer)]
+            parsing = [self.measure(lambda: parser.parse(io.BytesIO(content)), repeat)
+                       for parser in (stdlib_parser, orjson_parser)]
+            self.stdout.write(f'{path} ({len(content) / 1024:.1f} KiB)')
+            for name, (stdlib, fast) in (('render', rendering), ('parse', parsing)):
+                self.stdout.write(
+                    f'  {name}: stdlib {stdlib * 1000:.3f} ms, orjson {fast * 1000:.3f} ms ({stdlib / fast:.1f}x)'
+                )
@@ -0,0 +1,153 @@
+"""
+Prometheus metrics, exported by `api:metrics`.
+
+With `PROMETHEUS_MULTIPROC_DIR` set, every process (gunicorn workers, Celery pool processes) writes its
+samples to files in that directory and the endpoint sums them, so a scrape sees all the workers, not
+only the one that answered it. The files are named after the host and the pid, so the web and the
+Celery containers can share the directory. Every container deletes the files of its host when it starts
+(`remove_host_files`), the compose files give the services fixed host names for that.
+"""
+import logging
+import os
+import socket
+from pathlib import Path
+
+from django.conf import settings
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, multiprocess, values
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+from blog import constants as blog_const
+
+logger = logging.getLogger(__name__)
+
+MULTIPROCESS = 'PROMETHEUS_MULTIPROC_DIR' in os.environ
+
+
+def get_process_identifier(pid=None):
+    return f'{socket.gethostname()}_{pid or os.getpid()}'
+
+
+if MULTIPROCESS:
+    values.ValueClass = values.MultiProcessValue(process_identifier=get_process_identifier)
+
+# Cache key prefix: `family` label of the cache metrics, other keys are counted as `other`
+CACHE_KEY_FAMILIES = {
+    blog_const.CATEGORY_CACHE_KEY: 'categories',
+    'views.decorators.cache.': 'responses',
+    'feed:': 'feeds',
+    blog_const.COMMENT_FRAGMENT_CACHE_PREFIX: 'comment_fragments',
+    'use_primary:': 'replica_stickiness',
+}
+# Tasks whose duration is recorded
+CELERY_TASK_PREFIXES = ('common.tasks.image.', 'users.tasks.process_avatar')
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Time spent processing a request.',
+    ['method', 'route', 'status'],
+)
+REQUEST_DB_QUERIES = Histogram(
+    'http_request_db_queries', 'Database queries made by a request.',
+    ['route'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, float('inf')),
+)
+CACHE_LOOKUPS = Counter(
+    'cache_lookups', 'Cache reads by key family and result (hit or miss).',
+    ['family', 'result'],
+)
+CELERY_TASK_LATENCY = Histogram(
+    'celery_task_duration_seconds', 'Time spent running a task.',
+    ['task', 'state'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, float('inf')),
+)
+
+
+def get_route(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.route or match.view_name
+
+
+def observe_request(request, response, timings):
+    route = get_route(request)
+    status = f'{response.status_code // 100}xx'
+    REQUEST_LATENCY.labels(request.method, route, status).observe(timings.total)
+    REQUEST_DB_QUERIES.labels(route).observe(timings.counts['db'])
+
+
+def get_cache_family(key):
+    for prefix, family in CACHE_KEY_FAMILIES.items():
+        if key.startswith(prefix):
+            return family
+    return 'other'
+
+
+def record_cache_lookup(key, hit):
+    CACHE_LOOKUPS.labels(get_cache_family(str(key)), 'hit' if hit else 'miss').inc()
+
+
+def observe_task(task_name, state, duration):
+    if task_name.startswith(CELERY_TASK_PREFIXES):
+        CELERY_TASK_LATENCY.labels(task_name, state).observe(duration)
+
+
+class CeleryQueueCollector:
+    """
+    Number of messages waiting in the Celery queues of `settings.METRICS_CELERY_QUEUES`,
+    asked from the broker at scrape time.
+    """
+
+    def describe(self):
+        # Without it the registry calls collect() on registration, which would connect to the broker
+        # when this module is imported
+        return []
+
+    def collect(self):
+        queues = settings.METRICS_CELERY_QUEUES
+        if not queues:
+            return
+        from config.celery import app
+
+        depth = GaugeMetricFamily('celery_queue_length', 'Messages waiting in a Celery queue.', labels=['queue'])
+        try:
+            with app.connection_for_read(connect_timeout=2) as connection:
+                channel = connection.default_channel
+                for queue in queues:
+                    depth.add_metric([queue], channel.queue_declare(queue=queue, passive=True).message_count)
+        except Exception:
+            logger.warning('Could not read the Celery queue lengths', exc_info=True)
+            return
+        yield depth
+
+
+def remove_host_files():
+    """
+    Delete the files of the earlier processes of this host, left by the previous run of the container.
+    Called by the gunicorn master (`config/gunicorn.py`) and the Celery worker before they start their processes.
+    """
+    if not MULTIPROCESS:
+        return
+    for path in Path(os.environ['PROMETHEUS_MULTIPROC_DIR']).glob(f'*_{socket.gethostname()}_*.db'):
+        path.unlink(missing_ok=True)
+
+
+def mark_process_dead(pid):
+    """
+    Drop the live gauges of an exited worker process, its counters and histograms are kept in the totals.
+    """
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(get_process_identifier(pid))
+
+
+def get_registry():
+    if not MULTIPROCESS:
+        return REGISTRY
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    registry.register(CeleryQueueCollector())
+    return registry
+
+
+if not MULTIPROCESS:
+    REGISTRY.register(CeleryQueueCollector())
@@ -0,0 +1,144 @@
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+
+from common.db.querytags import query_tags, set_tags
+from common.db.routers import use_primary, use_replicas
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Middleware to decide whether the queries of a request may be served by a read replica.
+
+    Only safe requests read from replicas. A client that has just written something reads from the
+    primary for `settings.DATABASE_PRIMARY_STICKY_SECONDS`, so it sees its own vote, comment,
+    favorite or subscription despite the replication lag. The client is recognized by a cookie
+    (browser sessions) and, for API clients that do not keep cookies, by a cache marker
+    keyed on their Authorization header. Admin requests always use the primary.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with use_replicas(self.replica_reads_allowed(request)):
+            response = self.get_response(request)
+        self.process_write(request, response)
+        return response
+
+    async def __acall__(self, request):
+        # asgiref copies the context into the threads that run sync code, so the flag is visible there.
+        with use_replicas(await self.areplica_reads_allowed(request)):
+            response = await self.get_response(request)
+        await self.aprocess_write(request, response)
+        return response
+
+    def may_read_from_replica(self, request):
+        """
+        The checks that need no cache lookup, see `replica_reads_allowed`.
+        """
+        if not settings.DATABASE_REPLICAS or request.method not in SAFE_METHODS:
+            return False
+        if request.path.startswith(reverse('admin:index')):
+            return False
+        return settings.DATABASE_PRIMARY_STICKY_COOKIE not in request.COOKIES
+
+    def replica_reads_allowed(self, request):
+        if not self.may_read_from_replica(request):
+            return False
+        marker = self.get_sticky_marker(request)
+        return marker is None or not cache.get(marker)
+
+    async def areplica_reads_allowed(self, request):
+        if not self.may_read_from_replica(request):
+            return False
+        marker = self.get_sticky_marker(request)
+        return marker is None or not await cache.aget(marker)
+
+    def stick_to_primary(self, request, response):
+        """
+        Set the sticky cookie after a write. Returns the cache marker the caller sets for the API clients,
+        None when there is none to set.
+        """
+        if not settings.DATABASE_REPLICAS or response.status_code >= 400:
+            return None
+        if request.method in SAFE_METHODS and not getattr(request, 'writes_to_database', False):
+            return None
+        response.set_cookie(settings.DATABASE_PRIMARY_STICKY_COOKIE, '1',
+                            max_age=settings.DATABASE_PRIMARY_STICKY_SECONDS,
+                            httponly=True, samesite='Lax', secure=settings.SESSION_COOKIE_SECURE)
+        return self.get_sticky_marker(request)
+
+    def process_write(self, request, response):
+        marker = self.stick_to_primary(request, response)
+        if marker is not None:
+            cache.set(marker, True, settings.DATABASE_PRIMARY_STICKY_SECONDS)
+
+    async def aprocess_write(self, request, response):
+        marker = self.stick_to_primary(request, response)
+        if marker is not None:
+            await cache.aset(marker, True, settings.DATABASE_PRIMARY_STICKY_SECONDS)
+
+    @staticmethod
+    def get_sticky_marker(request):
+        authorization = request.headers.get('Authorization')
+        if not authorization:
+            return None
+        return 'use_primary:' + hashlib.sha256(authorization.encode()).hexdigest()
+
+
+def writes_to_database(view_func):
+    """
+    Mark a view that writes even when it is called with a safe method (e.g. a vote link),
+    so it reads from the primary and the client sticks to the primary afterwards.
+    """
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        request.writes_to_database = True
+        with use_primary():
+            return view_func(request, *args, **kwargs)
+
+    return wrapper
+
+
+class QueryTagsMiddleware:
+    """
+    Middleware to tag the SQL queries of a request with its view (`controller`) and URL pattern (`route`),
+    see `common.db.querytags`.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with query_tags():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with query_tags():
+            return await self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, 'view_class', view_func)
+        set_tags(controller=view.__name__, route=request.resolver_match.route)
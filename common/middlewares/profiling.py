@@ -0,0 +1,98 @@
+import cProfile
+import io
+import marshal
+import pstats
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from common.models import RequestProfile
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY_PARAM = '_profile'
+# Functions listed in `RequestProfile.summary`
+SUMMARY_LINES = 40
+
+
+class ProfilingMiddleware:
+    """
+    Middleware to run requests under cProfile and store the result as a `RequestProfile`.
+
+    A request is profiled when a staff user asks for it (the `X-Profile: 1` header or the `?_profile=1`
+    query parameter, with a session or a JWT) or when it is picked by `settings.PROFILING_SAMPLE_RATE`.
+    The profile id is returned in the `X-Profile-Id` header, the profiles are browsed in the admin.
+
+    With `settings.PROFILING_ENABLED = False` the middleware removes itself from the chain at startup.
+    The profiler covers the thread that handles the request, so it is meant for sync (WSGI) views.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - started
+
+        profile = self.save_profile(request, response, profiler, duration)
+        response['X-Profile-Id'] = profile.request_id
+        return response
+
+    def should_profile(self, request):
+        if request.headers.get(PROFILE_HEADER) == '1' or request.GET.get(PROFILE_QUERY_PARAM) == '1':
+            return self.get_staff_user(request) is not None
+        sample_rate = settings.PROFILING_SAMPLE_RATE
+        return sample_rate > 0 and random.random() < sample_rate
+
+    @staticmethod
+    def get_staff_user(request):
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            # API clients are authenticated by DRF in the view, check their token here
+            try:
+                user, _ = JWTAuthentication().authenticate(request) or (None, None)
+            except APIException:
+                return None
+        return user if user is not None and user.is_staff else None
+
+    @staticmethod
+    def save_profile(request, response, profiler, duration):
+        summary = io.StringIO()
+        stats = pstats.Stats(profiler, stream=summary)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_LINES)
+
+        match = request.resolver_match
+        user = getattr(request, 'user', None)
+        profile = RequestProfile.objects.create(
+            request_id=uuid.uuid4().hex,
+            method=request.method,
+            path=request.get_full_path()[:2000],
+            view_name=match.view_name if match else '',
+            status_code=response.status_code,
+            duration_ms=duration * 1000,
+            user=user if user is not None and user.is_authenticated else None,
+            summary=summary.getvalue(),
+            stats=marshal.dumps(stats.stats),
+        )
+        # Keep the latest PROFILING_MAX_PROFILES profiles
+        oldest_kept = RequestProfile.objects.order_by('-pk').values_list('pk', flat=True)[
+            settings.PROFILING_MAX_PROFILES - 1:settings.PROFILING_MAX_PROFILES
+        ].first()
+        if oldest_kept is not None:
+            RequestProfile.objects.filter(pk__lt=oldest_kept).delete()
+        return profile
@@ -0,0 +1,65 @@
+import json
+import logging
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from common import metrics, timing
+
+logger = logging.getLogger('common.timing')
+
+
+class ServerTimingMiddleware:
+    """
+    Middleware to report where the time of a request went: database (time and number of queries),
+    cache, DRF serialization and template rendering.
+
+    Staff users and a sample of the other requests (`settings.SERVER_TIMING_SAMPLE_RATE`) get the
+    breakdown in the `Server-Timing` header, which the browser dev tools show next to the request.
+    The other requests are written to the `common.timing` logger as one JSON line.
+    The latency and the number of queries of every request are also added to the Prometheus metrics.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with timing.collect() as timings:
+            response = self.get_response(request)
+        self.report(request, response, timings)
+        return response
+
+    async def __acall__(self, request):
+        with timing.collect() as timings:
+            response = await self.get_response(request)
+        self.report(request, response, timings)
+        return response
+
+    def report(self, request, response, timings):
+        metrics.observe_request(request, response, timings)
+        if self.show_header(request):
+            response['Server-Timing'] = timings.server_timing()
+        elif logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                **timings.as_dict(),
+            }))
+
+    @staticmethod
+    def show_header(request):
+        # DRF puts the user it authenticated (e.g. by JWT) on the Django request as well
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_staff:
+            return True
+        sample_rate = settings.SERVER_TIMING_SAMPLE_RATE
+        return sample_rate > 0 and random.random() < sample_rate
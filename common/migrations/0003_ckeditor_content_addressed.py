@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:55
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_references(apps, schema_editor):
+    images = apps.get_model('common', 'CKEditorPostImages')
+    references = (
+        images.posts.through.objects.filter(ckeditorpostimages=OuterRef('pk'))
+        .values('ckeditorpostimages').annotate(count=Count('*')).values('count')
+    )
+    images.objects.using(schema_editor.connection.alias).update(ref_count=Coalesce(Subquery(references), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0002_request_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ckeditorpostimages',
+            name='digest',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='ckeditorpostimages',
+            name='ref_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='ckeditorpostimages',
+            name='uploaded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(count_references, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,210 @@
+from django.conf import settings
 from django.contrib import admin
-from django.core.exceptions import ValidationError
+from django.contrib.admin.views.main import ChangeList, PAGE_VAR
+from django.core.exceptions import ValidationError, FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+CURSOR_VAR = 'cursor'
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Paginator that avoids an exact COUNT(*) on large unfiltered tables.
+
+    On PostgreSQL the number of rows is taken from the planner statistics (`pg_class.reltuples`).
+    The estimate is used only when the queryset is not filtered and the table is larger than
+    `settings.ADMIN_APPROXIMATE_COUNT_THRESHOLD`; otherwise the exact count is returned.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = self.get_estimated_count()
+        if estimate is not None and estimate >= settings.ADMIN_APPROXIMATE_COUNT_THRESHOLD:
+            return estimate
+        return super().count
+
+    def get_estimated_count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet) or queryset.query.where or queryset.query.distinct:
+            return None
+
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+
+        # reltuples is -1 for tables that have never been vacuumed or analyzed
+        if not row or row[0] < 0:
+            return None
+        return int(row[0])
+
+
+class ExtendedChangeList(ChangeList):
+    """
+    ChangeList that lets the model admin narrow the final changelist queryset
+    (after filters, search, ordering and `select_related` have been applied).
+    """
+
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        return self.model_admin.get_changelist_queryset(request, queryset)
+
+
+class KeysetChangeList(ExtendedChangeList):
+    """
+    ChangeList that pages through the results with a keyset (seek) condition.
+
+    The `cursor` query parameter holds the primary key of the last row of the previous page.
+    The ordering values of that row are read with a single lookup by primary key and turned
+    into a "row comes after" condition, so deep pages cost the same as the first one instead
+    of scanning and discarding OFFSET rows. Orderings that cannot be expressed as plain field
+    lookups fall back to the regular page-number pagination.
+    """
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Changing sorting or filters should start from the first page again.
+        new_params = new_params or {}
+        remove = list(remove or [])
+        if CURSOR_VAR not in new_params:
+            remove.append(CURSOR_VAR)
+        return super().get_query_string(new_params, remove)
+
+    def get_results(self, request):
+        super().get_results(request)
+
+        self.keyset_ordering = self.get_keyset_ordering(request)
+        cursor = request.GET.get(CURSOR_VAR)
+        if not cursor or self.keyset_ordering is None or self.show_all:
+            return
+
+        keyset_filter = self.get_keyset_filter(cursor)
+        if keyset_filter is not None:
+            self.result_list = self.queryset.filter(keyset_filter)[:self.list_per_page]
+
+    def get_keyset_ordering(self, request):
+        ordering = self.get_ordering(request, self.queryset)
+        if not all(isinstance(field, str) and not field.startswith('?') for field in ordering):
+            return None
+        return ordering
+
+    def get_keyset_filter(self, cursor):
+        """
+        Build a lexicographic "after the cursor row" condition for the current ordering.
+        """
+        names = [field.lstrip('-') for field in self.keyset_ordering]
+        try:
+            values = self.queryset.filter(pk=cursor).values(*names).first()
+        except (ValidationError, ValueError):
+            return None
+        if values is None or any(value is None for value in values.values()):
+            return None
+
+        keyset_filter = Q()
+        equal = {}
+        for field, name in zip(self.keyset_ordering, names):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            keyset_filter |= Q(**equal, **{f'{name}__{lookup}': values[name]})
+            equal[name] = values[name]
+        return keyset_filter
+
+    @cached_property
+    def next_cursor(self):
+        if self.keyset_ordering is None:
+            return None
+        rows = list(self.result_list)
+        if len(rows) < self.list_per_page:
+            return None
+        return rows[-1].pk
+
+    @property
+    def next_page_url(self):
+        if self.next_cursor is None:
+            return None
+        return self.get_query_string({CURSOR_VAR: self.next_cursor}, [PAGE_VAR])
+
+    @property
+    def first_page_url(self):
+        return self.get_query_string(remove=[PAGE_VAR])
 
 
 class ExtendedModelAdmin(admin.ModelAdmin):
+    """
+    ModelAdmin tuned for large tables.
+
+    - The changelist counts rows with `ApproximateCountPaginator` and skips the second,
+      unfiltered COUNT(*) (`show_full_result_count`).
+    - Only the columns needed by `list_display` are selected (see `get_list_only_fields`).
+    - `keyset_pagination = True` switches the changelist to `KeysetChangeList`.
+    """
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+    keyset_pagination = False
+    keyset_change_list_template = 'admin/keyset_change_list.html'
+
+    # Model fields used by `list_display` callables, which can not be derived automatically
+    list_only_extra = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.keyset_pagination and not self.change_list_template:
+            self.change_list_template = self.keyset_change_list_template
+
+    def get_changelist(self, request, **kwargs):
+        if self.keyset_pagination:
+            return KeysetChangeList
+        return ExtendedChangeList
+
+    def get_list_only_fields(self, request, queryset):
+        """
+        Derive the set of columns loaded by the changelist.
+
+        Includes the primary key, concrete model fields listed in `list_display`,
+        `list_only_extra` and the relations followed by `select_related()`.
+        Returns None if the set cannot be derived safely.
+        """
+        select_related = queryset.query.select_related
+        if select_related is True:
+            return None
+
+        opts = self.model._meta
+        fields = {opts.pk.name, *self.list_only_extra}
+        if select_related:
+            fields.update(select_related)
+
+        for name in self.get_list_display(request):
+            if not isinstance(name, str):
+                continue
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete:
+                fields.add(field.name)
+
+        return sorted(fields)
+
+    def get_changelist_queryset(self, request, queryset):
+        """
+        Restrict the changelist queryset to the columns returned by `get_list_only_fields`.
+        """
+        only_fields = self.get_list_only_fields(request, queryset)
+        if only_fields is None:
+            return queryset
+        return queryset.only(*only_fields)
 
     def get_object_queryset(self, request):
         """
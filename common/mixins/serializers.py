@@ -1,9 +1,58 @@
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 
 
 class TruncateTextSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        if hasattr(instance, 'text'):
+        if 'text' in representation:
             representation['text'] = instance.text[:100]
         return representation
+
+
+def is_requested(fields, *names):
+    """
+    Whether any of the serializer fields `names` is in the sparse fieldset `fields` (None - all fields).
+    """
+    return fields is None or not fields.isdisjoint(names)
+
+
+class SparseFieldsMixin:
+    # Serializer mixin for sparse fieldsets: only the fields named in `context['sparse_fields']`
+    # (set by `common.mixins.views.SparseFieldsViewMixin`) are kept.
+    # Only the serializer of the response is pruned (or the child of its list serializer),
+    # nested serializers sharing the context keep all their fields.
+    # Not a docstring, drf-spectacular would show it as the description of every serializer schema.
+
+    def get_fields(self):
+        fields = super().get_fields()
+        sparse_fields = self.context.get('sparse_fields')
+        if sparse_fields is not None and self.is_response_serializer():
+            fields = {name: field for name, field in fields.items() if name in sparse_fields}
+        return fields
+
+    def is_response_serializer(self):
+        parent = getattr(self, 'parent', None)
+        if isinstance(parent, serializers.ListSerializer):
+            parent = getattr(parent, 'parent', None)
+        return parent is None
+
+
+class URLTemplate:
+    """
+    Absolute URL of a view that takes a single `pk`, reversed once and then formatted for every object.
+
+    Produces the same URLs as `HyperlinkedRelatedField` (DRF `reverse`, so versioning and format suffixes
+    are kept) without resolving the URL pattern again for each row of a list. Without a request the URL
+    is relative. The other arguments of the URL are fixed with `kwargs`, the varying one is `pk_kwarg`.
+    """
+    # A pk that cannot occur in the rest of the URL
+    MARKER = '2147483647'
+
+    def __init__(self, view_name, request, format=None, pk_kwarg='pk', **kwargs):
+        kwargs[pk_kwarg] = self.MARKER
+        url = reverse(view_name, kwargs=kwargs, request=request, format=format)
+        self.prefix, _, self.suffix = url.rpartition(self.MARKER)
+
+    def __call__(self, pk):
+        return f'{self.prefix}{pk}{self.suffix}'
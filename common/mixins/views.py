@@ -1,6 +1,18 @@
+import hashlib
 from collections import defaultdict
+from datetime import datetime
+from functools import cache
 
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.utils.functional import cached_property
+from django.utils.translation import gettext as _
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
 from rest_framework.mixins import CreateModelMixin, DestroyModelMixin, UpdateModelMixin, ListModelMixin
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.viewsets import GenericViewSet
 
 
@@ -28,6 +40,131 @@ class ExtendedView:
         return self.multi_serializer_class.get(action) or self.serializer_class
 
 
+sparse_fields_parameters = [
+    OpenApiParameter('fields', str, required=False,
+                     description='Comma-separated fields to return, e.g. `id,title,url`. All fields by default.'),
+    OpenApiParameter('omit', str, required=False,
+                     description='Comma-separated fields to leave out, e.g. `text,author_profile`.'),
+]
+
+
+@cache
+def get_readable_field_names(serializer_class):
+    return tuple(name for name, field in serializer_class().fields.items() if not field.write_only)
+
+
+def split_query_param(value):
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+class SparseFieldsViewMixin:
+    """
+    Sparse fieldsets for the read requests: `?fields=id,title` returns only the listed fields of the serializer,
+    `?omit=text` all the fields but the listed ones. The serializer needs `SparseFieldsMixin`.
+
+    `get_queryset()` can narrow the SQL with `get_query_fields()`: the fields that will be read,
+    so the joins, annotations and columns of the others can be left out.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    @cached_property
+    def sparse_fields(self):
+        """
+        Names of the requested fields, None when all fields are returned.
+        """
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return None
+        fields = split_query_param(self.request.query_params.get(self.fields_query_param))
+        omit = split_query_param(self.request.query_params.get(self.omit_query_param))
+        if not fields and not omit:
+            return None
+
+        available = get_readable_field_names(self.get_serializer_class())
+        unknown = (fields | omit).difference(available)
+        if unknown:
+            raise ValidationError({
+                self.fields_query_param: f'Unknown fields: {", ".join(sorted(unknown))}. '
+                                         f'Available: {", ".join(available)}.'
+            })
+        return frozenset(name for name in available if (not fields or name in fields) and name not in omit)
+
+    def get_query_fields(self):
+        """
+        The requested fields and the ones the ordering needs, None for all fields.
+        """
+        if self.sparse_fields is None:
+            return None
+        ordering = split_query_param(self.request.query_params.get('ordering'))
+        return self.sparse_fields | {name.removeprefix('-') for name in ordering}
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['sparse_fields'] = self.sparse_fields
+        return context
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET: the ETag and Last-Modified of the response are built from a cheap lookup of
+    the columns the representation changes with (`get_validators_queryset()`), typically the content
+    version of `common.models.mixins.ContentVersionMixin` and the modification times.
+    A request whose `If-None-Match` or `If-Modified-Since` still matches gets 304 Not Modified before
+    the object is loaded and serialized.
+
+    The ETag also covers the request user and the response format, both change the representation.
+    DRF viewsets wrap their actions with `conditional_get(super().retrieve, ...)`.
+    """
+    validators_model = None
+    validators_fields = ('content_version', 'content_changed_at')
+    validators_url_kwarg = 'pk'
+    validators = None
+
+    def get_validators_queryset(self):
+        """
+        `values_list()` queryset of the row of validator columns (at least one datetime).
+        """
+        return self.validators_model.objects.filter(
+            pk=self.kwargs[self.validators_url_kwarg]
+        ).values_list(*self.validators_fields)
+
+    def check_not_modified(self, request, row):
+        """
+        The 304 response when the validators of `row` match the request. The missing objects are left
+        to the view (404).
+        """
+        if row is None:
+            return None
+        renderer = getattr(request, 'accepted_renderer', None)
+        key = ':'.join(str(value) for value in (*row, request.user.pk, getattr(renderer, 'format', 'html')))
+        etag = quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+        last_modified = int(max(value for value in row if isinstance(value, datetime)).timestamp())
+        self.validators = etag, last_modified
+        return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+    def set_validators(self, response):
+        if self.validators is not None and response.status_code == 200:
+            etag, last_modified = self.validators
+            response.headers.setdefault('ETag', etag)
+            response.headers.setdefault('Last-Modified', http_date(last_modified))
+        return response
+
+    def conditional_get(self, handler, request, *args, **kwargs):
+        response = self.check_not_modified(request, self.get_validators_queryset().first())
+        if response is None:
+            response = self.set_validators(handler(request, *args, **kwargs))
+        return response
+
+    async def aconditional_get(self, handler, request, *args, **kwargs):
+        response = self.check_not_modified(request, await self.get_validators_queryset().afirst())
+        if response is None:
+            response = self.set_validators(await handler(request, *args, **kwargs))
+        return response
+
+    def get(self, request, *args, **kwargs):
+        return self.conditional_get(super().get, request, *args, **kwargs)
+
+
 class CUDLViewSet(GenericViewSet, CreateModelMixin, UpdateModelMixin, DestroyModelMixin, ListModelMixin):
     ...
 
@@ -69,3 +206,83 @@ class CommentTreeMixin:
         # Return the list of root comments (comments with no parent)
         root_comments = parent_comments[None]
         return root_comments
+
+
+class AsyncViewMixin:
+    """
+    Base for the async variants of read-only class-based views.
+
+    `request.user` is lazy and loading it touches the session and the database,
+    so it is resolved once with `request.auser()` before the handler runs.
+    """
+
+    async def resolve_user(self, request):
+        request.user = await request.auser()
+
+
+class AsyncMultipleObjectMixin(AsyncViewMixin):
+    """
+    Async counterpart of MultipleObjectMixin pagination and context building.
+
+    The page is counted and fetched with the async ORM, so templates receive
+    a materialized object list instead of a lazy queryset.
+    """
+
+    async def apaginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(
+            queryset,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        paginator.count = await queryset.acount()
+
+        page_kwarg = self.page_kwarg
+        page = self.kwargs.get(page_kwarg) or self.request.GET.get(page_kwarg) or 1
+        try:
+            page_number = int(page)
+        except ValueError:
+            if page == 'last':
+                page_number = paginator.num_pages
+            else:
+                raise Http404(_('Page is not “last”, nor can it be converted to an int.'))
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as e:
+            raise Http404(_('Invalid page (%(page_number)s): %(message)s') % {
+                'page_number': page_number,
+                'message': str(e),
+            })
+
+        page.object_list = [obj async for obj in page.object_list]
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    async def aget_context_data(self, **kwargs):
+        queryset = kwargs.pop('object_list', self.object_list)
+        page_size = self.get_paginate_by(queryset)
+        context_object_name = self.get_context_object_name(queryset)
+
+        if page_size:
+            paginator, page, queryset, is_paginated = await self.apaginate_queryset(queryset, page_size)
+            context = {
+                'paginator': paginator,
+                'page_obj': page,
+                'is_paginated': is_paginated,
+                'object_list': queryset,
+            }
+        else:
+            queryset = [obj async for obj in queryset]
+            context = {
+                'paginator': None,
+                'page_obj': None,
+                'is_paginated': False,
+                'object_list': queryset,
+            }
+
+        if context_object_name is not None:
+            context[context_object_name] = queryset
+        context.setdefault('view', self)
+        if self.extra_context is not None:
+            context.update(self.extra_context)
+        context.update(kwargs)
+        return context
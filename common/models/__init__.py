@@ -1 +1,2 @@
 from .ckeditor import CKEditorPostImages
+from .profiling import RequestProfile
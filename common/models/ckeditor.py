@@ -1,7 +1,49 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
 from blog.models import Post
 
 
+class CKEditorPostImagesQuerySet(models.QuerySet):
+
+    def unreferenced(self):
+        """
+        Images no post uses. Uploads younger than CKEDITOR_UNUSED_UPLOAD_TTL are kept,
+        the post they were uploaded for may not be saved yet.
+        """
+        uploaded_before = timezone.now() - timedelta(seconds=settings.CKEDITOR_UNUSED_UPLOAD_TTL)
+        return self.filter(ref_count=0, uploaded_at__lt=uploaded_before)
+
+    def add_references(self, delta):
+        return self.update(ref_count=F('ref_count') + delta)
+
+    def recount_references(self):
+        """
+        Set `ref_count` from the post associations, for the code that writes them in bulk.
+        """
+        through = CKEditorPostImages.posts.through
+        references = (
+            through.objects.filter(ckeditorpostimages=OuterRef('pk'))
+            .values('ckeditorpostimages').annotate(count=Count('*')).values('count')
+        )
+        return self.update(ref_count=Coalesce(Subquery(references), 0))
+
+
 class CKEditorPostImages(models.Model):
+    """
+    An uploaded CKEditor image, stored once per content under `digest` (see `common.views.ckeditor`).
+    `ref_count` is the number of posts that show it, the file is deleted when it drops to zero.
+    """
     uri = models.CharField(max_length=250)
     posts = models.ManyToManyField(Post)
+    # SHA-256 of the upload, empty for the images uploaded before the uploads were content-addressed
+    digest = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    ref_count = models.PositiveIntegerField(default=0, db_index=True)
+    uploaded_at = models.DateTimeField(default=timezone.now)
+
+    objects = CKEditorPostImagesQuerySet.as_manager()
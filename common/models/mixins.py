@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
 
 
 class DateTimeMixin(models.Model):
@@ -7,3 +9,67 @@ class DateTimeMixin(models.Model):
 
     class Meta:
         abstract = True
+
+
+class ContentVersionMixin(models.Model):
+    """
+    Version of what the pages and API responses of the object show besides its own fields
+    (comments, votes, favorites, ...), bumped with `bump_content_version` when any of it changes.
+    The conditional GET validators of the object (ETag, Last-Modified) are built from it.
+    """
+    content_version = models.PositiveIntegerField(default=0, editable=False)
+    content_changed_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        abstract = True
+
+
+class StoredValuesMixin(models.Model):
+    """
+    Keeps the values of `stored_fields` as they are stored in the database,
+    so `get_changed_fields` tells which of them a save changes.
+    """
+    stored_fields = ()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.store_values()
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.store_values()
+
+    def store_values(self):
+        self.stored_values = {
+            name: self.get_stored_value(name) for name in self.stored_fields
+            if self._meta.get_field(name).attname in self.__dict__
+        }
+
+    def get_stored_value(self, name):
+        field = self._meta.get_field(name)
+        return field.get_prep_value(field.value_from_object(self))
+
+    def get_changed_fields(self, update_fields=None):
+        """
+        The `stored_fields` (of `update_fields`, if given) whose values differ from the stored ones.
+        A field whose stored value is unknown counts as changed. Meant for the post_save signals,
+        which are sent before the new values are stored.
+        """
+        stored_values = getattr(self, 'stored_values', {})
+        return [
+            name for name in self.stored_fields
+            if (update_fields is None or name in update_fields)
+            and (name not in stored_values or self.get_stored_value(name) != stored_values[name])
+        ]
+
+
+def bump_content_version(queryset, **changes):
+    """
+    Bump the content version of the objects of `queryset` in one UPDATE, which also applies `changes`.
+    """
+    return queryset.update(content_version=F('content_version') + 1, content_changed_at=timezone.now(), **changes)
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.db import models
+
+
+class RequestProfile(models.Model):
+    """
+    cProfile output of one profiled request, see `common.middlewares.profiling.ProfilingMiddleware`.
+    """
+    request_id = models.CharField(max_length=64, unique=True)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=2000)
+    view_name = models.CharField(max_length=200)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField(db_index=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+                             related_name='+')
+    # Top functions by cumulative time, as printed by pstats
+    summary = models.TextField()
+    # Marshalled pstats data, the content of a `.prof` file
+    stats = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ('-duration_ms',)
+        indexes = (
+            models.Index(fields=['view_name', '-duration_ms'], name='common_profile_view_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.method} {self.path} ({self.duration_ms:.0f} ms)'
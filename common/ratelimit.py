@@ -0,0 +1,109 @@
+"""
+Rate limit storage for the API throttles (`common.throttling`).
+
+Both backends implement GCRA (generic cell rate algorithm): a client is allowed `limit` requests
+per `period` seconds, spread over a sliding window, and only the "theoretical arrival time" of
+its next request is stored. That is one number per key, whatever the rate, instead of the list
+of request timestamps that DRF's `SimpleRateThrottle` keeps and rewrites in the cache.
+"""
+import logging
+import threading
+import time
+from functools import cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] - client key, ARGV[1] - milliseconds between requests, ARGV[2] - period in milliseconds.
+# Returns 0 if the request is allowed, otherwise the milliseconds to wait.
+# Redis TIME is used, so the app servers do not need synchronized clocks.
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local allow_at = tat + interval - period
+if allow_at > now then
+    return allow_at - now
+end
+redis.call('SET', KEYS[1], tat + interval, 'PX', tat + interval - now)
+return 0
+"""
+
+
+class RedisRateLimitBackend:
+    """
+    Shared limits for all the workers: one atomic script call (EVALSHA) per request.
+    """
+
+    def __init__(self, url, key_prefix='', socket_timeout=0.5):
+        import redis
+
+        self.key_prefix = key_prefix
+        self.client = redis.Redis.from_url(url, socket_timeout=socket_timeout)
+        self.script = self.client.register_script(GCRA_SCRIPT)
+        self.errors = redis.RedisError
+
+    def hit(self, key, limit, period):
+        """
+        Count a request of `key`. Returns 0 if it is allowed, otherwise the seconds to wait.
+        """
+        interval = int(period * 1000 / limit)
+        try:
+            wait = self.script(keys=[f'{self.key_prefix}:{key}'], args=[interval, period * 1000])
+        except self.errors:
+            # An unavailable Redis must not take the API down with it
+            logger.warning('Rate limit check failed, the request is allowed', exc_info=True)
+            return 0
+        return wait / 1000
+
+
+class LocMemRateLimitBackend:
+    """
+    Per-process limits for development and tests.
+    """
+
+    def __init__(self, max_entries=10_000):
+        self.max_entries = max_entries
+        self._tats = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, period):
+        interval = period / limit
+        now = time.time()
+        with self._lock:
+            tat = max(self._tats.get(key, now), now)
+            allow_at = tat + interval - period
+            if allow_at > now:
+                return allow_at - now
+            if len(self._tats) >= self.max_entries:
+                self._tats = {key: value for key, value in self._tats.items() if value > now}
+            self._tats[key] = tat + interval
+        return 0
+
+    def clear(self):
+        with self._lock:
+            self._tats.clear()
+
+
+@cache
+def get_backend():
+    """
+    The backend configured in `settings.RATE_LIMIT`, created once per process.
+    """
+    config = settings.RATE_LIMIT
+    return import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+
+
+@receiver(setting_changed, dispatch_uid='common.reset_rate_limit_backend')
+def reset_backend(setting, **kwargs):
+    if setting == 'RATE_LIMIT':
+        get_backend.cache_clear()
@@ -0,0 +1,58 @@
+"""
+JSON renderers of the API, selected with `settings.ORJSON_ENABLED` (see REST FRAMEWORK in the settings).
+"""
+import orjson
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = (
+    # datetimes go through the DRF encoder like the other types orjson does not handle in the same way
+    orjson.OPT_PASSTHROUGH_DATETIME
+    # The stdlib encoder turns int keys into strings
+    | orjson.OPT_NON_STR_KEYS
+)
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    DRF JSON renderer that also indents the responses with `settings.JSON_INDENT`.
+    """
+
+    def get_indent(self, accepted_media_type, renderer_context):
+        indent = super().get_indent(accepted_media_type, renderer_context)
+        if indent is None and settings.JSON_INDENT:
+            return 2
+        return indent
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer on orjson, with the output of the DRF renderer:
+
+    - the types that the stdlib encoder does not know (datetime, Decimal, lazy strings, querysets, ...)
+      are converted by the DRF `JSONEncoder`, UUIDs are strings in both;
+    - compact separators, non-ASCII characters as they are, U+2028 and U+2029 escaped.
+
+    orjson only indents by two spaces, so any requested indent (`Accept: application/json; indent=4`,
+    the browsable API) gives a two-space indent.
+    """
+    default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = ORJSON_OPTIONS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=options)
+        except orjson.JSONEncodeError:
+            # Beyond what orjson supports (e.g. integers over 64 bits), the DRF renderer handles these
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -1 +1,2 @@
 from .ckeditor import *
+from .celery import *
@@ -0,0 +1,32 @@
+import time
+
+from celery.signals import task_postrun, task_prerun, worker_init, worker_process_shutdown
+
+from common import metrics
+from common.db.querytags import pop_tags, push_tags
+
+
+@task_prerun.connect(dispatch_uid='common.start_task_timer')
+def start_task_timer(task, **kwargs):
+    task.request.metrics_started = time.perf_counter()
+    task.request.query_tags_token = push_tags(task=task.name)
+
+
+@task_postrun.connect(dispatch_uid='common.observe_task_duration')
+def observe_task_duration(task, state, **kwargs):
+    token = getattr(task.request, 'query_tags_token', None)
+    if token is not None:
+        pop_tags(token)
+    started = getattr(task.request, 'metrics_started', None)
+    if started is not None:
+        metrics.observe_task(task.name, state or 'UNKNOWN', time.perf_counter() - started)
+
+
+@worker_init.connect(dispatch_uid='common.remove_metrics_files')
+def remove_metrics_files(**kwargs):
+    metrics.remove_host_files()
+
+
+@worker_process_shutdown.connect(dispatch_uid='common.mark_metrics_process_dead')
+def mark_metrics_process_dead(pid, **kwargs):
+    metrics.mark_process_dead(pid)
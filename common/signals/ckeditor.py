@@ -4,7 +4,7 @@ from django.dispatch import receiver
 from django.db.models import Q
 from common.models.ckeditor import CKEditorPostImages
 from blog.models import Post
-from common.tasks.image import delete_image
+from common.tasks.image import delay_in_batches, delete_images
 import re
 
 
@@ -23,9 +23,10 @@ def pre_save_posts(sender, instance, **kwargs):
     if instance.pk:
         images = re.findall('<img.*src=\"([^\"]+)', instance.text)
         excluded_images = CKEditorPostImages.objects.filter(Q(posts=instance) & ~Q(uri__in=images))
-        if excluded_images.exists():
-            for image in excluded_images:
-                image.posts.remove(instance)
+        with transaction.atomic():
+            released = dict(excluded_images.values_list('pk', 'uri'))
+            if released:
+                release_images(instance, released)
 
 
 @receiver(post_save, sender=Post, dispatch_uid='common.post.post_save_posts')
@@ -33,34 +34,42 @@ def post_save_posts(sender, instance, **kwargs):
     """
     Signal handler to manage images after saving a post.
 
-    Finds all images in the post's text, associates existing images with the post,
-    then deletes any orphaned images.
+    Finds all images in the post's text, associates existing images with the post
+    and counts the new reference, then queues the deletion of the unused uploads.
     """
     images = re.findall('<img.*src=\"([^\"]+)', instance.text)
     db_images = CKEditorPostImages.objects.filter(~Q(posts=instance) & Q(uri__in=images))
 
     with transaction.atomic():
-        for row in db_images:
-            row.posts.add(instance)
+        added = list(db_images.values_list('pk', flat=True))
+        if added:
+            CKEditorPostImages.posts.through.objects.bulk_create([
+                CKEditorPostImages.posts.through(post_id=instance.pk, ckeditorpostimages_id=pk) for pk in added
+            ])
+            CKEditorPostImages.objects.filter(pk__in=added).add_references(1)
 
-        orphan_images = CKEditorPostImages.objects.filter(posts__isnull=True)
-        for image in orphan_images:
-            delete_image.delay_on_commit(image.uri)
-
-        orphan_images.delete()
+        # The rows are deleted by the task, unless the image is used again in the meantime
+        delay_in_batches(delete_images, CKEditorPostImages.objects.unreferenced().values_list('uri', flat=True))
 
 
 @receiver(pre_delete, sender=Post, dispatch_uid='common.post.post_delete_blog')
 def pre_delete_post(sender, instance, **kwargs):
     """
     Find all images associated with the post being deleted.
-    Detach them from the post and delete them if they are no longer associated with any posts.
+    Detach them from the post and delete the ones no other post uses.
     """
     db_images = CKEditorPostImages.objects.filter(posts=instance)
 
     with transaction.atomic():
-        for row in db_images:
-            row.posts.remove(instance)
-            if not row.posts.exists():
-                row.delete()
-                delete_image.delay_on_commit(row.uri)
+        release_images(instance, dict(db_images.values_list('pk', 'uri')))
+
+
+def release_images(post, images):
+    """
+    Detach `images` ({pk: uri}) from `post` and queue the deletion of the files, which the task
+    only deletes if no other post uses them.
+    """
+    CKEditorPostImages.posts.through.objects.filter(post=post, ckeditorpostimages__in=images).delete()
+    CKEditorPostImages.objects.filter(pk__in=images, ref_count__gt=0).add_references(-1)
+    released = CKEditorPostImages.objects.filter(pk__in=images, ref_count=0)
+    delay_in_batches(delete_images, released.values_list('uri', flat=True))
@@ -0,0 +1,45 @@
+"""
+Static files storage with content hashes in the names and precompressed variants.
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    `collectstatic` writes `name.<hash>.ext` copies of the files (see ManifestStaticFilesStorage)
+    and a `.gz` variant of the hashed text files, which nginx serves to the browsers that accept it
+    (`gzip_static`). The hashed names never change their content, so they are cached by the browsers
+    as immutable.
+    """
+    compressed_extensions = ('.css', '.js', '.map', '.svg', '.json', '.txt', '.html')
+    # Smaller files do not get noticeably smaller, only their number of requests matters
+    compress_min_size = 512
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for hashed_name in set(self.hashed_files.values()):
+            if hashed_name.endswith(self.compressed_extensions):
+                self.compress(hashed_name)
+
+    def compress(self, name):
+        """
+        Write the missing `.gz` variant of the hashed file `name`. The hash in the name is the hash
+        of the content, so a variant left by a previous `collectstatic` is still valid.
+        """
+        compressed_name = name + '.gz'
+        if self.exists(compressed_name):
+            return
+        with self.open(name) as file:
+            content = file.read()
+        if len(content) < self.compress_min_size:
+            return
+        # The slowest and the best level, every hashed file is compressed once
+        compressed = gzip.compress(content, compresslevel=9, mtime=0)
+        # A variant that is not smaller is useless, the web server falls back to the original
+        if len(compressed) < len(content):
+            self._save(compressed_name, ContentFile(compressed))
@@ -1,13 +1,20 @@
+import logging
 from pathlib import Path
 
 from PIL import Image
 from celery import shared_task
+from django.db import transaction
 
+from common.models.ckeditor import CKEditorPostImages
 from config.settings import BASE_DIR
 
+logger = logging.getLogger(__name__)
 
-@shared_task
-def delete_image(image_path: str):
+# Paths sent in one message by `delay_in_batches`
+IMAGE_TASK_BATCH_SIZE = 100
+
+
+def delete_image_files(image_path: str):
     """
     This function assumes that the file extension of the images is '.jpg'. This is
     based on the `CKEDITOR_FORCE_JPEG_COMPRESSION = True` setting, which forces the
@@ -20,8 +27,21 @@ def delete_image(image_path: str):
     Path(str(BASE_DIR) + image_path[:-4] + '_thumb.jpg').unlink(missing_ok=True)
 
 
-@shared_task
-def resize_image(image_path: str):
+def get_unused_image_paths(image_paths):
+    """
+    The paths of `image_paths` whose files can be deleted: their rows are unreferenced (and deleted here)
+    or they have none. An image used again since its deletion was queued, by a post or by an upload
+    of the same content, is kept.
+    """
+    images = CKEditorPostImages.objects.filter(uri__in=image_paths)
+    with transaction.atomic():
+        unused = set(images.unreferenced().select_for_update().values_list('pk', flat=True))
+        kept = set(images.exclude(pk__in=unused).values_list('uri', flat=True))
+        CKEditorPostImages.objects.filter(pk__in=unused).delete()
+    return [image_path for image_path in image_paths if image_path not in kept]
+
+
+def resize_image_file(image_path: str):
     img_path = str(BASE_DIR) + image_path
     img = Image.open(img_path)
     width, height = img.size
@@ -29,3 +49,42 @@ def resize_image(image_path: str):
     if width > 1920 or height > 1080:
         img.thumbnail((1920, 1080))
         img.save(img_path)
+
+
+@shared_task(ignore_result=True)
+def delete_image(image_path: str):
+    for unused_path in get_unused_image_paths([image_path]):
+        delete_image_files(unused_path)
+
+
+@shared_task(ignore_result=True)
+def resize_image(image_path: str):
+    resize_image_file(image_path)
+
+
+@shared_task(ignore_result=True)
+def delete_images(image_paths: list[str]):
+    for image_path in get_unused_image_paths(image_paths):
+        delete_image_files(image_path)
+
+
+@shared_task(ignore_result=True)
+def resize_images(image_paths: list[str]):
+    """
+    Resize several images in one task. A broken or missing image does not stop the rest of the batch.
+    """
+    for image_path in image_paths:
+        try:
+            resize_image_file(image_path)
+        except OSError:
+            logger.warning('Could not resize image %s', image_path, exc_info=True)
+
+
+def delay_in_batches(task, image_paths, batch_size=IMAGE_TASK_BATCH_SIZE):
+    """
+    Queue a batch task (`delete_images`, `resize_images`) after the current transaction commits,
+    with up to `batch_size` paths per message instead of one message per image.
+    """
+    image_paths = list(dict.fromkeys(image_paths))
+    for start in range(0, len(image_paths), batch_size):
+        task.delay_on_commit(image_paths[start:start + batch_size])
@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+from django_celery_results.models import GroupResult, TaskResult
+
+PRUNE_BATCH_SIZE = 1000
+
+
+@shared_task(ignore_result=True)
+def prune_task_results(batch_size: int = PRUNE_BATCH_SIZE) -> int:
+    """
+    Delete the task and group results older than `CELERY_RESULT_EXPIRES` from `django_celery_results`.
+
+    Rows are deleted in batches of `batch_size` primary keys, so the cleanup does not hold
+    long locks on the main database. Returns the number of deleted rows.
+    """
+    expired_before = timezone.now() - timedelta(seconds=settings.CELERY_RESULT_EXPIRES)
+    deleted = 0
+    for model in (TaskResult, GroupResult):
+        expired = model.objects.filter(date_done__lt=expired_before)
+        while pks := list(expired.values_list('pk', flat=True)[:batch_size]):
+            deleted += model.objects.filter(pk__in=pks).delete()[0]
+    return deleted
@@ -1,10 +1,16 @@
+from datetime import timedelta
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import call, patch
 from django.test import TestCase
 from django.conf import settings
+from django.utils import timezone
+from django_celery_results.models import TaskResult
 from PIL import Image
 
-from common.tasks.image import delete_image, resize_image
+from common.tasks.image import delay_in_batches, delete_image, delete_images, resize_image, resize_images
+from common.tasks.results import prune_task_results
+from config.celery import app
+from users.tasks import export_user_data
 
 
 class CeleryTasksTestCase(TestCase):
@@ -48,3 +54,48 @@ class CeleryTasksTestCase(TestCase):
         resized_img = Image.open(test_image_path)
         self.assertEqual(resized_img.width, 800)
         self.assertEqual(resized_img.height, 600)
+
+    @patch('common.tasks.image.Path')
+    def test_delete_images(self, mock_path):
+        delete_images(['/test_images/a.jpg', '/test_images/b.jpg'])
+        self.assertEqual(mock_path().unlink.call_count, 4)
+
+    def test_resize_images_skips_broken_images(self):
+        Image.new('RGB', (2000, 1500), color='red').save(self.test_dir / 'test_large.jpg')
+
+        with self.assertLogs('common.tasks.image', 'WARNING'):
+            resize_images(['/test_images/missing.jpg', '/test_images/test_large.jpg'])
+
+        self.assertLessEqual(Image.open(self.test_dir / 'test_large.jpg').width, 1920)
+
+    @patch('common.tasks.image.delete_images.delay_on_commit')
+    def test_delay_in_batches(self, mock_delay):
+        paths = [f'/media/{i}.jpg' for i in range(5)]
+        delay_in_batches(delete_images, paths + paths[:2], batch_size=2)
+        self.assertEqual(mock_delay.call_args_list, [
+            call(paths[0:2]), call(paths[2:4]), call(paths[4:5]),
+        ])
+
+    def test_routes(self):
+        router = app.amqp.router
+        self.assertEqual(router.route({}, 'common.tasks.image.resize_images')['queue'].name, 'images')
+        self.assertEqual(router.route({}, 'common.tasks.image.delete_image')['queue'].name, 'cleanup')
+        self.assertEqual(router.route({}, 'blog.tasks.refresh_hot_scores')['queue'].name, 'celery')
+
+    def test_fire_and_forget_tasks_skip_results(self):
+        self.assertTrue(delete_images.ignore_result)
+        self.assertTrue(prune_task_results.ignore_result)
+        self.assertFalse(export_user_data.ignore_result)
+        self.assertTrue(app.conf.task_ignore_result)
+
+
+class PruneTaskResultsTestCase(TestCase):
+    def test_prune_expired_results(self):
+        expired = timezone.now() - timedelta(seconds=settings.CELERY_RESULT_EXPIRES + 60)
+        for i in range(3):
+            TaskResult.objects.create(task_id=f'old-{i}')
+        TaskResult.objects.update(date_done=expired)
+        TaskResult.objects.create(task_id='recent')
+
+        self.assertEqual(prune_task_results(batch_size=2), 3)
+        self.assertEqual(list(TaskResult.objects.values_list('task_id', flat=True)), ['recent'])
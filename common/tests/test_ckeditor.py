@@ -0,0 +1,155 @@
+import hashlib
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from blog.models import Author, Category, Post
+from common.models.ckeditor import CKEditorPostImages
+from common.tasks.image import delete_images
+
+User = get_user_model()
+
+
+def generate_image(color='red'):
+    file = io.BytesIO()
+    Image.new('RGB', size=(64, 64), color=color).save(file, 'JPEG')
+    return file.getvalue()
+
+
+class ContentAddressedUploadTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='blogger', password='1X<ISRUkw+tuK', email='em@il.com')
+        cls.user.user_permissions.add(Permission.objects.get(codename='add_post'))
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client.force_login(self.user)
+
+    def upload(self, content, name='picture.jpg', query=''):
+        upload = SimpleUploadedFile(name, content, content_type='image/jpeg')
+        with patch('common.views.ckeditor.resize_image.delay_on_commit') as resize:
+            response = self.client.post(reverse('ckeditor_upload') + query, {'upload': upload})
+        self.assertEqual(response.status_code, 200)
+        return response, resize
+
+    def test_upload_is_stored_under_its_digest(self):
+        content = generate_image()
+        digest = hashlib.sha256(content).hexdigest()
+        response, resize = self.upload(content)
+
+        image = CKEditorPostImages.objects.get()
+        self.assertEqual(image.digest, digest)
+        self.assertEqual(image.ref_count, 0)
+        self.assertEqual(image.uri, f'/media/uploads/blogger/{digest[:2]}/{digest}.jpg')
+        self.assertEqual(response.json(), {'url': image.uri, 'uploaded': '1', 'fileName': f'{digest}.jpg'})
+        resize.assert_called_once_with(image.uri)
+
+    def test_duplicate_upload_returns_stored_file(self):
+        content = generate_image()
+        first, _ = self.upload(content)
+        second, resize = self.upload(content, name='copy.jpg')
+
+        self.assertEqual(second.json()['url'], first.json()['url'])
+        self.assertEqual(CKEditorPostImages.objects.count(), 1)
+        resize.assert_not_called()
+
+        self.upload(generate_image(color='blue'))
+        self.assertEqual(CKEditorPostImages.objects.count(), 2)
+
+    def test_upload_of_deleted_duplicate_is_stored_again(self):
+        content = generate_image()
+        first, _ = self.upload(content)
+
+        def delete_row():
+            # A cleanup task deletes the unused row between the lookup and the update of the view
+            CKEditorPostImages.objects.all().delete()
+            return timezone.now()
+
+        with patch('common.views.ckeditor.timezone') as view_timezone:
+            view_timezone.now.side_effect = delete_row
+            second, resize = self.upload(content)
+        image = CKEditorPostImages.objects.get()
+        self.assertEqual(second.json()['url'], image.uri)
+        # The old file still exists until the task deletes it, the new one has another name
+        self.assertNotEqual(image.uri, first.json()['url'])
+        resize.assert_called_once_with(image.uri)
+
+    def test_ckeditor_func_num_response(self):
+        response, _ = self.upload(generate_image(), query='?CKEditorFuncNum=3')
+        uri = CKEditorPostImages.objects.get().uri
+        self.assertContains(response, f"window.parent.CKEDITOR.tools.callFunction(3, '{uri}');")
+
+
+class ImageReferencesTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username='blogger', password='1X<ISRUkw+tuK', email='em@il.com')
+        cls.author = Author.objects.create(user=user, bio='Biography')
+        cls.category = Category.objects.create(title='Python')
+
+    def setUp(self):
+        # Uploaded long enough ago to be deleted as soon as no post uses it
+        self.image = CKEditorPostImages.objects.create(
+            uri='/media/uploads/blogger/ab/ab.jpg', digest='ab', uploaded_at=timezone.now() - timedelta(days=2),
+        )
+        self.text = f'<p><img src="{self.image.uri}"></p>'
+
+    def create_post(self, text):
+        with patch('common.signals.ckeditor.delete_images.delay_on_commit'):
+            return Post.objects.create(author=self.author, category=self.category, title='Post', text=text)
+
+    def test_posts_count_references(self):
+        first = self.create_post(self.text)
+        second = self.create_post(self.text)
+        self.image.refresh_from_db()
+        self.assertEqual(self.image.ref_count, 2)
+        self.assertQuerySetEqual(self.image.posts.order_by('pk'), [first, second])
+
+        first.text = '<p>No images</p>'
+        with patch('common.signals.ckeditor.delete_images.delay_on_commit') as delete:
+            first.save()
+        self.image.refresh_from_db()
+        self.assertEqual(self.image.ref_count, 1)
+        delete.assert_not_called()
+
+        with patch('common.signals.ckeditor.delete_images.delay_on_commit') as delete:
+            second.delete()
+        self.image.refresh_from_db()
+        self.assertEqual(self.image.ref_count, 0)
+        delete.assert_called_once_with([self.image.uri])
+
+    def test_fresh_uploads_are_not_deleted(self):
+        fresh = CKEditorPostImages.objects.create(uri='/media/uploads/blogger/cd/cd.jpg', digest='cd')
+        with patch('common.signals.ckeditor.delete_images.delay_on_commit') as delete:
+            Post.objects.create(author=self.author, category=self.category, title='Post', text='<p>Text</p>')
+        delete.assert_called_once_with([self.image.uri])
+        self.assertNotIn(fresh.uri, delete.call_args.args[0])
+
+    @patch('common.tasks.image.delete_image_files')
+    def test_delete_images_keeps_referenced_images(self, delete_image_files):
+        self.create_post(self.text)
+        delete_images([self.image.uri])
+        delete_image_files.assert_not_called()
+        self.assertTrue(CKEditorPostImages.objects.filter(pk=self.image.pk).exists())
+
+        CKEditorPostImages.objects.filter(pk=self.image.pk).update(ref_count=0)
+        delete_images([self.image.uri])
+        delete_image_files.assert_called_once_with(self.image.uri)
+        self.assertFalse(CKEditorPostImages.objects.filter(pk=self.image.pk).exists())
@@ -0,0 +1,211 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.test import AsyncRequestFactory, TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from blog.models import Author, Category, Comment, Post
+from blog.views import posts
+from rating.models import CommentRating, PostRating
+from subscription.models import Favorite, UserSubscription
+from users.models import Profile
+
+User = get_user_model()
+
+
+class ConditionalGetDataMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='blogger', password='1X<ISRUkw+tuK', email='em@il.com')
+        cls.reader = User.objects.create_user(username='reader', password='1X<ISRUkw+tuK', email='re@ader.com')
+        author = Author.objects.create(user=cls.user, bio='Biography')
+        category = Category.objects.create(title='Python')
+        cls.post = Post.objects.create(author=author, category=category, title='Post', text='Text')
+        cls.comment = Comment.objects.create(author=cls.reader, post=cls.post, text='Comment')
+
+    def assertNotModified(self, url, response):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def assertModified(self, url, response):
+        new_response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(new_response.status_code, 200)
+        self.assertNotEqual(new_response['ETag'], response['ETag'])
+        return new_response
+
+
+class ContentVersionTest(ConditionalGetDataMixin, TestCase):
+
+    def get_versions(self):
+        post = Post.objects.get(pk=self.post.pk)
+        return (
+            post.content_version,
+            Profile.objects.get(pk=self.user.pk).content_version,
+            Profile.objects.get(pk=self.reader.pk).content_version,
+        )
+
+    def assertBumped(self, before, post=1, author=1, reader=0):
+        post_version, author_version, reader_version = before
+        self.assertEqual(self.get_versions(), (post_version + post, author_version + author, reader_version + reader))
+
+    def test_comment(self):
+        before = self.get_versions()
+        comment = Comment.objects.create(author=self.reader, post=self.post, text='Reply')
+        self.assertBumped(before, reader=1)
+        before = self.get_versions()
+        comment.delete()
+        self.assertBumped(before, reader=1)
+
+    def test_votes_and_favorites(self):
+        before = self.get_versions()
+        PostRating.objects.create(obj=self.post, owner=self.reader, vote=1)
+        Favorite.objects.create(user=self.reader, post=self.post)
+        self.assertBumped(before, post=2, author=2)
+        before = self.get_versions()
+        CommentRating.objects.create(obj=self.comment, owner=self.user, vote=-1)
+        self.assertBumped(before, reader=1)
+
+    def test_vote_updates_the_post_once(self):
+        Post.objects.filter(pk=self.post.pk).update(hot_score_stale=False)
+        # The vote, the rollups (the post and two UPDATEs), one UPDATE of the post
+        # (content version and hot score) and one of the profile of its author
+        with self.assertNumQueries(6):
+            PostRating.objects.create(obj=self.post, owner=self.reader, vote=1)
+        self.assertTrue(Post.objects.get(pk=self.post.pk).hot_score_stale)
+
+    def test_profile(self):
+        before = self.get_versions()
+        UserSubscription.objects.create(subscriber=self.reader, subscribed_to=self.user)
+        self.user.author.bio = 'New biography'
+        self.user.author.save()
+        self.assertBumped(before, post=0, author=2)
+        before = self.get_versions()
+        update_last_login(None, self.user)
+        self.assertBumped(before, post=0, author=0)
+
+    def test_user(self):
+        # The post page shows the names and the photos of its author and commenters
+        before = self.get_versions()
+        self.reader.username = 'renamed'
+        self.reader.save()
+        self.assertBumped(before, author=0, reader=1)
+        before = self.get_versions()
+        profile = Profile.objects.get(pk=self.user.pk)
+        profile.photo = 'profile_photos/new.png'
+        profile.save()
+        self.assertBumped(before)
+
+    def test_user_edit_not_shown_on_posts(self):
+        # Only the profile page shows the other fields
+        before = self.get_versions()
+        user = User.objects.get(pk=self.reader.pk)
+        user.first_name = 'Reader'
+        user.save()
+        Profile.objects.get(pk=self.reader.pk).save()
+        self.assertBumped(before, post=0, author=0, reader=2)
+        before = self.get_versions()
+        user.username = 'renamed'
+        user.save(update_fields=['first_name'])
+        self.assertBumped(before, post=0, author=0, reader=1)
+
+
+class ConditionalGetTest(ConditionalGetDataMixin, APITestCase):
+
+    def test_post_page(self):
+        url = reverse('blog:post-detail', kwargs={'pk': self.post.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            self.assertNotModified(url, response)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+
+        Comment.objects.create(author=self.user, post=self.post, text='Reply')
+        response = self.assertModified(url, response)
+        self.post.title = 'Edited'
+        self.post.save()
+        self.assertModified(url, response)
+
+    def test_commenter_rename(self):
+        url = reverse('blog:post-detail', kwargs={'pk': self.post.pk})
+        response = self.client.get(url)
+        self.reader.username = 'renamed'
+        self.reader.save()
+        self.assertContains(self.assertModified(url, response), 'renamed')
+
+    def test_etag_depends_on_user(self):
+        url = reverse('blog:post-detail', kwargs={'pk': self.post.pk})
+        response = self.client.get(url)
+        self.client.force_login(self.reader)
+        self.assertModified(url, response)
+
+    def test_api_post(self):
+        for url in (
+            reverse('api:post-with-comments', kwargs={'pk': self.post.pk}),
+            reverse('api:post-detail', kwargs={'pk': self.post.pk}),
+            reverse('api:comment-list', kwargs={'post_id': self.post.pk}),
+            reverse('api:comment-detail', kwargs={'post_id': self.post.pk, 'comment_id': self.comment.pk}),
+        ):
+            with self.subTest(url=url):
+                self.client.force_authenticate(user=self.reader)
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotModified(url, response)
+                # Another format is another representation
+                browsable = self.client.get(url, {'format': 'api'}, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertEqual(browsable.status_code, 200)
+
+        PostRating.objects.create(obj=self.post, owner=self.reader, vote=1)
+        self.assertModified(url, response)
+
+    def test_profile(self):
+        self.client.force_authenticate(user=self.reader)
+        for url in (
+            reverse('users:profile', kwargs={'pk': self.user.pk}),
+            reverse('api:user-profile', kwargs={'pk': self.user.pk}),
+            reverse('api:user-profile-full', kwargs={'pk': self.user.pk}),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotModified(url, response)
+        UserSubscription.objects.create(subscriber=self.reader, subscribed_to=self.user)
+        self.assertModified(url, response)
+
+    def test_me(self):
+        self.client.force_authenticate(user=self.reader)
+        url = reverse('api:me-full')
+        response = self.client.get(url)
+        self.assertNotModified(url, response)
+        CommentRating.objects.create(obj=self.comment, owner=self.user, vote=1)
+        response = self.assertModified(url, response)
+        self.client.force_authenticate(user=self.user)
+        self.assertModified(url, response)
+
+    def test_missing_post(self):
+        url = reverse('api:post-detail', kwargs={'pk': 99999})
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"etag"').status_code, 404)
+
+
+class AsyncConditionalGetTest(ConditionalGetDataMixin, TestCase):
+
+    def get_request(self, headers=None):
+        request = AsyncRequestFactory().get(reverse('blog:post-detail', args=(self.post.pk,)), headers=headers)
+
+        async def auser():
+            return self.reader
+
+        request.auser = auser
+        return request
+
+    async def test_post_detail(self):
+        response = await posts.AsyncPostDetailView.as_view()(self.get_request(), pk=self.post.pk)
+        await sync_to_async(response.render)()
+        self.assertEqual(response.status_code, 200)
+
+        request = self.get_request({'If-None-Match': response['ETag']})
+        not_modified = await posts.AsyncPostDetailView.as_view()(request, pk=self.post.pk)
+        self.assertEqual(not_modified.status_code, 304)
@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class DatabaseHealthAPIViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(username='staff', password='1X<ISRUkw+tuK', email='st@ff.com',
+                                             is_staff=True)
+        cls.user = User.objects.create_user(username='user', password='1X<ISRUkw+tuK', email='us@er.com')
+        cls.url = reverse('api:health-db')
+
+    def test_staff_gets_connection_stats(self):
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        default = response.data['databases']['default']
+        self.assertEqual(default['vendor'], 'sqlite')
+        self.assertFalse(default['pooled'])
+        self.assertIn('conn_max_age', default)
+        self.assertIn('conn_health_checks', default)
+
+    def test_regular_user_is_forbidden(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_anonymous_is_rejected(self):
+        response = self.client.get(self.url)
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
@@ -0,0 +1,131 @@
+import os
+import socket
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import resolve, reverse
+from prometheus_client import REGISTRY, CollectorRegistry
+from rest_framework.test import APITestCase
+
+from blog import constants as blog_const
+from common import metrics
+from common.tasks.image import delete_images
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsViewTest(APITestCase):
+
+    def test_disabled_without_token(self):
+        response = self.client.get(reverse('api:metrics'))
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token_is_required(self):
+        response = self.client.get(reverse('api:metrics'))
+        self.assertEqual(response.status_code, 401)
+        response = self.client.get(reverse('api:metrics'), HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics(self):
+        self.client.get(reverse('api:post-list'))
+        response = self.client.get(reverse('api:metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertContains(response, 'http_request_duration_seconds_bucket')
+        self.assertContains(response, 'http_request_db_queries_bucket')
+
+    def test_requests_are_observed(self):
+        url = reverse('api:post-list')
+        labels = {'route': resolve(url).route}
+        requests = sample('http_request_duration_seconds_count', method='GET', status='2xx', **labels)
+        queries = sample('http_request_db_queries_count', **labels)
+
+        self.client.get(url)
+
+        self.assertEqual(sample('http_request_duration_seconds_count', method='GET', status='2xx', **labels),
+                         requests + 1)
+        self.assertEqual(sample('http_request_db_queries_count', **labels), queries + 1)
+
+    def test_unmatched_route(self):
+        before = sample('http_request_duration_seconds_count', method='GET', route='unmatched', status='4xx')
+        self.client.get('/no-such-page/')
+        self.assertEqual(
+            sample('http_request_duration_seconds_count', method='GET', route='unmatched', status='4xx'), before + 1
+        )
+
+
+class CacheMetricsTest(TestCase):
+
+    @override_settings(CACHES={'default': {'BACKEND': 'common.cache.LocMemCache'}})
+    def test_hits_and_misses_by_family(self):
+        cache = caches['default']
+        hits = sample('cache_lookups_total', family='categories', result='hit')
+        misses = sample('cache_lookups_total', family='categories', result='miss')
+        other = sample('cache_lookups_total', family='other', result='miss')
+
+        self.assertIsNone(cache.get(blog_const.CATEGORY_CACHE_KEY))
+        cache.set(blog_const.CATEGORY_CACHE_KEY, [])
+        self.assertEqual(cache.get(blog_const.CATEGORY_CACHE_KEY, 'default'), [])
+        self.assertEqual(cache.get_many(['unknown']), {})
+
+        self.assertEqual(sample('cache_lookups_total', family='categories', result='hit'), hits + 1)
+        self.assertEqual(sample('cache_lookups_total', family='categories', result='miss'), misses + 1)
+        self.assertEqual(sample('cache_lookups_total', family='other', result='miss'), other + 1)
+
+    def test_families(self):
+        self.assertEqual(metrics.get_cache_family('views.decorators.cache.cache_page.abc'), 'responses')
+        self.assertEqual(metrics.get_cache_family('feed:1'), 'feeds')
+        self.assertEqual(metrics.get_cache_family('something'), 'other')
+
+
+class CeleryMetricsTest(TestCase):
+
+    def test_image_task_duration(self):
+        labels = {'task': delete_images.name, 'state': 'SUCCESS'}
+        before = sample('celery_task_duration_seconds_count', **labels)
+        delete_images.apply(args=[[]])
+        self.assertEqual(sample('celery_task_duration_seconds_count', **labels), before + 1)
+
+    @override_settings(METRICS_CELERY_QUEUES=['images'])
+    def test_registration_does_not_read_the_broker(self):
+        with patch('config.celery.app.connection_for_read') as connection_for_read:
+            CollectorRegistry(auto_describe=True).register(metrics.CeleryQueueCollector())
+        connection_for_read.assert_not_called()
+
+    def test_queue_lengths_are_not_read_without_queues(self):
+        self.assertEqual(list(metrics.CeleryQueueCollector().collect()), [])
+
+
+class MultiprocessFilesTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.enterContext(patch.dict(os.environ, PROMETHEUS_MULTIPROC_DIR=self.directory.name))
+        self.enterContext(patch.object(metrics, 'MULTIPROCESS', True))
+
+    def touch(self, *names):
+        for name in names:
+            (Path(self.directory.name) / name).touch()
+
+    def files(self):
+        return sorted(path.name for path in Path(self.directory.name).iterdir())
+
+    def test_remove_host_files(self):
+        host = socket.gethostname()
+        self.touch(f'counter_{host}_7.db', f'histogram_{host}_8.db', 'counter_other-host_7.db')
+        metrics.remove_host_files()
+        self.assertEqual(self.files(), ['counter_other-host_7.db'])
+
+    def test_mark_process_dead(self):
+        host = socket.gethostname()
+        self.touch(f'gauge_livesum_{host}_7.db', f'counter_{host}_7.db', f'gauge_livesum_{host}_8.db')
+        metrics.mark_process_dead(7)
+        self.assertEqual(self.files(), [f'counter_{host}_7.db', f'gauge_livesum_{host}_8.db'])
@@ -1,40 +1,81 @@
-from django.test import TestCase, RequestFactory, Client
+from unittest.mock import AsyncMock, Mock, patch
+
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, override_settings
 from django.http import HttpResponse
-from unittest.mock import patch, MagicMock
-import json
 
-from common.middlewares.ckeditor import CKEditorPostMiddleware
-from common.models.ckeditor import CKEditorPostImages
+from blog.models import Post
+from common.db.routers import PrimaryReplicaRouter, use_primary
+from common.middlewares.database import ReplicaRoutingMiddleware
 
 
-class CKEditorPostMiddlewareTestCase(TestCase):
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class ReplicaRoutingMiddlewareTestCase(SimpleTestCase):
     def setUp(self):
         self.factory = RequestFactory()
-        self.middleware = CKEditorPostMiddleware(get_response=MagicMock(return_value=HttpResponse()))
+        self.router = PrimaryReplicaRouter()
+        self.read_db = None
+        self.middleware = ReplicaRoutingMiddleware(get_response=self.view)
 
-    @patch('common.middlewares.ckeditor.resize_image.delay_on_commit')
-    def test_ckeditor_upload_post(self, mock_resize_image):
-        request = self.factory.post('/ckeditor/upload/')
-        mock_response = HttpResponse(json.dumps({'url': '/media/test_image.jpg'}), content_type='application/json')
-        self.middleware.get_response.return_value = mock_response
-        self.middleware(request)
-        self.assertEqual(CKEditorPostImages.objects.count(), 1)
-        saved_image = CKEditorPostImages.objects.first()
-        self.assertEqual(saved_image.uri, '/media/test_image.jpg')
-        mock_resize_image.assert_called_once_with('/media/test_image.jpg')
-
-    @patch('common.middlewares.ckeditor.resize_image.delay_on_commit')
-    def test_non_ckeditor_request(self, mock_resize_image):
-        request = self.factory.get('/some-other-url/')
-        self.middleware(request)
-        self.assertEqual(CKEditorPostImages.objects.count(), 0)
-        mock_resize_image.assert_not_called()
-
-    @patch('common.middlewares.ckeditor.resize_image.delay_on_commit')
-    def test_ckeditor_upload_post_no_url(self, mock_resize_image):
-        request = self.factory.post('/ckeditor/upload/')
-        mock_response = HttpResponse(json.dumps({}), content_type='application/json')
-        self.middleware.get_response.return_value = mock_response
+    def view(self, request):
+        self.read_db = self.router.db_for_read(Post)
+        return HttpResponse()
+
+    def test_safe_request_reads_from_replica(self):
+        self.middleware(self.factory.get('/blog/all/'))
+        self.assertEqual(self.read_db, 'replica_1')
+
+    def test_use_primary_overrides_replica(self):
+        def view(request):
+            with use_primary():
+                self.read_db = self.router.db_for_read(Post)
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(get_response=view)(self.factory.get('/blog/all/'))
+        self.assertEqual(self.read_db, 'default')
+
+    def test_write_request_uses_primary_and_sets_sticky_cookie(self):
+        response = self.middleware(self.factory.post('/rating/1/vote/LIKE'))
+        self.assertEqual(self.read_db, 'default')
+        self.assertIn('use_primary', response.cookies)
+
+    def test_failed_write_does_not_set_sticky_cookie(self):
+        middleware = ReplicaRoutingMiddleware(get_response=lambda request: HttpResponse(status=400))
+        response = middleware(self.factory.post('/rating/1/vote/LIKE'))
+        self.assertNotIn('use_primary', response.cookies)
+
+    def test_reads_after_write_stick_to_primary(self):
+        request = self.factory.get('/blog/all/')
+        request.COOKIES['use_primary'] = '1'
         self.middleware(request)
-        self.assertEqual(CKEditorPostImages.objects.count(), 0)
-        mock_resize_image.assert_not_called()
+        self.assertEqual(self.read_db, 'default')
+
+    def test_admin_uses_primary(self):
+        self.middleware(self.factory.get('/admin/blog/post/'))
+        self.assertEqual(self.read_db, 'default')
+
+    def test_outside_of_request_uses_primary(self):
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+        self.assertEqual(self.router.db_for_write(Post), 'default')
+
+    async def test_async_requests_use_the_async_cache(self):
+        async def view(request):
+            self.read_db = self.router.db_for_read(Post)
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(get_response=view)
+        factory = AsyncRequestFactory()
+        headers = {'Authorization': 'Bearer token'}
+        with patch('common.middlewares.database.cache') as cache:
+            cache.get = cache.set = Mock(side_effect=AssertionError('blocking cache call'))
+            cache.aget, cache.aset = AsyncMock(return_value=True), AsyncMock()
+            await middleware(factory.get('/blog/all/', headers=headers))
+            self.assertEqual(self.read_db, 'default')
+            await middleware(factory.post('/rating/1/vote/LIKE', headers=headers))
+        cache.aset.assert_awaited_once()
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_uses_primary(self):
+        response = self.middleware(self.factory.post('/rating/1/vote/LIKE'))
+        self.assertNotIn('use_primary', response.cookies)
+        self.middleware(self.factory.get('/blog/all/'))
+        self.assertEqual(self.read_db, 'default')
@@ -0,0 +1,74 @@
+import marshal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from common.middlewares.profiling import ProfilingMiddleware
+from common.models import RequestProfile
+
+User = get_user_model()
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=0.0)
+class ProfilingMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_superuser(username='staff', password='1X<ISRUkw+tuK', email='st@ff.com')
+        cls.user = User.objects.create_user(username='user', password='1X<ISRUkw+tuK', email='us@er.com')
+
+    def test_staff_request_with_header(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('blog:posts'), HTTP_X_PROFILE='1')
+
+        profile = RequestProfile.objects.get()
+        self.assertEqual(response['X-Profile-Id'], profile.request_id)
+        self.assertEqual(profile.view_name, 'blog:posts')
+        self.assertEqual(profile.status_code, 200)
+        self.assertEqual(profile.user, self.staff)
+        self.assertIn('cumulative', profile.summary)
+        self.assertTrue(marshal.loads(profile.stats))
+
+    def test_staff_api_request_with_token(self):
+        token = RefreshToken.for_user(self.staff).access_token
+        response = self.client.get(reverse('api:post-list'), {'_profile': '1'}, HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertIn('X-Profile-Id', response)
+        self.assertEqual(RequestProfile.objects.get().view_name, 'api:post-list')
+
+    def test_other_users_cannot_ask_for_profiles(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('blog:posts'), HTTP_X_PROFILE='1')
+        self.assertNotIn('X-Profile-Id', response)
+
+        self.client.logout()
+        self.client.get(reverse('api:post-list'), {'_profile': '1'}, HTTP_AUTHORIZATION='Bearer invalid')
+        self.assertFalse(RequestProfile.objects.exists())
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_MAX_PROFILES=2)
+    def test_sampled_requests_and_retention(self):
+        for _ in range(3):
+            self.client.get(reverse('api:post-list'))
+        self.assertEqual(RequestProfile.objects.count(), 2)
+        self.assertIsNone(RequestProfile.objects.first().user)
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ProfilingMiddleware(lambda request: HttpResponse())
+
+    def test_admin(self):
+        self.client.force_login(self.staff)
+        self.client.get(reverse('blog:posts'), HTTP_X_PROFILE='1')
+        profile = RequestProfile.objects.get()
+
+        response = self.client.get(reverse('admin:common_requestprofile_changelist'), {'view_name': 'blog:posts'})
+        self.assertContains(response, 'blog:posts')
+        response = self.client.get(reverse('admin:common_requestprofile_change', args=[profile.pk]))
+        self.assertContains(response, f'{profile.request_id}.prof')
+
+        response = self.client.get(reverse('admin:common_requestprofile_download', args=[profile.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, bytes(profile.stats))
@@ -0,0 +1,131 @@
+import json
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.test import APITestCase
+
+from blog.models import Author, Category, Post
+from common.db import querylog
+from common.db.querytags import get_tags, query_tags
+
+User = get_user_model()
+
+
+class PostCategorySerializer(serializers.ModelSerializer):
+    category = serializers.StringRelatedField()
+
+    class Meta:
+        model = Post
+        fields = ('title', 'category')
+
+
+@contextmanager
+def capture_sent_sql():
+    """
+    The SQL as sent to the driver, i.e. with the comment of the query log wrapper.
+    """
+    sent = []
+
+    def record(execute, sql, params, many, context):
+        sent.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        yield sent
+
+
+class QueryLogFunctionsTest(SimpleTestCase):
+
+    def test_format_comment(self):
+        comment = querylog.format_comment({'route': 'api/posts/<int:pk>/', 'controller': 'Post View', 'origin': ''})
+        self.assertEqual(comment, "/*controller='Post%20View',route='api/posts/<int:pk>/'*/")
+
+    def test_add_comment_escapes_percent(self):
+        sql = 'SELECT 1 WHERE a = %s'
+        self.assertEqual(querylog.add_comment(sql, {'controller': 'A B'}, (1,)), f"{sql} /*controller='A%%20B'*/")
+        self.assertEqual(querylog.add_comment(sql, {'controller': 'A B'}, None), f"{sql} /*controller='A%20B'*/")
+        self.assertEqual(querylog.add_comment(sql, {}, (1,)), sql)
+
+    def test_fingerprint_ignores_literals(self):
+        self.assertEqual(
+            querylog.normalize("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x''y'   AND n > 10"),
+            'SELECT * FROM t WHERE id IN (...) AND name = ? AND n > ?',
+        )
+        self.assertEqual(
+            querylog.fingerprint('SELECT * FROM t WHERE id IN (%s, %s)'),
+            querylog.fingerprint('SELECT * FROM t WHERE id IN (%s)'),
+        )
+        self.assertNotEqual(querylog.fingerprint('SELECT a FROM t'), querylog.fingerprint('SELECT b FROM t'))
+
+    def test_stats_dump(self):
+        stats = querylog.QueryStats()
+        stats.add('SELECT 1 WHERE a = 1', {'origin': 'fast'}, 1.0)
+        stats.add('SELECT 1 WHERE a = 2', {'origin': 'slow'}, 5.0)
+        stats.add('SELECT 2', {}, 2.0)
+        with self.assertLogs('common.db.queries', 'INFO') as logs:
+            stats.dump_if_due(interval=0.000001)
+        lines = [json.loads(record.getMessage()) for record in logs.records]
+        self.assertEqual([line['count'] for line in lines], [2, 1])
+        self.assertEqual(lines[0]['total_ms'], 6.0)
+        self.assertEqual(lines[0]['tags'], {'origin': 'slow'})
+        self.assertEqual(stats.entries, {})
+
+
+class QueryTagsTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username='blogger', password='1X<ISRUkw+tuK', email='em@il.com')
+        author = Author.objects.create(user=user, bio='Biography')
+        category = Category.objects.create(title='Python')
+        Post.objects.create(author=author, category=category, title='Post', text='...')
+
+    def test_nested_tags(self):
+        with query_tags(controller='A', route='a/'):
+            with query_tags(controller='B'):
+                self.assertEqual(get_tags(), {'controller': 'B', 'route': 'a/'})
+            self.assertEqual(get_tags(), {'controller': 'A', 'route': 'a/'})
+        self.assertEqual(get_tags(), {})
+
+    def test_origin_is_added_when_evaluated(self):
+        posts = Post.objects.get_posts_list()
+        with capture_sent_sql() as sent:
+            list(posts.filter(title='Post'))
+        self.assertIn("origin='PostManager.get_posts_list'", sent[0])
+
+    def test_serializer_tag(self):
+        with capture_sent_sql() as sent:
+            PostCategorySerializer(Post.objects.all(), many=True).data
+        # The posts and their lazily loaded category
+        self.assertEqual(len(sent), 2)
+        self.assertTrue(all("serializer='PostCategorySerializer'" in sql for sql in sent))
+
+    @override_settings(QUERY_COMMENTS=False)
+    def test_comments_can_be_disabled(self):
+        with capture_sent_sql() as sent:
+            list(Post.objects.get_posts_list())
+        self.assertNotIn('/*', sent[0])
+
+    @override_settings(SLOW_QUERY_MS=0)
+    def test_slow_query_is_logged(self):
+        with self.assertLogs('common.db.queries', 'WARNING') as logs:
+            Post.objects.get_posts_list().count()
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['event'], 'slow_query')
+        self.assertEqual(line['tags'], {'origin': 'PostManager.get_posts_list'})
+        self.assertEqual(line['fingerprint'], querylog.fingerprint(line['sql']))
+        self.assertNotIn('/*', line['sql'])
+
+
+class QueryTagsMiddlewareTest(APITestCase):
+
+    def test_view_and_route(self):
+        with capture_sent_sql() as sent:
+            self.client.get(reverse('api:post-list'))
+        self.assertTrue(sent)
+        self.assertTrue(all("controller='PostViewSet'" in sql for sql in sent))
+        self.assertIn("route='api/post/", sent[0])
@@ -0,0 +1,121 @@
+import datetime
+import io
+import json
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.test import APITestCase
+
+from blog.models import Author, Category, Post
+from common.parsers import ORJSONParser
+from common.renderers import ORJSONRenderer
+
+User = get_user_model()
+
+DATA = {
+    'id': 1,
+    'created_at': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+    'day': datetime.date(2024, 5, 1),
+    'time': datetime.time(8, 15),
+    'duration': datetime.timedelta(minutes=1),
+    'price': Decimal('10.50'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'lazy': gettext_lazy('Posts'),
+    'text': 'Привет\u2028мир',
+    'counts': {1: 'one'},
+    'items': [1.5, None, True, ()],
+}
+
+
+class ORJSONRendererTest(SimpleTestCase):
+
+    def test_same_output_as_drf(self):
+        self.assertEqual(ORJSONRenderer().render(DATA), renderers.JSONRenderer().render(DATA))
+
+    def test_indent(self):
+        rendered = ORJSONRenderer().render({'a': [1]}, 'application/json; indent=4')
+        self.assertEqual(rendered, b'{\n  "a": [\n    1\n  ]\n}')
+        self.assertEqual(ORJSONRenderer().render({'a': 1}, renderer_context={'indent': 4}), b'{\n  "a": 1\n}')
+
+    @override_settings(JSON_INDENT=True)
+    def test_indent_setting(self):
+        self.assertEqual(ORJSONRenderer().render({'a': 1}), b'{\n  "a": 1\n}')
+        self.assertEqual(ORJSONRenderer().render({'a': 1}, 'application/json; indent=0'), b'{\n  "a": 1\n}')
+
+    def test_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_unsupported_types_fail_like_drf(self):
+        with self.assertRaises(TypeError):
+            ORJSONRenderer().render({'value': object()})
+
+    def test_large_integers_fall_back_to_drf(self):
+        self.assertEqual(ORJSONRenderer().render({'value': 2 ** 70}), b'{"value":1180591620717411303424}')
+
+
+class ORJSONParserTest(SimpleTestCase):
+
+    def parse(self, content, **parser_context):
+        return ORJSONParser().parse(io.BytesIO(content), parser_context=parser_context)
+
+    def test_parse(self):
+        self.assertEqual(self.parse('{"text": "Привет"}'.encode()), {'text': 'Привет'})
+        self.assertEqual(self.parse('{"text": "Café"}'.encode('latin-1'), encoding='latin-1'), {'text': 'Café'})
+
+    def test_invalid(self):
+        for content in (b'{"text": ', b'{"value": NaN}', b'\xff'):
+            with self.subTest(content=content), self.assertRaises(ParseError):
+                self.parse(content)
+        with self.assertRaises(ParseError):
+            self.parse(b'{}', encoding='bz2_codec')
+
+
+class JSONEndpointTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='blogger', password='1X<ISRUkw+tuK', email='em@il.com')
+        author = Author.objects.create(user=cls.user, bio='Biography')
+        category = Category.objects.create(title='Python')
+        cls.post = Post.objects.create(author=author, category=category, title='Пост', text='...')
+
+    def test_post_list(self):
+        response = self.client.get(reverse('api:post-list'))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.content, renderers.JSONRenderer().render(response.data))
+
+    def test_request_body(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse('api:comment-list', kwargs={'post_id': self.post.pk})
+        response = self.client.post(url, data=json.dumps({'text': 'Комментарий'}), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['text'], 'Комментарий')
+        response = self.client.post(url, data='{"text": ', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.data['detail'].startswith('JSON parse error'))
+
+    def test_browsable_api(self):
+        response = self.client.get(reverse('api:post-list'), HTTP_ACCEPT='text/html')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '&quot;title&quot;: &quot;Пост&quot;')
+
+
+class BenchmarkJSONCommandTest(TestCase):
+
+    def test_benchmark(self):
+        user = User.objects.create_user(username='blogger', password='1X<ISRUkw+tuK', email='em@il.com')
+        author = Author.objects.create(user=user, bio='Biography')
+        Post.objects.create(author=author, category=Category.objects.create(title='Python'), title='Post', text='...')
+        out = io.StringIO()
+        call_command('benchmark_json', repeat=2, host='testserver', stdout=out)
+        output = out.getvalue()
+        self.assertIn('/api/post/?limit=100', output)
+        self.assertIn(f'/api/users/{user.pk}/full/', output)
+        self.assertEqual(output.count('render: stdlib'), 2)
@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from blog.models import Author, Category, Comment, Post
+from rating.models import PostRating
+
+User = get_user_model()
+
+
+class SparseFieldsTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='blogger', password='1X<ISRUkw+tuK', email='em@il.com')
+        cls.reader = User.objects.create_user(username='reader', password='1X<ISRUkw+tuK', email='re@ader.com')
+        author = Author.objects.create(user=cls.user, bio='Biography')
+        category = Category.objects.create(title='Python')
+        cls.post = Post.objects.create(author=author, category=category, title='Post', text='Text')
+        cls.other = Post.objects.create(author=author, category=category, title='Other', text='...')
+        Comment.objects.create(author=cls.reader, post=cls.post, text='Comment')
+        PostRating.objects.create(obj=cls.post, owner=cls.reader, vote=1)
+
+    def get_sql(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response, ' '.join(query['sql'] for query in queries.captured_queries)
+
+    def test_post_fields(self):
+        response, sql = self.get_sql(reverse('api:post-list'), fields='id,title')
+        self.assertEqual(response.data['results'][0].keys(), {'id', 'title'})
+        self.assertNotIn('JOIN "blog_category"', sql)
+        self.assertNotIn('rating_postrating', sql)
+        self.assertNotIn('"blog_post"."text"', sql)
+
+    def test_post_omit(self):
+        response, sql = self.get_sql(reverse('api:post-detail', kwargs={'pk': self.post.pk}), omit='text,rating')
+        self.assertNotIn('text', response.data)
+        self.assertNotIn('rating', response.data)
+        self.assertIn('title', response.data)
+        self.assertNotIn('rating_postrating', sql)
+
+    def test_all_fields_by_default(self):
+        response = self.client.get(reverse('api:post-list'), {'fields': ''})
+        self.assertIn('text', response.data['results'][0])
+        self.assertIn('comments_count', response.data['results'][0])
+
+    def test_ordering_keeps_its_annotation(self):
+        response = self.client.get(reverse('api:post-list'), {'fields': 'id', 'ordering': '-rating'})
+        self.assertEqual([row['id'] for row in response.data['results']], [self.post.pk, self.other.pk])
+
+    def test_unknown_field(self):
+        response = self.client.get(reverse('api:post-list'), {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('password', response.data['fields'])
+
+    def test_comment_fields(self):
+        self.client.force_authenticate(user=self.reader)
+        response, sql = self.get_sql(reverse('api:comment-list', kwargs={'post_id': self.post.pk}), fields='id,text')
+        self.assertEqual(response.data['results'][0], {'id': response.data['results'][0]['id'], 'text': 'Comment'})
+        self.assertNotIn('blog_post', sql.split('FROM', 2)[-1])
+        self.assertNotIn('rating_commentrating', sql)
+
+    def test_writes_ignore_sparse_fields(self):
+        self.client.force_authenticate(user=self.reader)
+        url = reverse('api:comment-list', kwargs={'post_id': self.post.pk}) + '?fields=id'
+        response = self.client.post(url, {'text': 'Reply'})
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('text', response.data)
+
+    def test_full_profile_fields(self):
+        url = reverse('api:user-profile-full', kwargs={'pk': self.user.pk})
+        response, sql = self.get_sql(url, fields='id,username')
+        self.assertEqual(response.data, {'id': self.user.pk, 'username': 'blogger'})
+        self.assertNotIn('blog_post', sql)
+        self.assertNotIn('blog_comment', sql)
+        self.assertNotIn('JOIN "users_profile"', sql)
+
+    def test_full_profile_omit(self):
+        response = self.client.get(reverse('api:user-profile-full', kwargs={'pk': self.user.pk}), {'omit': 'posts'})
+        self.assertNotIn('posts', response.data)
+        self.assertEqual(response.data['rating'], 1)
+        self.assertEqual(list(response.data)[-2:], ['subscribed', 'comments'])
@@ -0,0 +1,74 @@
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+STATIC_TAG = re.compile(r"""{% static ['"]([^'"]+)['"] %}""")
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.\w+$')
+
+
+def get_project_dirs(name):
+    """
+    `name` directories (static, templates) of the apps of this project, not of the installed packages.
+    """
+    return [
+        path for app in apps.get_app_configs()
+        if Path(app.path).is_relative_to(settings.BASE_DIR) and (path := Path(app.path) / name).is_dir()
+    ]
+
+
+class StaticFilesTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        static_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, static_root)
+        # Only the static files of the project, the admin and CKEditor ones take a while to compress
+        cls.enterClassContext(override_settings(
+            STATIC_ROOT=static_root,
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+            STATICFILES_DIRS=get_project_dirs('static'),
+            STORAGES={
+                **settings.STORAGES,
+                'staticfiles': {'BACKEND': 'common.storage.CompressedManifestStaticFilesStorage'},
+            },
+        ))
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def get_template_references(self):
+        references = set()
+        for templates_dir in [*settings.TEMPLATES[0]['DIRS'], *get_project_dirs('templates')]:
+            for template in Path(templates_dir).rglob('*.html'):
+                references.update(STATIC_TAG.findall(template.read_text()))
+        return references
+
+    def test_template_references_are_hashed(self):
+        references = self.get_template_references()
+        self.assertIn('blog/js/comments.js', references)
+        for name in references:
+            with self.subTest(name=name):
+                hashed_name = staticfiles_storage.stored_name(name)
+                self.assertRegex(hashed_name, HASHED_NAME)
+                self.assertTrue(staticfiles_storage.exists(hashed_name))
+
+    def test_compressed_variants(self):
+        hashed_name = staticfiles_storage.stored_name('blog/css/bootstrap.min.css')
+        size = staticfiles_storage.size(hashed_name)
+        self.assertLess(staticfiles_storage.size(hashed_name + '.gz'), size)
+        # Nginx serves only gzip_static variants
+        self.assertFalse(staticfiles_storage.exists(hashed_name + '.br'))
+        # Images are not compressed
+        self.assertFalse(staticfiles_storage.exists(staticfiles_storage.stored_name('favicon.png') + '.gz'))
+
+    def test_page_uses_hashed_names(self):
+        content = self.client.get(reverse('blog:posts')).content.decode()
+        self.assertIn(staticfiles_storage.url('blog/css/styles.css'), content)
+        self.assertNotIn('/static/blog/css/styles.css"', content)
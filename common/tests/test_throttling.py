@@ -0,0 +1,122 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog.models import Author, Category, Post
+from common.ratelimit import LocMemRateLimitBackend, RedisRateLimitBackend, get_backend
+
+User = get_user_model()
+
+
+def throttle_rates(**rates):
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {**settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], **rates},
+    })
+
+
+class LocMemRateLimitBackendTest(SimpleTestCase):
+
+    def test_requests_are_spread_over_the_period(self):
+        backend = LocMemRateLimitBackend()
+        with freeze_time() as frozen:
+            self.assertEqual(backend.hit('client', 2, 60), 0)
+            self.assertEqual(backend.hit('client', 2, 60), 0)
+            self.assertEqual(backend.hit('client', 2, 60), 30)
+            self.assertEqual(backend.hit('other', 2, 60), 0)
+
+            frozen.tick(timedelta(seconds=30))
+            self.assertEqual(backend.hit('client', 2, 60), 0)
+            self.assertEqual(backend.hit('client', 2, 60), 30)
+
+    def test_one_entry_per_key(self):
+        backend = LocMemRateLimitBackend(max_entries=2)
+        with freeze_time() as frozen:
+            for _ in range(10):
+                backend.hit('client', 100, 60)
+            backend.hit('other', 100, 60)
+            frozen.tick(timedelta(minutes=1))
+            backend.hit('third', 100, 60)
+        self.assertEqual(list(backend._tats), ['third'])
+
+
+class RedisRateLimitBackendTest(SimpleTestCase):
+
+    def test_unavailable_redis_allows_requests(self):
+        backend = RedisRateLimitBackend('redis://127.0.0.1:1/0', key_prefix='test')
+        with self.assertLogs('common.ratelimit', 'WARNING'):
+            self.assertEqual(backend.hit('client', 1, 60), 0)
+
+
+class ThrottlingAPITest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='blogger', password='1X<ISRUkw+tuK', email='em@il.com')
+        cls.author = Author.objects.create(user=cls.user, bio='Biography')
+        cls.category = Category.objects.create(title='Python')
+        cls.posts = [
+            Post.objects.create(author=cls.author, category=cls.category, title=f'Post {i}', text='...')
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        get_backend().clear()
+
+    @throttle_rates(votes='2/min')
+    def test_votes_are_limited_per_user(self):
+        self.client.force_authenticate(user=self.user)
+        for post in self.posts[:2]:
+            response = self.client.post(reverse('api:post-like', kwargs={'pk': post.pk}))
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.post(reverse('api:post-like', kwargs={'pk': self.posts[2].pk}))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '30')
+
+        # Reads are not counted by the write scopes
+        response = self.client.get(reverse('api:post-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @throttle_rates(subscriptions='1/min')
+    def test_subscriptions_are_limited(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('api:category-subscribe', kwargs={'pk': self.category.pk}))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(reverse('api:category-unsubscribe', kwargs={'pk': self.category.pk}))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @throttle_rates(comments='1/min')
+    def test_comments_are_limited(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse('api:comment-list', kwargs={'post_id': self.posts[0].pk})
+        response = self.client.post(url, {'text': 'First'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(url, {'text': 'Second'})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @throttle_rates(login='2/min')
+    def test_login_is_limited(self):
+        url = reverse('api:jwt-create')
+        for _ in range(2):
+            response = self.client.post(url, {'username': 'blogger', 'password': 'wrong'})
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(url, {'username': 'blogger', 'password': '1X<ISRUkw+tuK'})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @throttle_rates(anon='1/day')
+    def test_anonymous_reads_are_limited(self):
+        self.assertEqual(self.client.get(reverse('api:post-list')).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(reverse('api:post-list')).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get(reverse('api:post-list')).status_code, status.HTTP_200_OK)
+
+    def test_rates_are_disabled_in_tests(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get(reverse('api:post-list')).status_code, status.HTTP_200_OK)
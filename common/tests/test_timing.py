@@ -0,0 +1,99 @@
+import contextvars
+import json
+import threading
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from blog.models import Author, Category, Post
+from common import timing
+
+User = get_user_model()
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(', '):
+        name, *params = metric.split('; ')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+class TimingDataMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(username='staff', password='1X<ISRUkw+tuK', email='st@ff.com',
+                                             is_staff=True)
+        cls.user = User.objects.create_user(username='user', password='1X<ISRUkw+tuK', email='us@er.com')
+        author = Author.objects.create(user=cls.staff, bio='Biography')
+        category = Category.objects.create(title='Python')
+        Post.objects.create(author=author, category=category, title='Post', text='...')
+
+
+class ServerTimingMiddlewareTest(TimingDataMixin, APITestCase):
+
+    def test_staff_gets_header(self):
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.get(reverse('api:post-list'))
+        metrics = parse_server_timing(response['Server-Timing'])
+        self.assertEqual(list(metrics), ['db', 'cache', 'serialize', 'render', 'total'])
+        self.assertEqual(metrics['serialize']['desc'], '"Serializers (1)"')
+        self.assertNotEqual(metrics['db']['desc'], '"Database (0)"')
+        self.assertGreaterEqual(float(metrics['total']['dur']), float(metrics['db']['dur']))
+
+    def test_other_requests_are_logged(self):
+        self.client.force_authenticate(user=self.user)
+        with self.assertLogs('common.timing', 'INFO') as logs:
+            response = self.client.get(reverse('api:post-list'))
+        self.assertNotIn('Server-Timing', response)
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['path'], reverse('api:post-list'))
+        self.assertEqual(line['status'], 200)
+        self.assertEqual(line['serialize_count'], 1)
+        self.assertGreater(line['db_count'], 0)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+    def test_sampled_requests_get_header(self):
+        response = self.client.get(reverse('blog:posts'))
+        metrics = parse_server_timing(response['Server-Timing'])
+        self.assertEqual(metrics['render']['desc'], '"Templates (1)"')
+
+
+class TimingCollectTest(TimingDataMixin, TestCase):
+
+    def test_queries_are_counted(self):
+        with timing.collect() as timings:
+            list(Post.objects.all())
+            Category.objects.count()
+        self.assertEqual(timings.counts['db'], 2)
+        self.assertIsNotNone(timings.total)
+
+    def test_queries_of_other_threads_are_counted(self):
+        # Like the ORM calls of async views, which `sync_to_async` runs in a thread with the request context
+        def query():
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            connection.close()
+
+        with timing.collect() as timings:
+            thread = threading.Thread(target=contextvars.copy_context().run, args=(query,))
+            thread.start()
+            thread.join()
+        self.assertEqual(timings.counts['db'], 1)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'common.cache.LocMemCache'}})
+    def test_cache_calls_are_counted_once(self):
+        cache = caches['default']
+        with timing.collect() as timings:
+            cache.set('key', 1)
+            # get_or_set calls get() and add() internally
+            cache.get_or_set('other', 2)
+        self.assertEqual(timings.counts['cache'], 2)
+
+    def test_outside_of_request(self):
+        with timing.measure('db'):
+            Post.objects.count()
@@ -0,0 +1,73 @@
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from common.ratelimit import get_backend
+
+
+class RateLimitThrottle(SimpleRateThrottle):
+    """
+    `SimpleRateThrottle` with the counting done by the rate limit backend (`common.ratelimit`)
+    instead of a list of timestamps in the cache.
+
+    Rates are read from `DEFAULT_THROTTLE_RATES` on every request; a scope with the rate `None` is not throttled.
+    """
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_rate(self):
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        if self.scope not in rates:
+            raise ImproperlyConfigured(f"No default throttle rate set for '{self.scope}' scope")
+        return rates[self.scope]
+
+    def allow_request(self, request, view):
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        num_requests, duration = self.parse_rate(self.rate)
+        self.wait_seconds = get_backend().hit(key, num_requests, duration)
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class AnonRateLimitThrottle(RateLimitThrottle):
+    """
+    Limits the requests of anonymous users by IP address (`anon` rate).
+    """
+    scope = 'anon'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class ScopedWriteRateLimitThrottle(RateLimitThrottle):
+    """
+    Limits the writes (non-safe methods) to views with a `throttle_scope`, per user
+    or per IP address for anonymous requests. Reads are not counted.
+    """
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, 'throttle_scope', None)
+        if not self.scope or request.method in SAFE_METHODS:
+            return True
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
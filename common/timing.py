@@ -0,0 +1,126 @@
+"""
+Per-request performance breakdown: where the time of a request went (database, cache,
+DRF serialization, template rendering). Collected by `common.middlewares.timing.ServerTimingMiddleware`.
+"""
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# name: Server-Timing description
+METRICS = {
+    'db': 'Database',
+    'cache': 'Cache',
+    'serialize': 'Serializers',
+    'render': 'Templates',
+}
+
+_current = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = None
+        self.durations = dict.fromkeys(METRICS, 0.0)
+        self.counts = dict.fromkeys(METRICS, 0)
+        self._active = set()
+
+    @contextmanager
+    def measure(self, name):
+        """
+        Add the time of the block to `name`. Nested blocks of the same name (a template including
+        another one, `get_or_set` calling `get`) are counted once.
+        """
+        if name in self._active:
+            yield
+            return
+        self._active.add(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] += time.perf_counter() - started
+            self.counts[name] += 1
+            self._active.discard(name)
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+
+    def as_dict(self):
+        data = {'total_ms': round(self.total * 1000, 2)}
+        for name in METRICS:
+            data[f'{name}_ms'] = round(self.durations[name] * 1000, 2)
+            data[f'{name}_count'] = self.counts[name]
+        return data
+
+    def server_timing(self):
+        metrics = [
+            f'{name}; dur={self.durations[name] * 1000:.2f}; desc="{description} ({self.counts[name]})"'
+            for name, description in METRICS.items()
+        ]
+        metrics.append(f'total; dur={self.total * 1000:.2f}')
+        return ', '.join(metrics)
+
+
+@contextmanager
+def collect():
+    """
+    Collect the timings of the code in the block, including the queries to every database.
+    The queries are timed by the wrapper of every connection (`install_query_timer`), so the ones
+    run in other threads with the context of the block (`sync_to_async` under ASGI) are counted too.
+    """
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+        timings.finish()
+
+
+def measure(name):
+    timings = _current.get()
+    return nullcontext() if timings is None else timings.measure(name)
+
+
+def time_query(execute, sql, params, many, context):
+    with measure('db'):
+        return execute(sql, params, many, context)
+
+
+@receiver(connection_created, dispatch_uid='common.install_query_timer')
+def install_query_timer(sender, connection, **kwargs):
+    # Outside of `collect()` the wrapper only passes the query through
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, time_query)
+
+
+def timed(name):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument():
+    """
+    Time DRF serialization (`serializer.data`) and Django template rendering.
+    Called once from `CommonConfig.ready`; outside of a request the wrappers only pass the call through.
+    """
+    from django.template.backends.django import Template
+    from rest_framework.serializers import BaseSerializer
+
+    if getattr(BaseSerializer.data.fget, 'timed', False):
+        return
+    BaseSerializer.data = property(timed('serialize')(BaseSerializer.data.fget))
+    BaseSerializer.data.fget.timed = True
+    Template.render = timed('render')(Template.render)
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from common.api.views import health as api_health
+
+drf_urlpatterns = [
+    path('health/db/', api_health.DatabaseHealthAPIView.as_view(), name='health-db'),
+]
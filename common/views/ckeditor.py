@@ -0,0 +1,83 @@
+import hashlib
+import os
+
+from ckeditor_uploader import utils
+from ckeditor_uploader.backends import get_backend
+from ckeditor_uploader.views import ImageUploadView, _get_user_path
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from django.utils.html import escape
+from django.views.decorators.csrf import csrf_exempt
+
+from common.models.ckeditor import CKEditorPostImages
+from common.tasks.image import delete_image, resize_image
+
+
+def get_digest(uploaded_file):
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+class ContentAddressedUploadView(ImageUploadView):
+    """
+    CKEditor upload that stores every content once, under `uploads/<user>/<sha256[:2]>/<sha256>.<ext>`.
+
+    An upload of a content that is already stored (the same image pasted into several posts) returns
+    the URL of the stored file without saving anything. A new file is recorded as `CKEditorPostImages`
+    and resized by a task; the post signals count the posts that use it (`common.signals.ckeditor`).
+    """
+
+    def post(self, request, **kwargs):
+        uploaded_file = request.FILES.get('upload')
+        if uploaded_file is None:
+            return super().post(request, **kwargs)
+
+        digest = get_digest(uploaded_file)
+        image = CKEditorPostImages.objects.filter(digest=digest).first()
+        # Not deleted as unused while the post it was pasted into is being written. No row is updated when
+        # a cleanup task deleted it in the meantime, its file is being deleted too and the upload is stored again.
+        if image is None or not CKEditorPostImages.objects.filter(pk=image.pk).update(uploaded_at=timezone.now()):
+            filewrapper = get_backend()(utils.storage, uploaded_file)
+            if not filewrapper.is_image and not getattr(settings, 'CKEDITOR_ALLOW_NONIMAGE_FILES', True):
+                # Answered with the error of the original view
+                return super().post(request, **kwargs)
+            image = self.store(request, uploaded_file, filewrapper, digest)
+        return self.respond(request, image.uri)
+
+    def store(self, request, uploaded_file, filewrapper, digest):
+        extension = os.path.splitext(uploaded_file.name)[1].lower()
+        filepath = os.path.join(
+            settings.CKEDITOR_UPLOAD_PATH, _get_user_path(request.user), digest[:2], digest + extension,
+        )
+        uri = utils.get_media_url(filewrapper.save_as(filepath))
+        try:
+            with transaction.atomic():
+                image = CKEditorPostImages.objects.create(uri=uri, digest=digest)
+        except IntegrityError:
+            # The same content was uploaded at the same time, the first file is used
+            image = CKEditorPostImages.objects.get(digest=digest)
+            if image.uri != uri:
+                delete_image.delay_on_commit(uri)
+            return image
+        resize_image.delay_on_commit(image.uri)
+        return image
+
+    @staticmethod
+    def respond(request, url):
+        ck_func_num = request.GET.get('CKEditorFuncNum')
+        if ck_func_num:
+            # Respond with Javascript sending ckeditor upload url, like the original view
+            return HttpResponse(
+                "<script type='text/javascript'>"
+                f"window.parent.CKEDITOR.tools.callFunction({escape(ck_func_num)}, '{url}');"
+                "</script>"
+            )
+        return JsonResponse({'url': url, 'uploaded': '1', 'fileName': os.path.basename(url)})
+
+
+upload = csrf_exempt(ContentAddressedUploadView.as_view())
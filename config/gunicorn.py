@@ -0,0 +1,19 @@
+"""
+Gunicorn settings, `gunicorn -c config/gunicorn.py` (docker/scripts/server-entrypoint.sh).
+The hooks keep the Prometheus multiprocess directory of common.metrics clean.
+"""
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+
+def on_starting(server):
+    from common import metrics
+
+    metrics.remove_host_files()
+
+
+def child_exit(server, worker):
+    from common import metrics
+
+    metrics.mark_process_dead(worker.pid)
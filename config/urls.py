@@ -14,7 +14,7 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from ckeditor_uploader.views import upload, browse
+from ckeditor_uploader.views import browse
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth.decorators import permission_required
@@ -23,6 +23,8 @@ from django.views.decorators.cache import never_cache
 from django.views.generic import RedirectView
 from drf_spectacular.views import SpectacularAPIView
 
+from common.views.ckeditor import upload
+
 from . import settings
 
 admin.site.site_header = 'Blog project'
@@ -21,6 +21,12 @@ fi
 poetry run python manage.py migrate --noinput
 poetry run python manage.py create_default_groups
 poetry run python manage.py collectstatic --noinput
-poetry run gunicorn --bind 0.0.0.0:8000 config.wsgi:application
+if [ "$SERVER_MODE" = "asgi" ]
+then
+    # WEB_CONCURRENCY sets the number of workers for both modes
+    poetry run gunicorn -c config/gunicorn.py --bind 0.0.0.0:8000 --worker-class uvicorn.workers.UvicornWorker config.asgi:application
+else
+    poetry run gunicorn -c config/gunicorn.py --bind 0.0.0.0:8000 config.wsgi:application
+fi
 
 exec "$@"
\ No newline at end of file
@@ -0,0 +1,24 @@
+from django.db import connections, transaction
+
+DELETE_BATCH_SIZE = 10_000
+
+
+def delete_neutral_votes(rating_model, batch_size=DELETE_BATCH_SIZE, using='default'):
+    """
+    Delete the `vote = 0` rows of a rating table in batches of `batch_size` rows.
+
+    A missing row already means a neutral vote, so the rows do not change any rating. Every batch is
+    a separate transaction to keep locks short on large tables. Plain SQL is used, so the rows are
+    not loaded and no delete signals are sent. Returns the number of deleted rows.
+    """
+    table = connections[using].ops.quote_name(rating_model._meta.db_table)
+    sql = f'DELETE FROM {table} WHERE id IN (SELECT id FROM {table} WHERE vote = 0 LIMIT %s)'
+
+    deleted = 0
+    while True:
+        with transaction.atomic(using=using), connections[using].cursor() as cursor:
+            cursor.execute(sql, [batch_size])
+            batch = cursor.rowcount
+        deleted += batch
+        if batch < batch_size:
+            return deleted
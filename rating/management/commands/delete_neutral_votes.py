@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from rating.compaction import DELETE_BATCH_SIZE, delete_neutral_votes
+from rating.models import CommentRating, PostRating
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes neutral (vote = 0) rows from the rating tables in batches. "
+        "A missing row means a neutral vote, the rows only make the rating tables and SUM(vote) scans larger."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DELETE_BATCH_SIZE,
+                            help='Rows deleted per transaction.')
+
+    def handle(self, *args, **options):
+        for model in (PostRating, CommentRating):
+            deleted = delete_neutral_votes(model, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'{model.__name__}: deleted {deleted} neutral votes'))
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+from rating.compaction import delete_neutral_votes
+
+
+def delete_neutral_rows(apps, schema_editor):
+    for model_name in ('PostRating', 'CommentRating'):
+        delete_neutral_votes(apps.get_model('rating', model_name), using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+    # Commit every batch separately instead of holding one transaction over the whole table
+    atomic = False
+
+    dependencies = [
+        ('rating', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_neutral_rows, migrations.RunPython.noop),
+    ]
@@ -11,6 +11,7 @@ from rating.models import Vote
 
 class VoteAPIMixin(CreateAPIView):
     permission_classes = (IsAuthenticated,)
+    throttle_scope = 'votes'
     rating_model = None
     vote: Optional[Vote.VoteType] = None
     success_message: Optional[str] = None
@@ -30,16 +31,17 @@ class VoteAPIMixin(CreateAPIView):
             owner=request.user.pk
         ).first()
 
+        if vote_obj and vote_obj.vote == self.vote:
+            # If the existing vote is equal to the vote entered by the user - remove it (neutral vote).
+            vote_obj.delete()
+            return Response({'success': self.vote_removed_message}, status=status.HTTP_200_OK)
+
         if not vote_obj:
             resp = {'data': {'success': self.success_message}, 'status': status.HTTP_201_CREATED}
-        elif vote_obj.vote != self.vote:
-            resp = {'data': {'success': self.success_message}, 'status': status.HTTP_200_OK}
         else:
-            # If the existing vote is equal to the vote entered by the user - make it neutral.
-            data['vote'] = Vote.VoteType.NEUTRAL
-            resp = {'data': {'success': self.vote_removed_message}, 'status': status.HTTP_200_OK}
+            resp = {'data': {'success': self.success_message}, 'status': status.HTTP_200_OK}
 
-        serializer = self.serializer_class(instance=vote_obj or None, data=data)
+        serializer = self.serializer_class(instance=vote_obj, data=data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
 
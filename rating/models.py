@@ -22,6 +22,17 @@ class Vote(models.Model):
             ),
         )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The vote as it is stored, used to compute the rating change on save
+        instance.stored_vote = instance.__dict__.get('vote')
+        return instance
+
+    @property
+    def rating_delta(self):
+        return self.vote - (getattr(self, 'stored_vote', None) or 0)
+
 
 class CommentRating(Vote):
     obj = models.ForeignKey('blog.Comment', on_delete=models.CASCADE, related_name='votes')
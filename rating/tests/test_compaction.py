@@ -0,0 +1,45 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from blog.models import Author, Category, Comment, Post
+from rating.compaction import delete_neutral_votes
+from rating.models import CommentRating, PostRating
+
+User = get_user_model()
+
+
+class DeleteNeutralVotesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(username=f'user{i}', password='1X<ISRUkw+tuK', email=f'em{i}@il.com')
+            for i in range(5)
+        ]
+        author = Author.objects.create(user=cls.users[0], bio='Biography')
+        category = Category.objects.create(title='BlogCategory')
+        cls.post = Post.objects.create(author=author, category=category, title='Post 1', text='Content 1')
+        cls.comment = Comment.objects.create(author=cls.users[0], post=cls.post, text='Comment 1')
+        PostRating.objects.bulk_create([
+            PostRating(obj=cls.post, owner=user, vote=vote) for user, vote in zip(cls.users, [0, 0, 0, 1, -1])
+        ])
+        CommentRating.objects.bulk_create([
+            CommentRating(obj=cls.comment, owner=user, vote=vote) for user, vote in zip(cls.users, [0, 1])
+        ])
+
+    def test_deletes_neutral_rows_in_batches(self):
+        # A full batch of two rows and a short last batch, each in its own savepoint
+        with self.assertNumQueries(6):
+            self.assertEqual(delete_neutral_votes(PostRating, batch_size=2), 3)
+        self.assertEqual(sorted(PostRating.objects.values_list('vote', flat=True)), [-1, 1])
+
+    def test_command(self):
+        out = StringIO()
+        call_command('delete_neutral_votes', batch_size=100, stdout=out)
+        self.assertIn('PostRating: deleted 3 neutral votes', out.getvalue())
+        self.assertIn('CommentRating: deleted 1 neutral votes', out.getvalue())
+        self.assertFalse(PostRating.objects.filter(vote=0).exists())
+        self.assertFalse(CommentRating.objects.filter(vote=0).exists())
+        self.assertTrue(CommentRating.objects.filter(vote=1).exists())
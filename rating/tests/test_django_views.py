@@ -28,6 +28,12 @@ class ChangePostRatingViewTest(TestCase):
         post_rating = PostRating.objects.get(obj=self.post, owner=self.user_who_rates)
         self.assertEqual(post_rating.vote, Vote.VoteType.LIKE.value)
 
+    def test_post_vote_from_script_returns_new_state(self):
+        response = self.client.get(reverse('rating:post-rating', args=[self.post.pk, 'LIKE']),
+                                   headers={'X-Requested-With': 'XMLHttpRequest'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'rating': 1, 'user_vote': Vote.VoteType.LIKE.value})
+
     def test_post_like_toggle_to_neutral(self):
         self.client.get(reverse('rating:post-rating', args=[self.post.pk, 'LIKE']))
         post_rating = PostRating.objects.get(obj=self.post, owner=self.user_who_rates)
@@ -35,8 +41,8 @@ class ChangePostRatingViewTest(TestCase):
 
         response = self.client.get(reverse('rating:post-rating', args=[self.post.pk, 'LIKE']))
         self.assertEqual(response.status_code, 302)
-        post_rating.refresh_from_db()
-        self.assertEqual(post_rating.vote, Vote.VoteType.NEUTRAL.value)
+        # Removed votes are deleted, a missing row means a neutral vote
+        self.assertFalse(PostRating.objects.filter(pk=post_rating.pk).exists())
 
     def test_post_dislike_initial(self):
         response = self.client.get(reverse('rating:post-rating', args=[self.post.pk, 'DISLIKE']))
@@ -51,8 +57,8 @@ class ChangePostRatingViewTest(TestCase):
 
         response = self.client.get(reverse('rating:post-rating', args=[self.post.pk, 'DISLIKE']))
         self.assertEqual(response.status_code, 302)
-        post_rating.refresh_from_db()
-        self.assertEqual(post_rating.vote, Vote.VoteType.NEUTRAL.value)
+        # Removed votes are deleted, a missing row means a neutral vote
+        self.assertFalse(PostRating.objects.filter(pk=post_rating.pk).exists())
 
     def test_change_current_vote(self):
         response = self.client.get(reverse('rating:post-rating', args=[self.post.pk, 'DISLIKE']))
@@ -109,8 +115,8 @@ class ChangeCommentRatingViewTest(TestCase):
 
         response = self.client.get(reverse('rating:comment-rating', args=[self.post.pk, self.comment.pk, 'LIKE']))
         self.assertEqual(response.status_code, 302)
-        comment_rating.refresh_from_db()
-        self.assertEqual(comment_rating.vote, Vote.VoteType.NEUTRAL.value)
+        # Removed votes are deleted, a missing row means a neutral vote
+        self.assertFalse(CommentRating.objects.filter(pk=comment_rating.pk).exists())
 
     def test_comment_dislike_initial(self):
         response = self.client.get(reverse('rating:comment-rating', args=[self.post.pk, self.comment.pk, 'DISLIKE']))
@@ -125,8 +131,8 @@ class ChangeCommentRatingViewTest(TestCase):
 
         response = self.client.get(reverse('rating:comment-rating', args=[self.post.pk, self.comment.pk, 'DISLIKE']))
         self.assertEqual(response.status_code, 302)
-        comment_rating.refresh_from_db()
-        self.assertEqual(comment_rating.vote, Vote.VoteType.NEUTRAL.value)
+        # Removed votes are deleted, a missing row means a neutral vote
+        self.assertFalse(CommentRating.objects.filter(pk=comment_rating.pk).exists())
 
     def test_change_current_vote(self):
         self.client.get(reverse('rating:comment-rating', args=[self.post.pk, self.comment.pk, 'DISLIKE']))
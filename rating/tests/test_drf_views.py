@@ -41,8 +41,8 @@ class PostLikeDislikeAPIViewTest(APITestCase):
         response = self.client.post(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['success'], 'Like from post removed successfully')
-        post_rating.refresh_from_db()
-        self.assertEqual(post_rating.vote, Vote.VoteType.NEUTRAL.value)
+        # Removed votes are deleted, a missing row means a neutral vote
+        self.assertFalse(PostRating.objects.filter(pk=post_rating.pk).exists())
 
     def test_post_dislike_initial(self):
         url = reverse('api:post-dislike', kwargs={'pk': self.post.pk})
@@ -61,8 +61,8 @@ class PostLikeDislikeAPIViewTest(APITestCase):
         response = self.client.post(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['success'], 'Dislike from post removed successfully')
-        post_rating.refresh_from_db()
-        self.assertEqual(post_rating.vote, Vote.VoteType.NEUTRAL.value)
+        # Removed votes are deleted, a missing row means a neutral vote
+        self.assertFalse(PostRating.objects.filter(pk=post_rating.pk).exists())
 
     def test_change_current_vote(self):
         url = reverse('api:post-like', kwargs={'pk': self.post.pk})
@@ -124,8 +124,8 @@ class CommentLikeDislikeAPIViewTest(APITestCase):
         response = self.client.post(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['success'], 'Like from comment removed successfully')
-        comment_rating.refresh_from_db()
-        self.assertEqual(comment_rating.vote, Vote.VoteType.NEUTRAL.value)
+        # Removed votes are deleted, a missing row means a neutral vote
+        self.assertFalse(CommentRating.objects.filter(pk=comment_rating.pk).exists())
 
     def test_comment_dislike_initial(self):
         url = reverse('api:comment-dislike', kwargs={'pk': self.comment.pk})
@@ -144,8 +144,8 @@ class CommentLikeDislikeAPIViewTest(APITestCase):
         response = self.client.post(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['success'], 'Dislike from comment removed successfully')
-        comment_rating.refresh_from_db()
-        self.assertEqual(comment_rating.vote, Vote.VoteType.NEUTRAL.value)
+        # Removed votes are deleted, a missing row means a neutral vote
+        self.assertFalse(CommentRating.objects.filter(pk=comment_rating.pk).exists())
 
     def test_change_current_vote(self):
         url = reverse('api:comment-like', kwargs={'pk': self.comment.pk})
@@ -1,9 +1,11 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponseBadRequest
+from django.db.models import Sum
+from django.http import HttpResponseBadRequest, JsonResponse
 from django.shortcuts import redirect, get_object_or_404
 
 from blog.models import Comment, Post
+from common.middlewares.database import writes_to_database
 from .models import PostRating, CommentRating, Vote
 
 User = get_user_model()
@@ -14,35 +16,46 @@ def change_vote(user, rating_model, pk, vote_type):
     Change or set a vote for a given rating object
 
     This function attempts to change the vote (like, dislike, neutral) associated with a model instance
-    based on the user's input. If the vote type provided is invalid, it returns an HttpResponseBadRequest.
-    Otherwise, it updates or creates a vote record in a transaction-safe way.
+    based on the user's input. Voting again with the same vote type (or voting neutral) removes the vote:
+    only likes and dislikes are stored, a missing row means a neutral vote.
+    Returns the resulting vote.
     """
     new_vote = Vote.VoteType[vote_type]
 
     vote_obj = rating_model.objects.filter(obj_id=pk, owner_id=user.id).first()
 
+    if new_vote == Vote.VoteType.NEUTRAL or (vote_obj and vote_obj.vote == new_vote.value):
+        if vote_obj:
+            vote_obj.delete()
+        return Vote.VoteType.NEUTRAL
+
     if not vote_obj:
-        vote_obj = rating_model(obj_id=pk, owner_id=user.id, vote=new_vote)
-    elif vote_obj.vote != new_vote.value:
-        vote_obj.vote = new_vote
-    else:  # If the existing vote is equal to the vote entered by the user - make it neutral.
-        vote_obj.vote = Vote.VoteType.NEUTRAL
+        vote_obj = rating_model(obj_id=pk, owner_id=user.id)
+    vote_obj.vote = new_vote
     vote_obj.save()
+    return new_vote
 
 
 @login_required
+@writes_to_database
 def change_rating(request, post_pk, vote_type, comm_pk=None):
     if vote_type not in Vote.VoteType.names:
         return HttpResponseBadRequest('Invalid vote type')
 
     if post_pk and comm_pk:
         get_object_or_404(Comment, pk=comm_pk)
-        change_vote(request.user, CommentRating, comm_pk, vote_type=vote_type)
+        rating_model, pk = CommentRating, comm_pk
     elif post_pk:
         get_object_or_404(Post, pk=post_pk)
-        change_vote(request.user, PostRating, post_pk, vote_type=vote_type)
+        rating_model, pk = PostRating, post_pk
     else:
         return HttpResponseBadRequest()
+    user_vote = change_vote(request.user, rating_model, pk, vote_type=vote_type)
+
+    # Votes sent by the post page script: answer with the new state instead of reloading the page.
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        rating = rating_model.objects.filter(obj_id=pk).aggregate(rating=Sum('vote'))['rating']
+        return JsonResponse({'rating': rating or 0, 'user_vote': user_vote})
 
     next_page = request.GET.get('next', '/')
     return redirect(next_page)
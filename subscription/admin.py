@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import UserSubscription, CategorySubscription, Favorite
+from .models import UserSubscription, CategorySubscription, Favorite, Notification
 
 
 @admin.register(UserSubscription)
@@ -34,3 +34,15 @@ class FavoriteAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('user', 'post')
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ['recipient', 'post', 'is_read', 'created_at']
+    readonly_fields = ['recipient', 'post', 'created_at']
+    list_filter = ['is_read']
+    search_fields = ['recipient__username', 'post__title']
+    search_help_text = f"search in: {', '.join(search_fields)}"
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('recipient', 'post')
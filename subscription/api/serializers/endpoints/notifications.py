@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+from subscription.models import Notification
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    post_title = serializers.ReadOnlyField(source='post.title')
+
+    class Meta:
+        model = Notification
+        fields = ('id', 'post', 'post_title', 'is_read', 'created_at')
+        read_only_fields = fields
+
+
+class UnreadCountSerializer(serializers.Serializer):
+    unread = serializers.IntegerField()
+
+
+class MarkReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=1000,
+        help_text='Notifications to mark as read, all unread notifications if omitted.'
+    )
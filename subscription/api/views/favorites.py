@@ -10,6 +10,7 @@ from rest_framework.views import APIView
 from blog.api.serializers.endpoints import posts as post_s
 from blog.filters import PostFilterSet
 from blog.models import Post
+from common.mixins.views import SparseFieldsViewMixin, sparse_fields_parameters
 from subscription.api.serializers.endpoints.favorites import FavoriteSerializer
 from subscription.models import Favorite
 
@@ -64,13 +65,15 @@ class RemoveFavoriteAPIView(APIView):
     get=extend_schema(
         description="Returns a list of posts that the current user has added to their favorites.",
         summary='My favorite posts',
-        tags=['Favorites']
+        tags=['Favorites'],
+        responses=post_s.PostSerializer,
+        parameters=sparse_fields_parameters,
     ),
 )
-class MyFavoritesAPIView(ListAPIView):
+class MyFavoritesAPIView(SparseFieldsViewMixin, ListAPIView):
     queryset = Post.objects.all()
     permission_classes = (IsAuthenticated,)
-    serializer_class = post_s.PostSerializer
+    serializer_class = post_s.PostFastListSerializer
     filter_backends = (
         DjangoFilterBackend,
     )
@@ -78,4 +81,4 @@ class MyFavoritesAPIView(ListAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        return Post.objects.get_posts_list(user=user).filter(favorites__user=user)
+        return Post.objects.get_posts_list(user=user, fields=self.get_query_fields()).filter(favorites__user=user)
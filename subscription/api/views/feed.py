@@ -6,19 +6,22 @@ from rest_framework.permissions import IsAuthenticated
 from blog.api.serializers.endpoints import posts as post_s
 from blog.filters import PostFilterSet
 from blog.models import Post
+from common.mixins.views import SparseFieldsViewMixin, sparse_fields_parameters
 
 
 @extend_schema_view(
     get=extend_schema(
         description="Returns a personalized feed with posts from users/categories the current user is subscribed to.",
         summary='My feed',
-        tags=['Subscriptions']
+        tags=['Subscriptions'],
+        responses=post_s.PostSerializer,
+        parameters=sparse_fields_parameters,
     ),
 )
-class MyFeedAPIView(generics.ListAPIView):
+class MyFeedAPIView(SparseFieldsViewMixin, generics.ListAPIView):
     queryset = Post.objects.all()
     permission_classes = (IsAuthenticated,)
-    serializer_class = post_s.PostSerializer
+    serializer_class = post_s.PostFastListSerializer
     filter_backends = (
         DjangoFilterBackend,
     )
@@ -26,4 +29,4 @@ class MyFeedAPIView(generics.ListAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        return Post.objects.get_user_feed(user=user)
+        return Post.objects.get_user_feed(user=user, fields=self.get_query_fields())
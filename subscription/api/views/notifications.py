@@ -0,0 +1,73 @@
+from drf_spectacular.utils import extend_schema_view, extend_schema
+from rest_framework import generics
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from subscription import notifications
+from subscription.api.serializers.endpoints import notifications as notification_s
+from subscription.models import Notification
+
+
+class NotificationCursorPagination(CursorPagination):
+    """
+    Keyset pagination of the inbox over the (recipient, -id) index.
+    """
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+@extend_schema_view(
+    get=extend_schema(
+        description="Returns the notifications about new posts of the users and categories "
+                    "the current user is subscribed to, newest first.",
+        summary='My notifications',
+        tags=['Notifications']
+    ),
+)
+class MyNotificationsAPIView(generics.ListAPIView):
+    permission_classes = (IsAuthenticated,)
+    serializer_class = notification_s.NotificationSerializer
+    pagination_class = NotificationCursorPagination
+
+    def get_queryset(self):
+        return Notification.objects.filter(recipient=self.request.user).select_related('post')
+
+
+@extend_schema_view(
+    get=extend_schema(
+        description="Returns the number of unread notifications of the current user.",
+        summary='Unread notifications count',
+        tags=['Notifications'],
+        responses=notification_s.UnreadCountSerializer,
+    ),
+)
+class UnreadNotificationsCountAPIView(APIView):
+    permission_classes = (IsAuthenticated,)
+    serializer_class = notification_s.UnreadCountSerializer
+
+    def get(self, request, *args, **kwargs):
+        return Response({'unread': notifications.get_unread_count(request.user)})
+
+
+@extend_schema_view(
+    post=extend_schema(
+        description="Marks the given notifications of the current user as read, "
+                    "or all of them if no `ids` are given.",
+        summary='Mark notifications as read',
+        tags=['Notifications'],
+        request=notification_s.MarkReadSerializer,
+        responses=notification_s.UnreadCountSerializer,
+    ),
+)
+class MarkNotificationsReadAPIView(APIView):
+    permission_classes = (IsAuthenticated,)
+    serializer_class = notification_s.MarkReadSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        notifications.mark_read(request.user, serializer.validated_data.get('ids'))
+        return Response({'unread': notifications.get_unread_count(request.user)})
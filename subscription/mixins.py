@@ -10,6 +10,7 @@ from rest_framework.response import Response
 
 class SubscriptionMixin(CreateAPIView):
     permission_classes = (IsAuthenticated,)
+    throttle_scope = 'subscriptions'
     subscription_model = None
     related_model = None
     action: str = None
@@ -49,3 +49,41 @@ class UserSubscription(models.Model):
 
     def __str__(self):
         return f'{self.subscriber} subscribed to user: {self.subscribed_to}'
+
+
+class Notification(models.Model):
+    """
+    Inbox entry about a new post of a followed author or category.
+    Created in bulk by `subscription.tasks.notify_subscribers`.
+    """
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    post = models.ForeignKey('blog.Post', on_delete=models.CASCADE, related_name='notifications')
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ('-id',)
+        constraints = (
+            models.UniqueConstraint(
+                fields=['recipient', 'post'],
+                name='unique_notification'
+            ),
+        )
+        indexes = (
+            models.Index(fields=['recipient', '-id'], name='subscription_inbox_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.recipient}: {self.post}'
+
+
+class NotificationCounter(models.Model):
+    """
+    Number of unread notifications of a user, so the badge does not need a COUNT(*) over the inbox.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True,
+                                related_name='notification_counter')
+    unread = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.user}: {self.unread} unread'
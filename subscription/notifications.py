@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q
+from django.db.models.functions import Greatest
+
+from blog.models import Post
+from subscription.models import CategorySubscription, Notification, NotificationCounter, UserSubscription
+
+User = get_user_model()
+
+# Followers handled in one `bulk_create`, see `notify_subscribers`
+NOTIFY_CHUNK_SIZE = 1000
+
+
+def get_followers(post):
+    """
+    Users subscribed to the author or to the category of the post, each user once.
+
+    Two EXISTS conditions instead of a join over both subscription tables, so a user who follows
+    both the author and the category is not returned twice. The author is not notified of their own post.
+    """
+    author_user_id = post.author.user_id
+    return User.objects.filter(
+        Q(Exists(UserSubscription.objects.filter(subscriber=OuterRef('pk'), subscribed_to_id=author_user_id)))
+        | Q(Exists(CategorySubscription.objects.filter(subscriber=OuterRef('pk'), subscribed_to_id=post.category_id)))
+    ).exclude(pk=author_user_id)
+
+
+def notify_subscribers(post_id, chunk_size=NOTIFY_CHUNK_SIZE):
+    """
+    Put the post into the inboxes of its followers and bump their unread counters.
+
+    Followers are walked in primary key order with `pk > last pk` chunks (no OFFSET), each chunk is
+    written in its own transaction. Followers who already have the notification are skipped, so
+    a retried task does not count a post twice. Returns the number of notifications created.
+    """
+    post = Post.objects.filter(pk=post_id).select_related('author').first()
+    if post is None:
+        return 0
+
+    followers = get_followers(post).order_by('pk').values_list('pk', flat=True)
+    created = 0
+    last_pk = 0
+    while user_ids := list(followers.filter(pk__gt=last_pk)[:chunk_size]):
+        last_pk = user_ids[-1]
+        with transaction.atomic():
+            NotificationCounter.objects.bulk_create(
+                [NotificationCounter(user_id=user_id) for user_id in user_ids],
+                ignore_conflicts=True,
+            )
+            # The counters are locked before the inbox is checked: a concurrent run for the same post waits
+            # here and then skips these followers, so every notification inserted below is counted once
+            list(NotificationCounter.objects.filter(user_id__in=user_ids).order_by('pk').select_for_update()
+                 .values_list('pk', flat=True))
+            notified = set(
+                Notification.objects.filter(post_id=post_id, recipient_id__in=user_ids).values_list(
+                    'recipient_id', flat=True
+                )
+            )
+            recipients = [user_id for user_id in user_ids if user_id not in notified]
+            if not recipients:
+                continue
+            Notification.objects.bulk_create(
+                [Notification(recipient_id=user_id, post_id=post_id) for user_id in recipients],
+            )
+            NotificationCounter.objects.filter(user_id__in=recipients).update(unread=F('unread') + 1)
+        created += len(recipients)
+    return created
+
+
+def get_unread_count(user):
+    """
+    Read the unread counter of the user, a primary key lookup instead of counting the inbox.
+    """
+    return NotificationCounter.objects.filter(user=user).values_list('unread', flat=True).first() or 0
+
+
+def mark_read(user, notification_ids=None):
+    """
+    Mark the given notifications of the user (all of them by default) as read.
+    Returns the number of notifications that were unread.
+    """
+    notifications = Notification.objects.filter(recipient=user, is_read=False)
+    if notification_ids is not None:
+        notifications = notifications.filter(pk__in=notification_ids)
+    with transaction.atomic():
+        count = notifications.update(is_read=True)
+        if count:
+            NotificationCounter.objects.filter(user=user).update(unread=Greatest(F('unread') - count, 0))
+    return count
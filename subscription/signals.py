@@ -0,0 +1,39 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from blog.models import Post
+from common.models.mixins import bump_content_version
+from subscription.models import Notification, NotificationCounter, UserSubscription
+from subscription.tasks import notify_subscribers
+from users.models import Profile
+
+
+@receiver(post_save, sender=Post, dispatch_uid='subscription.queue_post_notifications')
+def queue_post_notifications(sender, instance, created, **kwargs):
+    """
+    Notify the followers of a new post in the background, after the post is committed,
+    so creating a post does not wait for a loop over its followers.
+    """
+    if created:
+        notify_subscribers.delay_on_commit(instance.pk)
+
+
+@receiver(pre_delete, sender=Post, dispatch_uid='subscription.release_post_notifications')
+def release_post_notifications(sender, instance, **kwargs):
+    """
+    The notifications of a deleted post are deleted by the cascade, the ones still unread are taken
+    off the unread counters of their recipients (a recipient has one notification per post).
+    """
+    recipients = Notification.objects.filter(post=instance, is_read=False).values('recipient_id')
+    NotificationCounter.objects.filter(user_id__in=recipients).update(unread=Greatest(F('unread') - 1, 0))
+
+
+@receiver(post_save, sender=UserSubscription, dispatch_uid='subscription.subscription_saved_content_changed')
+@receiver(post_delete, sender=UserSubscription, dispatch_uid='subscription.subscription_deleted_content_changed')
+def bump_profile_content_version(sender, instance, **kwargs):
+    """
+    The profile shows its subscriber count and whether the viewer is subscribed.
+    """
+    bump_content_version(Profile.objects.filter(pk=instance.subscribed_to_id))
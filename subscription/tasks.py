@@ -0,0 +1,12 @@
+from celery import shared_task
+
+from subscription import notifications
+
+
+@shared_task(ignore_result=True)
+def notify_subscribers(post_id: int) -> int:
+    """
+    Deliver a new post to the inboxes of the followers of its author and category.
+    Queued once per post by `subscription.signals.queue_post_notifications`.
+    """
+    return notifications.notify_subscribers(post_id)
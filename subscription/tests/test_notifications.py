@@ -0,0 +1,135 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog.models import Author, Category, Post
+from subscription import notifications
+from subscription.models import CategorySubscription, Notification, NotificationCounter, UserSubscription
+from subscription.tasks import notify_subscribers
+
+User = get_user_model()
+
+
+class NotificationDataMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.blogger = User.objects.create_user(username='blogger', password='1X<ISRUkw+tuK', email='em@il.com')
+        cls.author = Author.objects.create(user=cls.blogger, bio='Biography')
+        cls.category = Category.objects.create(title='Python')
+        cls.other_category = Category.objects.create(title='Go')
+        cls.readers = [
+            User.objects.create_user(username=f'reader{i}', password='1X<ISRUkw+tuK', email=f'reader{i}@il.com')
+            for i in range(5)
+        ]
+        # reader0 follows both the author and the category, reader4 follows nothing relevant
+        UserSubscription.objects.bulk_create([
+            UserSubscription(subscriber=reader, subscribed_to=cls.blogger) for reader in cls.readers[:2]
+        ])
+        CategorySubscription.objects.bulk_create([
+            CategorySubscription(subscriber=reader, subscribed_to=cls.category)
+            for reader in (cls.readers[0], cls.readers[2], cls.readers[3])
+        ] + [CategorySubscription(subscriber=cls.readers[4], subscribed_to=cls.other_category)])
+        # Following your own category does not notify you of your own posts
+        CategorySubscription.objects.create(subscriber=cls.blogger, subscribed_to=cls.category)
+        cls.post = Post.objects.create(author=cls.author, category=cls.category, title='Post', text='...')
+
+
+class NotifySubscribersTest(NotificationDataMixin, TestCase):
+
+    def test_post_creation_queues_one_task(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            Post.objects.create(author=self.author, category=self.category, title='New', text='...')
+        self.assertEqual(len(callbacks), 1)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.post.title = 'Edited'
+            self.post.save()
+        self.assertEqual(callbacks, [])
+
+    def test_followers_are_notified_once(self):
+        self.assertEqual(notify_subscribers(self.post.pk), 4)
+        self.assertQuerySetEqual(
+            Notification.objects.filter(post=self.post).order_by('recipient_id').values_list('recipient', flat=True),
+            [reader.pk for reader in self.readers[:4]],
+        )
+        self.assertEqual(notifications.get_unread_count(self.readers[0]), 1)
+        self.assertEqual(notifications.get_unread_count(self.readers[4]), 0)
+        self.assertEqual(notifications.get_unread_count(self.blogger), 0)
+
+    def test_rerun_does_not_duplicate(self):
+        notifications.notify_subscribers(self.post.pk)
+        self.assertEqual(notifications.notify_subscribers(self.post.pk), 0)
+        self.assertEqual(Notification.objects.count(), 4)
+        self.assertEqual(NotificationCounter.objects.get(user=self.readers[0]).unread, 1)
+
+    def test_followers_are_walked_in_chunks(self):
+        # Per chunk: followers, counters, counter lock, already notified, inbox rows, counter update (+ savepoints);
+        # the last, empty chunk ends the walk
+        with self.assertNumQueries(1 + 2 * 8 + 1):
+            self.assertEqual(notifications.notify_subscribers(self.post.pk, chunk_size=2), 4)
+        self.assertEqual(NotificationCounter.objects.filter(unread=1).count(), 4)
+
+    def test_missing_post(self):
+        self.assertEqual(notifications.notify_subscribers(9999), 0)
+
+    def test_mark_read(self):
+        other_post = Post.objects.create(author=self.author, category=self.category, title='Other', text='...')
+        notifications.notify_subscribers(self.post.pk)
+        notifications.notify_subscribers(other_post.pk)
+        reader = self.readers[0]
+        self.assertEqual(notifications.get_unread_count(reader), 2)
+
+        first = Notification.objects.get(recipient=reader, post=self.post)
+        self.assertEqual(notifications.mark_read(reader, [first.pk]), 1)
+        self.assertEqual(notifications.mark_read(reader, [first.pk]), 0)
+        self.assertEqual(notifications.get_unread_count(reader), 1)
+        self.assertEqual(notifications.mark_read(reader), 1)
+        self.assertEqual(notifications.get_unread_count(reader), 0)
+
+    def test_deleted_post_is_taken_off_the_counters(self):
+        other_post = Post.objects.create(author=self.author, category=self.category, title='Other', text='...')
+        notifications.notify_subscribers(self.post.pk)
+        notifications.notify_subscribers(other_post.pk)
+        notifications.mark_read(self.readers[1], Notification.objects.filter(post=self.post).values('pk'))
+
+        self.post.delete()
+        self.assertEqual(notifications.get_unread_count(self.readers[0]), 1)
+        self.assertEqual(notifications.get_unread_count(self.readers[1]), 1)
+        other_post.delete()
+        self.assertEqual(NotificationCounter.objects.filter(unread__gt=0).count(), 0)
+
+
+class NotificationAPIViewTest(NotificationDataMixin, APITestCase):
+
+    def setUp(self):
+        notifications.notify_subscribers(self.post.pk)
+        self.reader = self.readers[0]
+        self.client.force_authenticate(user=self.reader)
+
+    def test_my_notifications(self):
+        response = self.client.get(reverse('api:my-notifications'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['post'], self.post.pk)
+        self.assertEqual(response.data['results'][0]['post_title'], 'Post')
+        self.assertFalse(response.data['results'][0]['is_read'])
+
+    def test_unread_count_reads_the_counter(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('api:unread-notifications-count'))
+        self.assertEqual(response.data, {'unread': 1})
+
+    def test_mark_read(self):
+        notification = Notification.objects.get(recipient=self.reader)
+        response = self.client.post(reverse('api:mark-notifications-read'), {'ids': [notification.pk]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'unread': 0})
+        notification.refresh_from_db()
+        self.assertTrue(notification.is_read)
+
+    def test_user_not_authenticated(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(reverse('api:unread-notifications-count'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -3,6 +3,7 @@ from django.urls import path
 from subscription.views import subscriptions, favorites, feed
 from subscription.api.views import favorites as api_favorites
 from subscription.api.views import feed as api_feed
+from subscription.api.views import notifications as api_notifications
 from subscription.api.views import subscriptions as api_subs
 
 app_name = 'subscription'
@@ -31,4 +32,9 @@ drf_urlpatterns = [
     path('user/<int:pk>/unsubscribe/', api_subs.UserUnsubscribeAPIView.as_view(), name='user-unsubscribe'),
     path('category/<int:pk>/subscribe/', api_subs.CategorySubscribeAPIView.as_view(), name='category-subscribe'),
     path('category/<int:pk>/unsubscribe/', api_subs.CategoryUnsubscribeAPIView.as_view(), name='category-unsubscribe'),
+    path('my-notifications/', api_notifications.MyNotificationsAPIView.as_view(), name='my-notifications'),
+    path('my-notifications/unread-count/', api_notifications.UnreadNotificationsCountAPIView.as_view(),
+         name='unread-notifications-count'),
+    path('my-notifications/mark-read/', api_notifications.MarkNotificationsReadAPIView.as_view(),
+         name='mark-notifications-read'),
 ]
@@ -138,7 +138,8 @@ class FullUserProfileSerializer(ProfileExtendedSerializerMixin):
         Reorders the 'posts' and 'comments' fields to come after 'subscribed'.
         """
         fields = super().get_fields()
-        fields['subscribed'] = fields.pop('subscribed')
-        fields['posts'] = fields.pop('posts')
-        fields['comments'] = fields.pop('comments')
+        for name in ('subscribed', 'posts', 'comments'):
+            # Not there when left out of a sparse fieldset
+            if name in fields:
+                fields[name] = fields.pop(name)
         return fields
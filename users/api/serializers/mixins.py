@@ -1,6 +1,7 @@
 from typing import Optional, List
 
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.files.storage import default_storage
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
@@ -9,19 +10,38 @@ from blog.api.serializers.endpoints.posts import PostSerializer
 from blog.api.serializers.nested.comments import PaginatedCommentsSerializer
 from blog.api.serializers.nested.posts import PaginatedPostsSerializer
 from blog.models import User
+from common.mixins.serializers import SparseFieldsMixin
 from users.models import Profile
 
 
 class ProfileShortSerializer(serializers.ModelSerializer):
+    photo_sizes = serializers.SerializerMethodField()
+
     class Meta:
         model = Profile
         fields = (
             'telegram_id',
-            'photo'
+            'photo',
+            'photo_sizes',
         )
 
+    @extend_schema_field(serializers.DictField(child=serializers.DictField(child=serializers.URLField())))
+    def get_photo_sizes(self, obj) -> dict:
+        """
+        URLs of the processed photo by format and size ({"webp": {"40": url, ...}, "png": {...}}),
+        empty until the uploaded photo is processed.
+        """
+        request = self.context.get('request')
+        return {
+            image_format: {
+                size: request.build_absolute_uri(url) if request else url
+                for size, url in ((size, default_storage.url(name)) for size, name in names.items())
+            }
+            for image_format, names in obj.photo_sizes.items()
+        }
+
 
-class ProfileSerializerMixin(serializers.ModelSerializer):
+class ProfileSerializerMixin(SparseFieldsMixin, serializers.ModelSerializer):
     profile = ProfileShortSerializer()
     biography = serializers.SerializerMethodField()
 
@@ -5,6 +5,7 @@ from django.db.models import Sum
 from blog.api.paginators import PostPagination, CommentPagination
 from blog.models import Post
 from blog.pagination import paginate_and_serialize_objects
+from common.mixins.serializers import is_requested
 
 User = get_user_model()
 
@@ -19,33 +20,38 @@ class UserProfileService:
             obj.user_subscribed = False
 
     @classmethod
-    def enrich_object(cls, obj, request, post_serializer=None, comment_serializer=None, request_user=None):
+    def enrich_object(cls, obj, request, post_serializer=None, comment_serializer=None, request_user=None,
+                      fields=None):
         """
         This method enriches the user object, including its posts and comments.
         It calculates the user's total rating, paginates and serializes the posts and comments.
         If the request_user is provided, it also checks if the request user is subscribed to the user.
+        With a sparse fieldset (`fields`), only the requested parts are computed.
         """
 
+        with_rating = is_requested(fields, 'rating')
         comments = obj.comments.all()
-        comments_rating = comments.aggregate(Sum('rating'))['rating__sum'] or 0
-        try:
-            # If the user is in the "Bloggers" group, they have an instance of the Author model.
-            posts = obj.author.posts.all()
-            posts_rating = posts.aggregate(Sum('rating'))['rating__sum'] or 0
-        except ObjectDoesNotExist:
-            posts = Post.objects.none()
-            posts_rating = 0
+        comments_rating = comments.aggregate(Sum('rating'))['rating__sum'] or 0 if with_rating else 0
+        posts = Post.objects.none()
+        posts_rating = 0
+        if is_requested(fields, 'rating', 'posts'):
+            try:
+                # If the user is in the "Bloggers" group, they have an instance of the Author model.
+                posts = obj.author.posts.all()
+                posts_rating = posts.aggregate(Sum('rating'))['rating__sum'] or 0 if with_rating else 0
+            except ObjectDoesNotExist:
+                ...
 
         obj.total_rating = posts_rating + comments_rating
 
-        if post_serializer:
+        if post_serializer and is_requested(fields, 'posts'):
             obj.paginated_posts = paginate_and_serialize_objects(
                 objects=posts,
                 paginator=PostPagination(),
                 serializer=post_serializer,
                 request=request
             )
-        if comment_serializer:
+        if comment_serializer and is_requested(fields, 'comments'):
             obj.paginated_comments = paginate_and_serialize_objects(
                 objects=comments,
                 paginator=CommentPagination(),
@@ -53,4 +59,5 @@ class UserProfileService:
                 request=request
             )
 
-        cls.add_subscription_info(obj, request_user)
+        if is_requested(fields, 'subscribed'):
+            cls.add_subscription_info(obj, request_user)
@@ -1,21 +1,57 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db.models import Prefetch
-from drf_spectacular.utils import extend_schema_view, extend_schema
-from rest_framework import generics
+from django.http import StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiParameter, inline_serializer
+from rest_framework import generics, serializers
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.status import HTTP_204_NO_CONTENT
+from rest_framework.status import HTTP_202_ACCEPTED, HTTP_204_NO_CONTENT
+from rest_framework.views import APIView
+from rest_framework_simplejwt.views import TokenObtainPairView
 
 from blog.api.serializers.endpoints import comments as comments_s
 from blog.api.serializers.endpoints import posts as post_s
 from blog.models import Comment, Post
+from common.mixins.serializers import is_requested
+from common.mixins.views import ConditionalGetMixin, SparseFieldsViewMixin, sparse_fields_parameters
 from users.api.serializers.endpoints import users as user_s
 from users.api.serializers.nested import profile as profile_s
+from users import export
 from users.api.services import UserProfileService
+from users.models import Profile
+from users.tasks import export_user_data
 
 User = get_user_model()
 
 
+class ProfileConditionalGetMixin(ConditionalGetMixin):
+    """
+    Conditional GET of a profile, `validators_url_kwarg = None` for the profile of the request user.
+    """
+    validators_model = Profile
+
+    def get_validators_queryset(self):
+        if self.validators_url_kwarg is None:
+            return Profile.objects.filter(pk=self.request.user.pk).values_list(*self.validators_fields)
+        return super().get_validators_queryset()
+
+
+def get_profile_queryset(fields=None, prefetch_subscribers=True):
+    """
+    Users with the relations the profile serializers read, `fields` narrows them to a sparse fieldset.
+    """
+    queryset = User.objects.all()
+    if is_requested(fields, 'biography', 'posts', 'rating'):
+        queryset = queryset.select_related('author')
+    if is_requested(fields, 'profile'):
+        queryset = queryset.select_related('profile')
+    if prefetch_subscribers and is_requested(fields, 'subscribers_count'):
+        queryset = queryset.prefetch_related('subscribers')
+    return queryset
+
+
 @extend_schema_view(
     post=extend_schema(
         description="Allows a new user to create an account by providing necessary information.",
@@ -29,6 +65,18 @@ class SignUpAPIView(generics.CreateAPIView):
     serializer_class = user_s.SignUpSerializer
 
 
+@extend_schema_view(
+    post=extend_schema(
+        description="Returns an access and refresh JSON web token pair for the given credentials. "
+                    "Attempts are rate limited per IP address (`login` throttle scope).",
+        summary='Log in (create JWT)',
+        tags=['Authentication & Authorization']
+    ),
+)
+class TokenCreateAPIView(TokenObtainPairView):
+    throttle_scope = 'login'
+
+
 @extend_schema_view(
     put=extend_schema(
         description="Allows the authenticated user to change their password by providing the `old password` and the `new password`.",
@@ -52,7 +100,8 @@ class ChangePasswordAPIView(generics.GenericAPIView):
     get=extend_schema(
         description="Retrieves the profile of the currently authenticated user, including basic information.",
         summary='View my profile (brief)',
-        tags=['User profile']
+        tags=['User profile'],
+        parameters=sparse_fields_parameters,
     ),
     patch=extend_schema(
         description="Updates specific fields of the authenticated user's profile.",
@@ -65,18 +114,14 @@ class ChangePasswordAPIView(generics.GenericAPIView):
         tags=['User profile']
     ),
 )
-class MeAPIView(generics.RetrieveUpdateAPIView):
+class MeAPIView(ProfileConditionalGetMixin, SparseFieldsViewMixin, generics.RetrieveUpdateAPIView):
     permission_classes = (IsAuthenticated,)
+    validators_url_kwarg = None
     queryset = User.objects.all()
     serializer_class = user_s.MeSerializer
 
     def get_queryset(self):
-        return User.objects.select_related(
-            'author',
-            'profile',
-        ).prefetch_related(
-            'subscribers',
-        )
+        return get_profile_queryset(self.get_query_fields())
 
     def get_object(self):
         return self.get_queryset().get(pk=self.request.user.pk)
@@ -86,26 +131,25 @@ class MeAPIView(generics.RetrieveUpdateAPIView):
     get=extend_schema(
         description="Retrieves the complete profile of the authenticated user, including posts, comments, and their rating.",
         summary='View my full profile (with posts and comments)',
-        tags=['User profile']
+        tags=['User profile'],
+        parameters=sparse_fields_parameters,
     ),
 )
-class FullMeAPIView(generics.RetrieveAPIView):
+class FullMeAPIView(ProfileConditionalGetMixin, SparseFieldsViewMixin, generics.RetrieveAPIView):
     permission_classes = (IsAuthenticated,)
+    validators_url_kwarg = None
     queryset = User.objects.all()
     serializer_class = user_s.FullMeSerializer
 
     def get_queryset(self):
-        comments_prefetch = Prefetch('comments', Comment.objects.get_comments())
-        posts_prefetch = Post.objects.get_posts_prefetch(request_user=self.request.user)
-
-        return User.objects.select_related(
-            'author',
-            'profile',
-        ).prefetch_related(
-            'subscribers',
-            comments_prefetch,
-            posts_prefetch
-        )
+        fields = self.get_query_fields()
+        queryset = get_profile_queryset(fields)
+        # The rating is summed over the prefetched posts and comments
+        if is_requested(fields, 'comments', 'rating'):
+            queryset = queryset.prefetch_related(Prefetch('comments', Comment.objects.get_comments()))
+        if is_requested(fields, 'posts', 'rating'):
+            queryset = queryset.prefetch_related(Post.objects.get_posts_prefetch(request_user=self.request.user))
+        return queryset
 
     def get_object(self):
         self.object = self.get_queryset().get(pk=self.request.user.pk)
@@ -115,6 +159,7 @@ class FullMeAPIView(generics.RetrieveAPIView):
             post_serializer=profile_s.MyPostsListSerializer,
             comment_serializer=profile_s.MyCommentsListSerializer,
             request=self.request,
+            fields=self.get_query_fields(),
         )
 
         return self.object
@@ -122,8 +167,8 @@ class FullMeAPIView(generics.RetrieveAPIView):
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context.update({
-            'posts': self.object.paginated_posts,
-            'comments': self.object.paginated_comments
+            'posts': getattr(self.object, 'paginated_posts', None),
+            'comments': getattr(self.object, 'paginated_comments', None)
         })
         return context
 
@@ -132,23 +177,21 @@ class FullMeAPIView(generics.RetrieveAPIView):
     get=extend_schema(
         description="Retrieves a brief profile of a user by their `ID`, excluding detailed information like posts, comments, and rating.",
         summary='View user profile by ID (brief)',
-        tags=['User profile']
+        tags=['User profile'],
+        parameters=sparse_fields_parameters,
     ),
 )
-class UserProfileAPIView(generics.RetrieveAPIView):
+class UserProfileAPIView(ProfileConditionalGetMixin, SparseFieldsViewMixin, generics.RetrieveAPIView):
     queryset = User.objects
     serializer_class = user_s.UserProfileSerializer
 
     def get_queryset(self):
-        return User.objects.select_related(
-            'author',
-            'profile',
-        )
+        return get_profile_queryset(self.get_query_fields(), prefetch_subscribers=False)
 
     def get_object(self):
         self.object = super().get_object()
 
-        if self.request.user:
+        if self.request.user and is_requested(self.sparse_fields, 'subscribed'):
             UserProfileService.add_subscription_info(self.object, self.request.user)
 
         return self.object
@@ -158,28 +201,28 @@ class UserProfileAPIView(generics.RetrieveAPIView):
     get=extend_schema(
         description="Retrieves a detailed profile of a user by their `ID`, including their posts and comments.",
         summary='View user profile by ID (with their posts and comments)',
-        tags=['User profile']
+        tags=['User profile'],
+        parameters=sparse_fields_parameters,
     ),
 )
-class FullUserProfileAPIView(generics.RetrieveAPIView):
+class FullUserProfileAPIView(ProfileConditionalGetMixin, SparseFieldsViewMixin, generics.RetrieveAPIView):
     queryset = User.objects
     serializer_class = user_s.FullUserProfileSerializer
 
     def get_queryset(self):
-        comm_prefetch_kwargs = {}
-        if self.request.user.is_authenticated:
-            comm_prefetch_kwargs = {'request_user': self.request.user}
-        comments_prefetch = Prefetch('comments', Comment.objects.get_comments(**comm_prefetch_kwargs))
-
-        posts_prefetch = Post.objects.get_posts_prefetch(request_user=self.request.user)
-
-        return User.objects.select_related(
-            'author',
-            'profile',
-        ).prefetch_related(
-            comments_prefetch,
-            posts_prefetch
-        )
+        fields = self.get_query_fields()
+        queryset = get_profile_queryset(fields, prefetch_subscribers=False)
+        # The rating is summed over the prefetched posts and comments
+        if is_requested(fields, 'comments', 'rating'):
+            comm_prefetch_kwargs = {}
+            if self.request.user.is_authenticated:
+                comm_prefetch_kwargs = {'request_user': self.request.user}
+            queryset = queryset.prefetch_related(
+                Prefetch('comments', Comment.objects.get_comments(**comm_prefetch_kwargs))
+            )
+        if is_requested(fields, 'posts', 'rating'):
+            queryset = queryset.prefetch_related(Post.objects.get_posts_prefetch(request_user=self.request.user))
+        return queryset
 
     def get_object(self):
         self.object = super().get_object()
@@ -188,6 +231,7 @@ class FullUserProfileAPIView(generics.RetrieveAPIView):
             'post_serializer': post_s.PostSerializer,
             'comment_serializer': comments_s.CommentListSerializer,
             'request': self.request,
+            'fields': self.get_query_fields(),
         }
 
         if self.request.user.is_authenticated:
@@ -200,7 +244,62 @@ class FullUserProfileAPIView(generics.RetrieveAPIView):
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context.update({
-            'posts': self.object.paginated_posts,
-            'comments': self.object.paginated_comments
+            'posts': getattr(self.object, 'paginated_posts', None),
+            'comments': getattr(self.object, 'paginated_comments', None)
         })
         return context
+
+
+compress_parameter = OpenApiParameter(
+    'compress', str, enum=['gzip'], required=False,
+    description='Pass `gzip` to get a gzip-compressed file.'
+)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        description="Streams all data of the authenticated user (posts, comments, votes, favorites and "
+                    "subscriptions) as NDJSON: one JSON object per line, the `type` key tells the record type.",
+        summary='Export my data',
+        tags=['User profile'],
+        parameters=[compress_parameter],
+        responses={(200, 'application/x-ndjson'): OpenApiTypes.BINARY},
+    ),
+    post=extend_schema(
+        description="Starts a background export of the authenticated user's data, recommended for large accounts. "
+                    "The file is available at the returned `url` once the task is finished (404 until then).",
+        summary='Export my data in the background',
+        tags=['User profile'],
+        parameters=[compress_parameter],
+        request=None,
+        responses={202: inline_serializer('ExportTask', fields={
+            'task_id': serializers.CharField(),
+            'url': serializers.CharField(),
+        })},
+    ),
+)
+class ExportMeAPIView(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    def is_compressed(self):
+        return self.request.query_params.get('compress') == 'gzip'
+
+    def get(self, request, *args, **kwargs):
+        compress = self.is_compressed()
+        content = export.iter_export(request.user, compress=compress)
+        response = StreamingHttpResponse(
+            export.get_streaming_content(content, request),
+            content_type='application/gzip' if compress else 'application/x-ndjson',
+        )
+        filename = export.get_export_filename(request.user, compress=compress)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def post(self, request, *args, **kwargs):
+        compress = self.is_compressed()
+        relative_path = export.get_export_path(request.user, compress=compress)
+        task = export_user_data.delay(request.user.pk, relative_path, compress=compress)
+        return Response(
+            {'task_id': task.id, 'url': request.build_absolute_uri(settings.MEDIA_URL + relative_path)},
+            status=HTTP_202_ACCEPTED,
+        )
@@ -0,0 +1,62 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+# Square sizes (px) of the processed profile photos: comment and post lists, their 2x, the profile page
+AVATAR_SIZES = (40, 80, 300)
+# Formats of every size. WebP is several times smaller, PNG is the fallback of the <picture> element.
+AVATAR_FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 85, 'method': 6},
+    'png': {'format': 'PNG', 'optimize': True},
+}
+AVATAR_DIR = 'profile_photos/sizes'
+
+
+def get_avatar_name(photo_name, size, image_format):
+    return f'{AVATAR_DIR}/{PurePosixPath(photo_name).stem}_{size}.{image_format}'
+
+
+def make_avatars(photo_name, storage=default_storage):
+    """
+    Crop the uploaded photo `photo_name` to a square and save it in every size and format.
+    Returns the saved names as {format: {size: name}}, the value of `Profile.photo_sizes`.
+    """
+    with storage.open(photo_name) as file:
+        image = Image.open(file)
+        # JPEG is decoded at a reduced scale, uploads from cameras are many times larger than needed
+        image.draft('RGB', (max(AVATAR_SIZES) * 2,) * 2)
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+    names = {image_format: {} for image_format in AVATAR_FORMATS}
+    # Largest first, every smaller size is resized from the previous one
+    for size in sorted(AVATAR_SIZES, reverse=True):
+        image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        for image_format, options in AVATAR_FORMATS.items():
+            content = BytesIO()
+            image.save(content, **options)
+            name = storage.save(get_avatar_name(photo_name, size, image_format), ContentFile(content.getvalue()))
+            names[image_format][str(size)] = name
+    return names
+
+
+def delete_avatars(photo_sizes, storage=default_storage):
+    for names in photo_sizes.values():
+        for name in names.values():
+            storage.delete(name)
+
+
+def get_avatar_url(profile, size, image_format='png'):
+    """
+    URL of the smallest processed photo at least `size` px wide (the largest one if none is),
+    the uploaded photo until it is processed.
+    """
+    names = profile.photo_sizes.get(image_format)
+    if not names:
+        return profile.photo.url
+    fitting = [int(processed) for processed in names if int(processed) >= size]
+    processed = min(fitting) if fitting else max(map(int, names))
+    return default_storage.url(names[str(processed)])
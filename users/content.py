@@ -0,0 +1,15 @@
+from django.db.models import Q
+
+from blog.models import Post
+from common.models.mixins import bump_content_version
+from users.models import Profile
+
+
+def user_content_changed(user_id, posts=True):
+    """
+    Bump the content versions (the conditional GET validators) of the pages that show the user: their profile
+    and, with `posts` (a change of their name or photo), the posts they wrote or commented on.
+    """
+    bump_content_version(Profile.objects.filter(pk=user_id))
+    if posts:
+        bump_content_version(Post.objects.filter(Q(author__user=user_id) | Q(comments__author=user_id)))
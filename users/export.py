@@ -0,0 +1,137 @@
+import json
+import secrets
+import zlib
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+
+from blog.models import Comment, Post
+from rating.models import CommentRating, PostRating
+from subscription.models import CategorySubscription, Favorite, UserSubscription
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_DIR = 'exports'
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def get_export_sections(user):
+    """
+    Querysets of everything that belongs to the user, as (record type, queryset of dicts) pairs.
+
+    The querysets return plain values, not model instances, so the export never builds
+    model objects or prefetch caches.
+    """
+    return (
+        ('post', Post.objects.filter(author__user=user).order_by('pk').values(
+            'id', 'title', 'text', 'created_at', 'updated_at', category_title=F('category__title'))),
+        ('comment', Comment.objects.filter(author=user).order_by('pk').values(
+            'id', 'post_id', 'reply_to_id', 'text', 'created_at', 'updated_at')),
+        ('post_vote', PostRating.objects.filter(owner=user).order_by('pk').values(
+            'vote', post_id=F('obj_id'))),
+        ('comment_vote', CommentRating.objects.filter(owner=user).order_by('pk').values(
+            'vote', comment_id=F('obj_id'))),
+        ('favorite', Favorite.objects.filter(user=user).order_by('pk').values('post_id')),
+        ('category_subscription', CategorySubscription.objects.filter(subscriber=user).order_by('pk').values(
+            category=F('subscribed_to__title'))),
+        ('user_subscription', UserSubscription.objects.filter(subscriber=user).order_by('pk').values(
+            user_id=F('subscribed_to_id'), username=F('subscribed_to__username'))),
+    )
+
+
+def iter_export_lines(user, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the export of a user as NDJSON lines (bytes), one JSON object per record.
+
+    Rows are read with `QuerySet.iterator()`, a server-side cursor on PostgreSQL,
+    so memory use does not depend on the size of the account.
+    """
+    header = {'type': 'export', 'user_id': user.pk, 'username': user.username, 'created_at': timezone.now()}
+    yield encode_line(header)
+
+    for record_type, queryset in get_export_sections(user):
+        for row in queryset.iterator(chunk_size=chunk_size):
+            yield encode_line({'type': record_type, **row})
+
+
+def encode_line(record):
+    return json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False).encode() + b'\n'
+
+
+def iter_gzip(chunks, buffer_size=64 * 1024):
+    """
+    Gzip a stream of byte chunks incrementally, yielding compressed blocks of about `buffer_size` bytes.
+    """
+    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += compressor.compress(chunk)
+        if len(buffer) >= buffer_size:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += compressor.flush()
+    yield bytes(buffer)
+
+
+def iter_export(user, compress=False, chunk_size=EXPORT_CHUNK_SIZE):
+    lines = iter_export_lines(user, chunk_size=chunk_size)
+    return iter_gzip(lines) if compress else lines
+
+
+async def aiter_sync(iterator):
+    """
+    Serve a sync iterator chunk by chunk from an async server.
+
+    Django consumes sync iterators of a StreamingHttpResponse into a list under ASGI;
+    pulling every chunk through the thread that runs the ORM keeps the stream lazy.
+    """
+    sentinel = object()
+    next_chunk = sync_to_async(next)
+    while (chunk := await next_chunk(iterator, sentinel)) is not sentinel:
+        yield chunk
+
+
+def get_streaming_content(iterator, request):
+    """
+    The iterator for the handler serving `request` (a Django or a DRF request): under WSGI Django consumes
+    async iterators into a list, and under ASGI sync ones. Decided per request, `runserver` serves ASGI
+    with daphne whatever SERVER_MODE says.
+    """
+    request = getattr(request, '_request', request)
+    return aiter_sync(iterator) if isinstance(request, ASGIRequest) else iterator
+
+
+def get_export_filename(user, compress=False):
+    return f'{user.username}-export.ndjson' + ('.gz' if compress else '')
+
+
+def get_export_path(user, compress=False):
+    """
+    Path of a new export file relative to MEDIA_ROOT.
+
+    The file name contains a random token, because media files are served without authentication.
+    """
+    return (Path(EXPORT_DIR) / str(user.pk) / f'{secrets.token_urlsafe(16)}-{get_export_filename(user, compress)}').as_posix()
+
+
+def write_export(user, relative_path, compress=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Write the export of a user to `relative_path` inside MEDIA_ROOT.
+
+    The file is written under a temporary name and renamed when complete, so its URL starts
+    answering only when the export is finished.
+    """
+    path = Path(settings.MEDIA_ROOT) / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    partial_path = path.with_name(path.name + '.part')
+    with partial_path.open('wb') as file:
+        for chunk in iter_export(user, compress=compress, chunk_size=chunk_size):
+            file.write(chunk)
+    partial_path.rename(path)
+
+    return relative_path
@@ -0,0 +1,54 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from users import export
+from users.tasks import export_user_data
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports the posts, comments, votes, favorites and subscriptions of a user as NDJSON. "
+        "The rows are streamed from the database, so memory use does not depend on the account size."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('user', help='User id or username.')
+        parser.add_argument('--output', '-o', default='-',
+                            help='File to write to, "-" for stdout (default).')
+        parser.add_argument('--gzip', action='store_true', help='Compress the output with gzip.')
+        parser.add_argument('--chunk-size', type=int, default=export.EXPORT_CHUNK_SIZE,
+                            help='Rows fetched from the database at a time.')
+        parser.add_argument('--background', action='store_true',
+                            help='Run the export as a Celery task writing to MEDIA_ROOT.')
+
+    def get_user(self, value):
+        lookup = {'pk': value} if value.isdigit() else {'username': value}
+        try:
+            return User.objects.get(**lookup)
+        except User.DoesNotExist:
+            raise CommandError(f'User "{value}" does not exist.')
+
+    def handle(self, *args, **options):
+        user = self.get_user(options['user'])
+
+        if options['background']:
+            relative_path = export.get_export_path(user, compress=options['gzip'])
+            task = export_user_data.delay(user.pk, relative_path, compress=options['gzip'])
+            self.stdout.write(self.style.SUCCESS(f'Task {task.id} will write MEDIA_ROOT/{relative_path}'))
+            return
+
+        chunks = export.iter_export(user, compress=options['gzip'], chunk_size=options['chunk_size'])
+        if options['output'] == '-':
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            return
+
+        with open(options['output'], 'wb') as file:
+            for chunk in chunks:
+                file.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f'Exported "{user}" to {options["output"]}'))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from users.models import Profile
+from users.tasks import process_avatar
+
+
+class Command(BaseCommand):
+    help = (
+        "Queues the processing of the profile photos that have no sizes yet, "
+        "e.g. the photos uploaded before the sizes were introduced."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--now', action='store_true', help='Process the photos here instead of in Celery.')
+
+    def handle(self, *args, **options):
+        default_photo = Profile._meta.get_field('photo').default
+        profiles = Profile.objects.filter(photo_sizes={}).exclude(photo=default_photo).exclude(photo='')
+        count = 0
+        for profile_id, photo_name in profiles.values_list('pk', 'photo').iterator():
+            if options['now']:
+                process_avatar(profile_id, photo_name)
+            else:
+                process_avatar.delay(profile_id, photo_name)
+            count += 1
+        action = 'Processed' if options['now'] else 'Queued'
+        self.stdout.write(self.style.SUCCESS(f'{action} {count} profile photos'))
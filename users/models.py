@@ -1,13 +1,17 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.urls import reverse
-from django_resized import ResizedImageField
 from phonenumber_field.modelfields import PhoneNumberField
 
+from common.models.mixins import ContentVersionMixin, StoredValuesMixin
+
 from users.managers import CustomUserManager
 
 
-class User(AbstractUser):
+class User(AbstractUser, StoredValuesMixin):
+    # Shown on the posts of the user and next to their comments, see users.signals
+    stored_fields = ('username',)
+
     email = models.EmailField(unique=True)
     phone_number = PhoneNumberField('Phone number', unique=True, blank=True, null=True)
 
@@ -45,13 +49,14 @@ class User(AbstractUser):
             Profile.objects.create(user=self)
 
 
-class Profile(models.Model):
+class Profile(StoredValuesMixin, ContentVersionMixin):
+    stored_fields = ('photo',)
+
     user = models.OneToOneField('User', on_delete=models.CASCADE, primary_key=True, related_name='profile')
     telegram_id = models.CharField('Telegram', max_length=30, null=True, blank=True)
-    photo = ResizedImageField(size=[300, 300],
-                              upload_to='profile_photos/',
-                              default='default/no-ava.png',
-                              force_format='PNG')
+    # Stored as uploaded, `users.tasks.process_avatar` fills `photo_sizes` with the sizes of `users.avatars`
+    photo = models.ImageField(upload_to='profile_photos/', default='default/no-ava.png')
+    photo_sizes = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         return f'{self.user} (id={self.pk})'
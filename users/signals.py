@@ -0,0 +1,37 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from users.content import user_content_changed
+from users.models import Profile
+from users.tasks import delete_avatar_files, process_avatar
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User, dispatch_uid='users.user_saved_content_changed')
+@receiver(post_save, sender=Profile, dispatch_uid='users.profile_saved_content_changed')
+def bump_profile_content_version(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Edits of the user or of their profile change the profile pages, and the posts too when they change
+    the name or the photo shown there. Logging in only saves `last_login`, which is not shown.
+    """
+    if created or update_fields == frozenset(['last_login']):
+        return
+    user_content_changed(instance.pk, posts=bool(instance.get_changed_fields(update_fields)))
+
+
+@receiver(pre_save, sender=Profile, dispatch_uid='users.profile_photo_uploaded')
+def process_uploaded_photo(sender, instance, **kwargs):
+    """
+    A new photo is saved as uploaded and its sizes are made by a task, so the request does not
+    decode and resize it. The sizes of the previous photo are deleted.
+    """
+    if not instance.photo or instance.photo._committed:
+        return
+    if instance.photo_sizes:
+        delete_avatar_files.delay_on_commit(instance.photo_sizes)
+        instance.photo_sizes = {}
+    # The upload gets its final name when the field is saved, after this signal
+    transaction.on_commit(lambda: process_avatar.delay(instance.pk, instance.photo.name))
@@ -0,0 +1,49 @@
+import logging
+
+from celery import shared_task
+from django.contrib.auth import get_user_model
+
+from users.avatars import delete_avatars, make_avatars
+from users.content import user_content_changed
+from users.export import write_export
+from users.models import Profile
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=False, track_started=True)
+def export_user_data(user_id: int, relative_path: str, compress: bool = False) -> str:
+    """
+    Write the NDJSON export of a user to `relative_path` inside MEDIA_ROOT.
+
+    The task id is returned to the client, so the state and the result are stored.
+    """
+    user = User.objects.get(pk=user_id)
+    return write_export(user, relative_path, compress=compress)
+
+
+@shared_task(ignore_result=True)
+def process_avatar(profile_id: int, photo_name: str):
+    """
+    Make the sizes of an uploaded profile photo. Nothing is saved if the photo was replaced
+    or processed by another task in the meantime.
+    """
+    if not Profile.objects.filter(pk=profile_id, photo=photo_name).exists():
+        return
+    try:
+        photo_sizes = make_avatars(photo_name)
+    except OSError:
+        logger.warning('Could not process the profile photo %s', photo_name, exc_info=True)
+        return
+
+    profile = Profile.objects.filter(pk=profile_id, photo=photo_name, photo_sizes={})
+    if profile.update(photo_sizes=photo_sizes):
+        user_content_changed(profile_id)
+    else:
+        delete_avatars(photo_sizes)
+
+
+@shared_task(ignore_result=True)
+def delete_avatar_files(photo_sizes: dict):
+    delete_avatars(photo_sizes)
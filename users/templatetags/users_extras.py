@@ -0,0 +1,28 @@
+from django import template
+
+from users.avatars import get_avatar_url
+
+register = template.Library()
+
+
+def get_srcset(profile, size, image_format):
+    if image_format not in profile.photo_sizes:
+        return ''
+    urls = dict.fromkeys((get_avatar_url(profile, size, image_format), get_avatar_url(profile, size * 2, image_format)))
+    return ', '.join(f'{url} {density}x' for density, url in enumerate(urls, start=1))
+
+
+@register.inclusion_tag('users/includes/avatar.html')
+def avatar(profile, size, css_class='', alt='user photo'):
+    """
+    The profile photo shown at `size` px: the processed WebP with a PNG fallback, both for 1x and 2x screens,
+    or the uploaded photo until it is processed.
+    """
+    return {
+        'size': size,
+        'css_class': css_class,
+        'alt': alt,
+        'src': get_avatar_url(profile, size),
+        'webp_srcset': get_srcset(profile, size, 'webp'),
+        'png_srcset': get_srcset(profile, size, 'png'),
+    }
@@ -0,0 +1,107 @@
+import io
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from users.models import Profile
+from users.tasks import process_avatar
+
+User = get_user_model()
+
+
+def generate_photo(size=(640, 480), image_format='JPEG'):
+    file = io.BytesIO()
+    Image.new('RGB', size=size, color='red').save(file, image_format)
+    return SimpleUploadedFile('photo.jpg', file.getvalue(), content_type='image/jpeg')
+
+
+class AvatarTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', email='em@il.com', password='testpassword123')
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def upload_photo(self):
+        profile = Profile.objects.get(pk=self.user.pk)
+        profile.photo = generate_photo()
+        with patch('users.signals.process_avatar.delay') as delay, self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+        delay.assert_called_once_with(profile.pk, profile.photo.name)
+        return profile
+
+    def process(self, profile):
+        process_avatar(profile.pk, profile.photo.name)
+        return Profile.objects.get(pk=profile.pk)
+
+    def test_upload_is_stored_as_is(self):
+        self.client.force_authenticate(user=self.user)
+        with patch('users.signals.process_avatar.delay') as delay, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(reverse('api:me'), {'profile.photo': generate_photo()}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        profile = Profile.objects.get(pk=self.user.pk)
+        delay.assert_called_once_with(profile.pk, profile.photo.name)
+        self.assertEqual((profile.photo.width, profile.photo.height), (640, 480))
+        self.assertEqual(response.data['profile']['photo_sizes'], {})
+
+    def test_process_avatar(self):
+        profile = self.upload_photo()
+        content_version = Profile.objects.get(pk=profile.pk).content_version
+        profile = self.process(profile)
+
+        self.assertEqual(profile.photo_sizes.keys(), {'webp', 'png'})
+        self.assertEqual(profile.content_version, content_version + 1)
+        for image_format, names in profile.photo_sizes.items():
+            self.assertEqual(names.keys(), {'40', '80', '300'})
+            for size, name in names.items():
+                with default_storage.open(name) as file, Image.open(file) as image:
+                    self.assertEqual(image.format, image_format.upper())
+                    self.assertEqual(image.size, (int(size), int(size)))
+
+        self.client.force_authenticate(user=self.user)
+        photo_sizes = self.client.get(reverse('api:me')).data['profile']['photo_sizes']
+        self.assertEqual(photo_sizes['webp']['40'], f'http://testserver/media/{profile.photo_sizes["webp"]["40"]}')
+
+    def test_replaced_photo_is_not_processed(self):
+        profile = self.upload_photo()
+        process_avatar(profile.pk, 'profile_photos/previous.jpg')
+        self.assertEqual(Profile.objects.get(pk=profile.pk).photo_sizes, {})
+
+    def test_new_upload_deletes_previous_sizes(self):
+        profile = self.process(self.upload_photo())
+        photo_sizes = profile.photo_sizes
+        profile.photo = generate_photo()
+        with patch('users.signals.delete_avatar_files.delay_on_commit') as delete, \
+                patch('users.signals.process_avatar.delay'), self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+        delete.assert_called_once_with(photo_sizes)
+        self.assertEqual(Profile.objects.get(pk=profile.pk).photo_sizes, {})
+
+    def test_avatar_tag(self):
+        template = Template('{% load users_extras %}{% avatar profile 40 "author-photo" %}')
+        profile = self.upload_photo()
+        html = template.render(Context({'profile': profile}))
+        self.assertIn(f'src="{profile.photo.url}"', html)
+        self.assertNotIn('<source', html)
+
+        profile = self.process(profile)
+        html = template.render(Context({'profile': profile}))
+        webp = {size: default_storage.url(name) for size, name in profile.photo_sizes['webp'].items()}
+        self.assertIn(f'<source type="image/webp" srcset="{webp["40"]} 1x, {webp["80"]} 2x">', html)
+        self.assertIn(f'src="{default_storage.url(profile.photo_sizes["png"]["40"])}"', html)
+        self.assertIn('width="40" height="40"', html)
@@ -1,10 +1,13 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from django.test import TestCase, Client
+from django.test import TestCase, Client, AsyncRequestFactory
 from django.urls import reverse
 
 from blog.models import Post, Comment, Author, Category
 from rating.models import PostRating
+from subscription.models import UserSubscription
+from users.views import users
 
 User = get_user_model()
 
@@ -148,3 +151,40 @@ class SignUpViewTest(TestCase):
         })
         self.assertRedirects(response, reverse('login'))
         self.assertTrue(User.objects.filter(username='newuser').exists())
+
+
+class AsyncUserProfileViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user1 = User.objects.create_user(username='testuser1', password='1X<ISRUkw+tuK', email='test1@user.com')
+        cls.user2 = User.objects.create_user(username='testuser2', password='2HJ1vRV0Z&3iD', email='test2@user.com')
+        cls.author = Author.objects.create(user=cls.user1, bio='Author Bio')
+        cls.category = Category.objects.create(title='BlogCategory')
+        cls.post = Post.objects.create(author=cls.author, category=cls.category, title='Post', text='Content')
+
+    async def get_response(self, profile, request_user):
+        request = AsyncRequestFactory().get(reverse('users:profile', kwargs={'pk': profile.pk}))
+
+        async def auser():
+            return request_user
+
+        request.auser = auser
+        response = await users.AsyncUserProfileView.as_view()(request, pk=profile.pk)
+        await sync_to_async(response.render)()
+        return response
+
+    async def test_rating_and_subscription(self):
+        await PostRating.objects.acreate(owner=self.user2, obj=self.post, vote=1)
+        await UserSubscription.objects.acreate(subscriber=self.user2, subscribed_to=self.user1)
+
+        response = await self.get_response(self.user1, self.user2)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context_data['rating'], 1)
+        self.assertTrue(response.context_data['subscribed'])
+        self.assertEqual(len(response.context_data['posts']), 1)
+
+    async def test_user_not_blogger(self):
+        response = await self.get_response(self.user2, self.user1)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context_data['rating'], 0)
+        self.assertFalse(response.context_data['subscribed'])
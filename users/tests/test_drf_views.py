@@ -1,6 +1,9 @@
+import gzip
 import io
+import json
 import shutil
 import tempfile
+from unittest.mock import patch
 
 from PIL import Image
 from django.contrib.auth import get_user_model
@@ -14,7 +17,7 @@ from rest_framework.test import APITestCase, APIClient
 
 from blog.models import Post, Comment, Author, Category
 from rating.models import CommentRating, PostRating
-from subscription.models import UserSubscription
+from subscription.models import CategorySubscription, Favorite, UserSubscription
 
 User = get_user_model()
 
@@ -276,6 +279,80 @@ class FullMeAPIViewTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+class ExportMeAPIViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', email='em@il.com', password='testpassword123')
+        cls.other = User.objects.create_user(username='other', email='ot@her.com', password='testpassword123')
+        cls.author = Author.objects.create(user=cls.user, bio='')
+        cls.category = Category.objects.create(title='Test Category')
+        cls.post = Post.objects.create(author=cls.author, category=cls.category, title='Test Post', text='Content')
+        cls.comment = Comment.objects.create(author=cls.user, post=cls.post, text='Test Comment')
+        Comment.objects.create(author=cls.other, post=cls.post, text='Not exported')
+        PostRating.objects.create(obj=cls.post, owner=cls.user, vote=1)
+        CommentRating.objects.create(obj=cls.comment, owner=cls.user, vote=-1)
+        Favorite.objects.create(user=cls.user, post=cls.post)
+        CategorySubscription.objects.create(subscriber=cls.user, subscribed_to=cls.category)
+        UserSubscription.objects.create(subscriber=cls.user, subscribed_to=cls.other)
+        cls.url = reverse('api:me-export')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    @staticmethod
+    def read_records(content):
+        return [json.loads(line) for line in content.decode().splitlines()]
+
+    def test_stream_ndjson(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        records = self.read_records(b''.join(response.streaming_content))
+        self.assertEqual(records[0]['type'], 'export')
+        self.assertEqual(records[0]['user_id'], self.user.pk)
+
+        by_type = {}
+        for record in records[1:]:
+            by_type.setdefault(record.pop('type'), []).append(record)
+        self.assertEqual(by_type['post'][0]['title'], 'Test Post')
+        self.assertEqual(by_type['post'][0]['category_title'], 'Test Category')
+        self.assertEqual([comment['text'] for comment in by_type['comment']], ['Test Comment'])
+        self.assertEqual(by_type['post_vote'], [{'post_id': self.post.pk, 'vote': 1}])
+        self.assertEqual(by_type['comment_vote'], [{'comment_id': self.comment.pk, 'vote': -1}])
+        self.assertEqual(by_type['favorite'], [{'post_id': self.post.pk}])
+        self.assertEqual(by_type['category_subscription'], [{'category': 'Test Category'}])
+        self.assertEqual(by_type['user_subscription'], [{'user_id': self.other.pk, 'username': 'other'}])
+
+    def test_stream_gzip(self):
+        response = self.client.get(self.url, {'compress': 'gzip'})
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('testuser-export.ndjson.gz', response['Content-Disposition'])
+
+        records = self.read_records(gzip.decompress(b''.join(response.streaming_content)))
+        self.assertEqual(records[0]['type'], 'export')
+        self.assertEqual(len(records), 8)
+
+    @patch('users.api.views.users.export_user_data.delay')
+    def test_background_export(self, mock_delay):
+        mock_delay.return_value.id = 'task-id'
+        response = self.client.post(f'{self.url}?compress=gzip')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['task_id'], 'task-id')
+
+        user_id, relative_path = mock_delay.call_args.args
+        self.assertEqual(user_id, self.user.pk)
+        self.assertTrue(relative_path.startswith(f'exports/{self.user.pk}/'))
+        self.assertTrue(response.data['url'].endswith('/media/' + relative_path))
+
+    def test_anonymous_user(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
 class UserProfileAPIViewTest(APITestCase):
     @classmethod
     def setUpTestData(cls):
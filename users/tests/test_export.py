@@ -0,0 +1,70 @@
+import gzip
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command, CommandError
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+
+from blog.models import Author, Category, Comment, Post
+from rating.models import CommentRating, PostRating
+from users import export
+from users.tasks import export_user_data
+
+User = get_user_model()
+
+
+class UserExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', email='em@il.com', password='testpassword123')
+        cls.author = Author.objects.create(user=cls.user, bio='')
+        cls.category = Category.objects.create(title='Test Category')
+        cls.post = Post.objects.create(author=cls.author, category=cls.category, title='Test Post', text='Content')
+        comment = Comment.objects.create(author=cls.user, post=cls.post, text='Test Comment')
+        PostRating.objects.create(obj=cls.post, owner=cls.user, vote=1)
+        CommentRating.objects.create(obj=comment, owner=cls.user, vote=1)
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+
+    def test_gzip_stream_matches_plain_stream(self):
+        plain = b''.join(export.iter_export(self.user, chunk_size=1))
+        compressed = b''.join(export.iter_export(self.user, compress=True, chunk_size=1))
+        records = [json.loads(line) for line in plain.splitlines()]
+        gzip_records = [json.loads(line) for line in gzip.decompress(compressed).splitlines()]
+
+        self.assertEqual([record['type'] for record in records], ['export', 'post', 'comment', 'post_vote', 'comment_vote'])
+        # Everything except the export timestamp is the same
+        self.assertEqual(records[1:], gzip_records[1:])
+
+    @override_settings(SERVER_MODE='wsgi')
+    def test_streaming_content_follows_the_request_handler(self):
+        lines = iter([b'line'])
+        self.assertIs(export.get_streaming_content(lines, RequestFactory().get('/')), lines)
+        # e.g. runserver, which serves ASGI whatever SERVER_MODE says
+        self.assertTrue(hasattr(export.get_streaming_content(lines, AsyncRequestFactory().get('/')), '__aiter__'))
+
+    def test_task_writes_file_to_media_root(self):
+        with override_settings(MEDIA_ROOT=self.media_root):
+            relative_path = export.get_export_path(self.user)
+            self.assertEqual(export_user_data(self.user.pk, relative_path), relative_path)
+
+        path = Path(self.media_root) / relative_path
+        self.assertTrue(path.exists())
+        self.assertFalse(path.with_name(path.name + '.part').exists())
+        self.assertEqual(len(path.read_text().splitlines()), 5)
+
+    def test_command_writes_file(self):
+        output = Path(self.media_root) / 'export.ndjson'
+        call_command('export_user_data', 'testuser', output=str(output), stderr=StringIO())
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        self.assertEqual(records[0]['username'], 'testuser')
+
+    def test_command_unknown_user(self):
+        with self.assertRaises(CommandError):
+            call_command('export_user_data', 'nobody')
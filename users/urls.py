@@ -1,12 +1,16 @@
+from django.conf import settings
 from django.urls import path
 from users.views import users
 from users.api.views import users as users_api
 
 
 app_name = 'users'
+
+UserProfileView = users.AsyncUserProfileView if settings.ASYNC_VIEWS else users.UserProfileView
+
 urlpatterns = [
     path('signup/', users.SignUpView.as_view(), name='signup'),
-    path('profile/<int:pk>/', users.UserProfileView.as_view(), name='profile'),
+    path('profile/<int:pk>/', UserProfileView.as_view(), name='profile'),
     path('<int:pk>/edit/', users.UserProfileEditView.as_view(), name='profile-edit'),
 ]
 
@@ -15,6 +19,7 @@ drf_urlpatterns = [
     path('change-password/', users_api.ChangePasswordAPIView.as_view(), name='change-password'),
     path('me/', users_api.MeAPIView.as_view(), name='me'),
     path('me/full/', users_api.FullMeAPIView.as_view(), name='me-full'),
+    path('me/export/', users_api.ExportMeAPIView.as_view(), name='me-export'),
     path('users/<int:pk>/', users_api.UserProfileAPIView.as_view(), name='user-profile'),
     path('users/<int:pk>/full/', users_api.FullUserProfileAPIView.as_view(), name='user-profile-full'),
 ]
@@ -3,19 +3,22 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 from django.core.paginator import Paginator
 from django.db.models import Prefetch, Sum
-from django.shortcuts import redirect
+from django.shortcuts import redirect, aget_object_or_404
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, DetailView, UpdateView
 
 from blog.models import Post, Comment
+from common.mixins.views import AsyncViewMixin, ConditionalGetMixin
 from users.forms import CreationForm, UserProfileForm
+from users.models import Profile
 
 User = get_user_model()
 
 
-class UserProfileView(DetailView):
+class UserProfileView(ConditionalGetMixin, DetailView):
     model = User
     context_object_name = 'profile'
+    validators_model = Profile
 
     def _paginate_objects(self, objects, paginate_by, url_kwarg):
         paginator = Paginator(objects, paginate_by)
@@ -37,20 +40,25 @@ class UserProfileView(DetailView):
     def get_object(self, queryset=None):
         obj = super().get_object(queryset)
 
-        request_user = self.request.user
-
         comments = obj.comments.all()
-        comments_rating = comments.aggregate(Sum('rating'))['rating__sum'] or 0
+        posts = self.get_author_posts(obj)
+        self.rating = (
+            (comments.aggregate(Sum('rating'))['rating__sum'] or 0) +
+            (posts.aggregate(Sum('rating'))['rating__sum'] or 0)
+        )
+        obj.user_subscribed = obj.subscribers.filter(subscriber_id=self.request.user.id)
+
+        return self.paginate_profile(obj, comments, posts)
+
+    def get_author_posts(self, obj):
         try:
             # If the user is in the "Bloggers" group, they have an instance of the Author model.
-            posts = obj.author.posts.all()
-            posts_rating = posts.aggregate(Sum('rating'))['rating__sum'] or 0
+            return obj.author.posts.all()
         except ObjectDoesNotExist:
-            posts = Post.objects.none()
-            posts_rating = 0
-
-        self.rating = comments_rating + posts_rating
+            # Annotated, so the rating can be aggregated the same way as for authors (without a query).
+            return Post.objects.annotate(rating=Post.objects.get_rating_subquery()).none()
 
+    def paginate_profile(self, obj, comments, posts):
         obj.paginated_comments = self._paginate_objects(
             objects=comments,
             paginate_by=5,
@@ -61,9 +69,6 @@ class UserProfileView(DetailView):
             paginate_by=2,
             url_kwarg='posts_page'
         )
-
-        obj.user_subscribed = obj.subscribers.filter(subscriber_id=request_user.id)
-
         return obj
 
     def get_context_data(self, **kwargs):
@@ -79,6 +84,34 @@ class UserProfileView(DetailView):
         return context
 
 
+class AsyncUserProfileView(AsyncViewMixin, UserProfileView):
+    """
+    UserProfileView served with the async ORM under ASGI.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        await self.resolve_user(request)
+        return await self.aconditional_get(self.render_object, request, *args, **kwargs)
+
+    async def render_object(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    async def aget_object(self):
+        obj = await aget_object_or_404(self.get_queryset(), pk=self.kwargs.get(self.pk_url_kwarg))
+
+        comments = obj.comments.all()
+        posts = self.get_author_posts(obj)
+        self.rating = (
+            ((await comments.aaggregate(Sum('rating')))['rating__sum'] or 0) +
+            ((await posts.aaggregate(Sum('rating')))['rating__sum'] or 0)
+        )
+        obj.user_subscribed = await obj.subscribers.filter(subscriber_id=self.request.user.id).aexists()
+
+        return self.paginate_profile(obj, comments, posts)
+
+
 class UserProfileEditView(LoginRequiredMixin, UpdateView):
     model = User
     form_class = UserProfileForm